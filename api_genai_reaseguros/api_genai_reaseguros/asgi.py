@@ -7,10 +7,102 @@ For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
 """
 
+import asyncio
 import os
 
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_genai_reaseguros.settings')
 
-application = get_asgi_application()
+
+class CancelOnDisconnect:
+    """
+    Cancel a request whose client disconnects while its response is being sent.
+
+    Django 4.2 does not watch for ``http.disconnect`` once the request body is
+    read, so a streamed response (the SSE workflow stream) would keep running
+    the workflow for a client that is gone. Cancelling the request task makes
+    the stream's ``finally`` blocks close the LangGraph run.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        body_read = asyncio.Event()
+        response_started = asyncio.Event()
+        state = {"complete": False, "disconnected": False}
+
+        async def app_receive():
+            message = await receive()
+            if message["type"] == "http.disconnect" or not message.get("more_body", False):
+                body_read.set()
+            return message
+
+        async def app_send(message):
+            if message["type"] == "http.response.start":
+                response_started.set()
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                state["complete"] = True
+            await send(message)
+
+        app_task = asyncio.ensure_future(self.app(scope, app_receive, app_send))
+
+        async def watch_disconnect():
+            # Only read from the client once Django is done with the request body
+            await body_read.wait()
+            await response_started.wait()
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    if not state["complete"]:
+                        state["disconnected"] = True
+                        app_task.cancel()
+                    return
+
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            await app_task
+        except asyncio.CancelledError:
+            if not state["disconnected"]:
+                raise
+        finally:
+            watcher.cancel()
+
+
+class Lifespan:
+    """
+    Answer the ASGI lifespan protocol, which Django 4.2 does not implement.
+
+    On shutdown the worker's pooled httpx client (used by the API Core async
+    client) is closed, so keep-alive connections are released cleanly.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "lifespan":
+            return await self.app(scope, receive, send)
+
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                # Imported here: the client module needs the Django settings loaded
+                from documents.domain.repository.async_gcp_api_client import aclose_shared_client
+
+                try:
+                    await aclose_shared_client()
+                except Exception as e:
+                    await send({"type": "lifespan.shutdown.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+application = Lifespan(CancelOnDisconnect(get_asgi_application()))
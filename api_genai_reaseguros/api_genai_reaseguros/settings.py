@@ -175,6 +175,10 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Uploads up to this size are kept in memory and handed to the workflow as bytes;
+# larger ones are spilled by Django to a temporary file and read from its path.
+FILE_UPLOAD_MAX_MEMORY_SIZE = env.int("FILE_UPLOAD_MAX_MEMORY_SIZE", default=10 * 1024 * 1024)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -16,8 +16,10 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from documents.views.metrics_view import MetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/documents/', include('documents.urls')),
+    path('metrics', MetricsView.as_view(), name='metrics'),
 ]
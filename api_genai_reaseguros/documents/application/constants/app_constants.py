@@ -6,9 +6,22 @@ class AgentCoreKey(str, Enum):
     RESUMEN_AGENT_KEY = "RESUMEN_GERENCIAL"
 
 DEFAULT_AGENT_QUESTION = "Analiza los contratos y poliza"
+
+# Prompt files that can be overridden by AgentGarden.prompt (matched on document_type)
+PROMPT_AGENT_KEYS = {
+    "agent3.md": AgentCoreKey.DESESTRUCTURADOR_AGENT_KEY.value,
+    "agent5.md": AgentCoreKey.RESUMEN_AGENT_KEY.value,
+}
 #DEFAULT_ENABLE_EXTRACT_ENTITIES = False
 
 QUESTION_AGENT_ENDPOINT = "api/agents/question"
+
+# Request header that skips the LLM response cache ("true"/"1")
+LLM_CACHE_BYPASS_HEADER = "X-Bypass-Cache"
+
+# Request header overriding REPORT_MODE for one request ("llm", "template" or "fast")
+REPORT_MODE_HEADER = "X-Report-Mode"
+REPORT_MODES = ("llm", "template", "fast")
 #RETRIVAL_DOCS_ENDPOINT = "api/agents/retrival-documents"
 
 #INVALID_AGGREGATING_DOCUMENTS = [AgentCoreKey.INITIAL_BUDGET_AGENT_KEY.value, AgentCoreKey.FINAL_BUDGET_AGENT_KEY.value]
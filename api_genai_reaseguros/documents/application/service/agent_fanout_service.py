@@ -0,0 +1,127 @@
+"""
+Agent Fan-Out Service
+
+Sends several independent API Core agent questions concurrently and gathers
+their typed responses, so calls to different agents overlap instead of
+running one after another.
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Sequence, Type, Union
+
+from documents.application.constants.app_constants import (
+    AgentCoreKey,
+    DEFAULT_AGENT_QUESTION,
+    QUESTION_AGENT_ENDPOINT,
+)
+from documents.domain.entities.api_core_request import ApiCoreRequest
+from documents.domain.entities.api_core_response import ApiCoreResponse
+from documents.domain.logger import get_logger
+from documents.domain.repository.async_gcp_api_client import AsyncGcpApiClient
+from documents.domain.constants.env_constants import LOGGING_TYPE, API_CORE_URL
+
+AgentResult = Union[ApiCoreResponse, Exception]
+
+
+class AgentFanOutService:
+    """Service for calling API Core agents concurrently."""
+
+    def __init__(
+        self,
+        trace_id: str,
+        base_url: str = API_CORE_URL,
+        use_auth: bool = True,
+        client: Optional[AsyncGcpApiClient] = None
+    ):
+        """
+        Initialize the fan-out service.
+
+        Args:
+            trace_id: Trace ID for logging
+            base_url: Base URL of the API Core service
+            use_auth: Whether to use GCP authentication (set False for local testing)
+            client: Async client to use instead of creating one
+        """
+        self.logger = get_logger(AgentFanOutService.__name__, LOGGING_TYPE)
+        self.logger.set_trace(trace_id)
+        self.client = client or AsyncGcpApiClient(base_url, trace_id, use_auth=use_auth)
+
+    async def ask(
+        self,
+        requests: Sequence[ApiCoreRequest],
+        response_model: Type[ApiCoreResponse] = ApiCoreResponse[Any]
+    ) -> List[AgentResult]:
+        """
+        Send the requests concurrently.
+
+        Args:
+            requests: Agent questions
+            response_model: ApiCoreResponse model to parse each response into
+
+        Returns:
+            One result per request, in order: the parsed response or the exception
+            that request raised (one failing agent does not cancel the others)
+        """
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                self.client.post(QUESTION_AGENT_ENDPOINT, json=request.model_dump(), model_response=response_model)
+                for request in requests
+            ),
+            return_exceptions=True
+        )
+        errors = [
+            {"agent_id": request.agent_id, "error": str(result)}
+            for request, result in zip(requests, results)
+            if isinstance(result, Exception)
+        ]
+        self.logger.log_struct({
+            "evento": "agent_fanout",
+            "agents": [request.agent_id for request in requests],
+            "errors": errors,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+        }, severity="WARNING" if errors else "INFO")
+        return list(results)
+
+    def _agent_ids(self, agent_keys: Sequence[AgentCoreKey]) -> Dict[str, int]:
+        """API Core agent id of each key, from AgentGarden (latest row per document_type)."""
+        from documents.models import AgentGarden
+
+        keys = [key.value for key in agent_keys]
+        rows = AgentGarden.objects.filter(document_type__in=keys).order_by("created_at")
+        ids = {row.document_type: row.api_core_id for row in rows}
+        missing = [key for key in keys if key not in ids]
+        if missing:
+            raise ValueError(f"No AgentGarden agent configured for: {', '.join(missing)}")
+        return ids
+
+    async def ask_agents(
+        self,
+        agent_keys: Sequence[AgentCoreKey],
+        message: str = DEFAULT_AGENT_QUESTION,
+        files: Optional[List[str]] = None,
+        response_model: Type[ApiCoreResponse] = ApiCoreResponse[Any]
+    ) -> Dict[str, AgentResult]:
+        """
+        Ask the same question to several agents concurrently.
+
+        Args:
+            agent_keys: Agents to call (e.g. DESESTRUCTURADOR_AGENT_KEY, RESUMEN_AGENT_KEY)
+            message: Question sent to every agent
+            files: Files attached to every request
+            response_model: ApiCoreResponse model to parse each response into
+
+        Returns:
+            Result per agent key value
+
+        Raises:
+            ValueError: If an agent key has no AgentGarden row
+        """
+        # The ORM is sync-only
+        ids = await asyncio.to_thread(self._agent_ids, agent_keys)
+        requests = [
+            ApiCoreRequest(agent_id=ids[key.value], message=message, files=files or [])
+            for key in agent_keys
+        ]
+        results = await self.ask(requests, response_model)
+        return {key.value: result for key, result in zip(agent_keys, results)}
@@ -0,0 +1,158 @@
+"""
+Batch Workflow Service
+
+Runs the Reaseguros workflow over many placements: shared documents are
+deduplicated and extracted in a single pass, and their text is handed to every
+placement using them; placements then run on the async graph with a
+concurrency bound shared by every batch of the process. LLM calls may be rate
+limited process-wide inside the workflow (see llm_rate_limiter).
+"""
+import asyncio
+import hashlib
+import time
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+from documents.application.service.pdf_text_service import PdfTextService
+from documents.application.service.workflow_registry import get_workflow
+from documents.domain.entities.batch_workflow import BatchGroup, BatchItemResult
+from documents.domain.entities.document_source import DocumentSource
+from documents.domain.logger import get_logger
+from documents.domain.constants.env_constants import LOGGING_TYPE, BATCH_MAX_CONCURRENCY
+
+# Placement slots are shared by every batch request; asyncio semaphores are bound to the event loop
+# that uses them (one per worker under ASGI)
+_LOOP_PLACEMENT_SLOTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _placement_slots(max_concurrency: int) -> asyncio.Semaphore:
+    """Semaphore bounding the placements in flight on the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _LOOP_PLACEMENT_SLOTS:
+        _LOOP_PLACEMENT_SLOTS[loop] = asyncio.Semaphore(max(1, max_concurrency))
+    return _LOOP_PLACEMENT_SLOTS[loop]
+
+
+class BatchWorkflowService:
+    """Service for processing many (poliza, contratos) placements in one call."""
+
+    def __init__(self, trace_id: Optional[str] = None, max_concurrency: int = BATCH_MAX_CONCURRENCY):
+        """
+        Initialize the batch service.
+
+        Args:
+            trace_id: Optional trace ID for logging
+            max_concurrency: Placements processed at the same time across all batches
+                of the process (the first batch on the event loop sets the bound)
+        """
+        self.logger = get_logger(BatchWorkflowService.__name__, LOGGING_TYPE)
+        if trace_id:
+            self.logger.set_trace(trace_id)
+        self.trace_id = trace_id
+        self.max_concurrency = max(1, max_concurrency)
+
+    def _extract_once(
+        self,
+        text_service: PdfTextService,
+        groups: List[BatchGroup]
+    ) -> Tuple[List[BatchGroup], int, int]:
+        """
+        Extract each distinct document (by content hash) once and attach its text to every use of it.
+
+        Works whether or not the PDF text cache is enabled. Documents that could
+        not be read are left without text, so their placement reports the error.
+
+        Returns:
+            (groups with pre-extracted documents, documents, distinct documents)
+        """
+        digests: Dict[int, str] = {}
+        unique: Dict[str, DocumentSource] = {}
+        documents = [document for group in groups for document in [group.poliza] + group.contratos]
+        for document in documents:
+            if id(document) not in digests:
+                digests[id(document)] = hashlib.sha256(document.read_bytes()).hexdigest()
+            unique.setdefault(digests[id(document)], document)
+
+        texts = dict(zip(unique, text_service.extract_many(list(unique.values()))))
+
+        def with_text(document: DocumentSource) -> DocumentSource:
+            text = texts[digests[id(document)]]
+            if text.startswith("Error reading PDF"):
+                return document
+            return document.model_copy(update={"text": text})
+
+        extracted = [
+            group.model_copy(update={
+                "poliza": with_text(group.poliza),
+                "contratos": [with_text(c) for c in group.contratos]
+            })
+            for group in groups
+        ]
+        return extracted, len(documents), len(unique)
+
+    async def arun(
+        self,
+        groups: List[BatchGroup],
+        use_llm_cache: bool = True,
+        report_mode: Optional[str] = None
+    ) -> List[BatchItemResult]:
+        """
+        Process every group and return per-item results in input order.
+
+        Args:
+            groups: Placements to process
+            use_llm_cache: Whether placements may reuse cached LLM responses
+            report_mode: Report mode override ("llm", "template" or "fast")
+
+        Returns:
+            List of BatchItemResult, one per group
+        """
+        workflow = await asyncio.to_thread(get_workflow)
+
+        # Single extraction pass over the distinct documents; the per-placement
+        # runs reuse the attached text instead of re-parsing shared slips
+        start = time.perf_counter()
+        groups, total_documents, unique_documents = await asyncio.to_thread(
+            self._extract_once, workflow.text_service, groups
+        )
+        self.logger.log_struct({
+            "evento": "batch_extraction",
+            "groups": len(groups),
+            "documents": total_documents,
+            "unique_documents": unique_documents,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+        })
+
+        semaphore = _placement_slots(self.max_concurrency)
+
+        async def run_group(group: BatchGroup) -> BatchItemResult:
+            async with semaphore:
+                group_start = time.perf_counter()
+                try:
+                    result = await workflow.arun(
+                        poliza=group.poliza,
+                        contratos=group.contratos,
+                        output_pdf_path=None,
+                        use_llm_cache=use_llm_cache,
+                        report_mode=report_mode
+                    )
+                    elapsed_ms = round((time.perf_counter() - group_start) * 1000, 2)
+                    if result.get("pdf_bytes"):
+                        return BatchItemResult(id=group.id, success=True, elapsed_ms=elapsed_ms, pdf_bytes=result["pdf_bytes"])
+
+                    error_msg = "PDF was not generated."
+                    if "error" in result.get("comparison_data", {}):
+                        error_msg = str(result["comparison_data"]["error"])
+                    return BatchItemResult(id=group.id, success=False, error=error_msg, elapsed_ms=elapsed_ms)
+                except Exception as e:
+                    self.logger.log_text(f"[BATCH] Group {group.id} failed: {e}", severity="ERROR")
+                    elapsed_ms = round((time.perf_counter() - group_start) * 1000, 2)
+                    return BatchItemResult(id=group.id, success=False, error=str(e), elapsed_ms=elapsed_ms)
+
+        results = await asyncio.gather(*(run_group(g) for g in groups))
+        self.logger.log_text(
+            f"[BATCH] Finished {len(results)} groups, {sum(r.success for r in results)} succeeded"
+        )
+        return list(results)
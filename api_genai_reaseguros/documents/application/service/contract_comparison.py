@@ -0,0 +1,112 @@
+"""
+Contract Comparison
+
+Helpers for the per-contract deconstruct mode: each (poliza, contrato) pair is
+compared in its own LLM request and stored on its own, and the multi-reinsurer
+comparison is re-assembled from the stored per-contract columns.
+"""
+import re
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+
+from documents.application.service.prompt_sections import extract_items
+
+# Columns describing the poliza side of an item; shared by every contract
+POLIZA_COLUMNS = ("N", "SECCIÓN_PÓLIZA", "ITEM_PÓLIZA", "DETALLE_ÍTEM (Póliza)")
+CONCLUSION_COLUMN = "CONCLUSIÓN GENERAL"
+
+# Per-reinsurer columns: "DETALLE - <reasegurador> (Slip)" / "COMPARACIÓN <reasegurador> (Slip)"
+_SLIP_COLUMN_RE = re.compile(r"^(.*?)\s*\(Slip\)$", re.IGNORECASE)
+
+
+def _item_number(item: Dict[str, Any]) -> int:
+    try:
+        return int(item.get("N", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def contract_items(data: Any) -> List[Dict[str, Any]]:
+    """
+    Items of one pair comparison, keyed by number and without duplicates.
+
+    Args:
+        data: Parsed response of a (poliza, contrato) comparison
+
+    Returns:
+        Item objects ordered by "N" (empty when the response has no items)
+    """
+    by_number: Dict[int, Dict[str, Any]] = {}
+    for item in extract_items(data):
+        by_number.setdefault(_item_number(item), item)
+    return [by_number[n] for n in sorted(by_number)]
+
+
+def _contract_labels(names: List[str]) -> List[str]:
+    """Label per contract: its name, plus its position when several contracts share the name."""
+    counts = Counter(names)
+    return [name if counts[name] == 1 else f"{name} #{index}" for index, name in enumerate(names, start=1)]
+
+
+def _suffixed_column(key: str, label: str) -> str:
+    """Column name tagged with a contract label, keeping the "(Slip)" ending reinsurer columns are parsed by."""
+    match = _SLIP_COLUMN_RE.match(key)
+    if match:
+        return f"{match.group(1)} [{label}] (Slip)"
+    return f"{key} [{label}]"
+
+
+def assemble_comparison(results: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    """
+    Re-assemble the multi-contract comparison from per-contract item lists.
+
+    Poliza columns are taken from the first contract that has the item; every
+    other column is contract specific and copied as is. A column already
+    filled by another contract (e.g. two slips both naming "Reasegurador 1")
+    is tagged with the contract name instead of overwriting it. The general
+    conclusion is the per-contract conclusions, labelled with the contract name.
+
+    Args:
+        results: (contract name, item list or error dict) pairs in upload order
+
+    Returns:
+        {"items": [...]} plus "contract_errors" for contracts without usable items
+    """
+    rows: Dict[int, Dict[str, Any]] = {}
+    conclusions: Dict[int, List[Tuple[str, Any]]] = {}
+    errors = []
+    # Contract that first used each contract-specific column
+    owners: Dict[str, str] = {}
+    labels = _contract_labels([name for name, _ in results])
+
+    for (name, data), label in zip(results, labels):
+        items = data if isinstance(data, list) else []
+        if not items:
+            detail = data.get("error") if isinstance(data, dict) and "error" in data else "No items returned"
+            errors.append({"contract": name, "error": detail})
+            continue
+
+        for item in items:
+            number = _item_number(item)
+            row = rows.setdefault(number, {key: item[key] for key in POLIZA_COLUMNS if key in item})
+            for key, value in item.items():
+                if key in POLIZA_COLUMNS or key == CONCLUSION_COLUMN:
+                    continue
+                if owners.setdefault(key, label) != label:
+                    key = _suffixed_column(key, label)
+                row[key] = value
+            if item.get(CONCLUSION_COLUMN):
+                conclusions.setdefault(number, []).append((label, item[CONCLUSION_COLUMN]))
+
+    for number, row in rows.items():
+        parts = conclusions.get(number, [])
+        if len(parts) == 1:
+            # Single contract: keep its conclusion without the label
+            row[CONCLUSION_COLUMN] = parts[0][1]
+        elif parts:
+            row[CONCLUSION_COLUMN] = "\n".join(f"{name}: {text}" for name, text in parts)
+
+    assembled: Dict[str, Any] = {"items": [rows[n] for n in sorted(rows)]}
+    if errors:
+        assembled["contract_errors"] = errors
+    return assembled
@@ -1,72 +1,160 @@
 """
 HTML to PDF Conversion Service
 
-Compiles HTML documents to PDF format using xhtml2pdf.
+Compiles HTML documents to PDF format with a pluggable rendering backend
+(xhtml2pdf by default), either in the calling thread or on a shared process
+pool with a bounded queue. Local fonts are registered once per process and
+rendered PDFs are cached by HTML content hash.
 """
-import io
-import logging
-from typing import Optional
-from xhtml2pdf import pisa
+import hashlib
+import threading
+import time
+from typing import Dict, Optional
+
+from documents.application.service.process_pool import SharedProcessPool
 from documents.domain.logger import get_logger
-from documents.domain.constants.env_constants import LOGGING_TYPE
+from documents.domain.repository.pdf_renderer import PdfRenderer
+from documents.domain.repository.pdf_renderers import create_renderer
+from documents.domain.repository.sqlite_cache import SqliteCache
+from documents.domain.constants.env_constants import (
+    LOGGING_TYPE,
+    CACHE_DB_PATH,
+    PDF_RENDERER,
+    PDF_RENDER_MODE,
+    PDF_RENDER_WORKERS,
+    PDF_RENDER_QUEUE_SIZE,
+    PDF_RENDER_QUEUE_TIMEOUT,
+    PDF_RENDER_TIMEOUT,
+    PDF_RENDER_CACHE_ENABLED,
+    PDF_RENDER_CACHE_MAX_ENTRIES,
+    PDF_RENDER_CACHE_MAX_BYTES,
+    PDF_RENDER_WARMUP_ENABLED,
+)
+
+# Renders in flight or waiting for a pool worker
+_RENDER_SLOTS = threading.BoundedSemaphore(max(1, PDF_RENDER_QUEUE_SIZE))
+
+# Backends created inside pool workers, one per name and process
+_WORKER_RENDERERS: Dict[str, PdfRenderer] = {}
+
+
+def _get_worker_renderer(renderer_name: str) -> PdfRenderer:
+    """Get or create (and set up) the named backend in a pool worker."""
+    renderer = _WORKER_RENDERERS.get(renderer_name)
+    if renderer is None:
+        renderer = _WORKER_RENDERERS[renderer_name] = create_renderer(renderer_name)
+        if PDF_RENDER_WARMUP_ENABLED:
+            renderer.warm_up()
+    return renderer
+
+
+def render_in_worker(renderer_name: str, html_content: str) -> bytes:
+    """Render HTML with the named backend. Runs inside pool workers, so it must stay picklable."""
+    return _get_worker_renderer(renderer_name).render(html_content)
+
+
+# Process pool shared by every service instance in this worker; each worker sets up its backend when it starts
+_RENDER_POOL = SharedProcessPool(
+    "PDF render", PDF_RENDER_WORKERS, initializer=_get_worker_renderer, initargs=(PDF_RENDERER,)
+)
+
 
 class HtmlToPdfService:
     """Service for converting HTML documents to PDF format."""
-    
-    def __init__(self, trace_id: Optional[str] = None):
+
+    def __init__(
+        self,
+        trace_id: Optional[str] = None,
+        renderer: str = PDF_RENDERER,
+        mode: str = PDF_RENDER_MODE,
+        warm_up: bool = PDF_RENDER_WARMUP_ENABLED,
+        use_cache: bool = PDF_RENDER_CACHE_ENABLED
+    ):
         """
         Initialize the HTML to PDF converter.
-        
+
         Args:
             trace_id: Optional trace ID for logging
+            renderer: Rendering backend name (xhtml2pdf, weasyprint)
+            mode: "inline" renders in the calling thread, "process" on the shared process pool
+            warm_up: Set up the backend (local fonts) now instead of on the first request
+            use_cache: Reuse the PDF of an identical HTML document
         """
         self.logger = get_logger(HtmlToPdfService.__name__, LOGGING_TYPE)
         if trace_id:
             self.logger.set_trace(trace_id)
         self.trace_id = trace_id
-    
+        self.mode = mode
+        # Fails fast on an unknown or unavailable backend
+        self.renderer = create_renderer(renderer)
+        if warm_up and mode != "process":
+            # Process mode sets up each pool worker when it starts
+            self.renderer.warm_up()
+        self.cache = None
+        if use_cache:
+            self.cache = SqliteCache(
+                CACHE_DB_PATH,
+                namespace="pdf_render",
+                max_entries=PDF_RENDER_CACHE_MAX_ENTRIES,
+                max_bytes=PDF_RENDER_CACHE_MAX_BYTES
+            )
+
+    def _render(self, html_content: str) -> bytes:
+        """Render in the configured mode, waiting for a queue slot in process mode."""
+        if self.mode != "process":
+            return self.renderer.render(html_content)
+
+        if not _RENDER_SLOTS.acquire(timeout=PDF_RENDER_QUEUE_TIMEOUT):
+            raise RuntimeError(
+                f"PDF render queue full ({PDF_RENDER_QUEUE_SIZE} pending) after {PDF_RENDER_QUEUE_TIMEOUT}s"
+            )
+        try:
+            return _RENDER_POOL.run(render_in_worker, self.renderer.name, html_content, timeout=PDF_RENDER_TIMEOUT)
+        finally:
+            _RENDER_SLOTS.release()
+
     def compile_html_to_pdf(self, html_content: str, filename: str = "document") -> Optional[bytes]:
         """
         Compile HTML content to PDF.
-        
+
         Args:
             html_content: HTML document content as string
             filename: Base filename for the document (without extension)
-        
+
         Returns:
             PDF content as bytes, or None if failed
         """
         self.logger.log_text(f"[HTML-PDF] Starting conversion for: {filename}")
-        
+
         try:
-            # Create a bytes buffer for the PDF
-            pdf_buffer = io.BytesIO()
-            
-            # Convert HTML to PDF
-            pisa_status = pisa.CreatePDF(
-                src=html_content,
-                dest=pdf_buffer,
-                encoding='utf-8'
-            )
-            
-            if pisa_status.err:
-                error_msg = f"PDF generation failed: {pisa_status.err}"
-                self.logger.log_text(f"[HTML-PDF] ERROR: {error_msg}", severity="ERROR")
-                return None
-            
-            pdf_bytes = pdf_buffer.getvalue()
+            start = time.perf_counter()
+            cache_key = None
+            pdf_bytes = None
+            if self.cache is not None:
+                cache_key = f"{self.renderer.name}:{hashlib.sha256(html_content.encode('utf-8')).hexdigest()}"
+                pdf_bytes = self.cache.get(cache_key)
+            cache_hit = pdf_bytes is not None
+            if not cache_hit:
+                pdf_bytes = self._render(html_content)
+                if self.cache is not None:
+                    self.cache.set(cache_key, pdf_bytes)
+            elapsed = time.perf_counter() - start
             pdf_size = len(pdf_bytes)
-            
+
             self.logger.log_struct({
                 "evento": "html_to_pdf_success",
                 "filename": filename,
+                "renderer": self.renderer.name,
+                "mode": self.mode,
+                "cache_hit": cache_hit,
+                "elapsed_ms": round(elapsed * 1000, 2),
                 "pdf_size_bytes": pdf_size,
                 "pdf_size_kb": round(pdf_size / 1024, 2)
             })
             self.logger.log_text(f"[HTML-PDF] Conversion successful. PDF size: {pdf_size} bytes")
-            
+
             return pdf_bytes
-            
+
         except Exception as e:
             self.logger.log_text(f"[HTML-PDF] specific error: {str(e)}", severity="ERROR")
             import traceback
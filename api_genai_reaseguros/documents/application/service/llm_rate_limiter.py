@@ -0,0 +1,94 @@
+"""
+LLM Rate Limiter
+
+Optional process-wide token bucket for LLM calls, off unless
+LLM_RATE_LIMIT_PER_MINUTE is set. Every LLM request of the worker (single
+requests, sections/contracts fan-out, batch placements) then draws from the
+same bucket, from pool threads and event loops alike; cache hits do not.
+"""
+import asyncio
+import threading
+import time
+from typing import Callable, Optional
+
+from documents.domain.logger import get_logger
+from documents.domain.constants.env_constants import (
+    LOGGING_TYPE,
+    LLM_RATE_LIMIT_PER_MINUTE,
+    LLM_RATE_LIMIT_BURST,
+)
+
+
+class LlmRateLimiter:
+    """Token bucket allowing ``per_minute`` calls per minute with bursts of up to ``burst`` calls."""
+
+    def __init__(
+        self,
+        per_minute: int = LLM_RATE_LIMIT_PER_MINUTE,
+        burst: int = LLM_RATE_LIMIT_BURST,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            per_minute: Calls allowed per minute (0 = unlimited)
+            burst: Calls that may start at once while the bucket is full
+            clock: Monotonic time source in seconds
+        """
+        self.logger = get_logger(LlmRateLimiter.__name__, LOGGING_TYPE)
+        self.rate = per_minute / 60.0 if per_minute > 0 else 0.0
+        self.capacity = float(max(1, burst))
+        self.clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take a slot and return the seconds to wait before using it.
+
+        The bucket may go negative: each caller reserves the next free slot, so
+        waiting callers are served in order without polling.
+        """
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, name: str = "") -> None:
+        """Block the calling thread until a call is allowed."""
+        wait = self.reserve()
+        if wait > 0:
+            self.logger.log_text(f"[LLM] Rate limit: {name} waits {wait:.2f}s")
+            time.sleep(wait)
+
+    async def aacquire(self, name: str = "") -> None:
+        """Async variant of acquire: waits without blocking the event loop."""
+        wait = self.reserve()
+        if wait > 0:
+            self.logger.log_text(f"[LLM] Rate limit: {name} waits {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+
+_LLM_RATE_LIMITER: Optional[LlmRateLimiter] = None
+_LLM_RATE_LIMITER_LOCK = threading.Lock()
+
+
+def get_llm_rate_limiter() -> LlmRateLimiter:
+    """
+    Get the process-wide LLM rate limiter.
+
+    Returns:
+        LlmRateLimiter: Shared limiter
+    """
+    global _LLM_RATE_LIMITER
+    if _LLM_RATE_LIMITER is None:
+        with _LLM_RATE_LIMITER_LOCK:
+            if _LLM_RATE_LIMITER is None:
+                _LLM_RATE_LIMITER = LlmRateLimiter()
+    return _LLM_RATE_LIMITER
@@ -0,0 +1,171 @@
+"""
+OCR Service
+
+Recovers text from scanned PDF pages (pages without a text layer) by running
+Tesseract over their embedded images. Only the selected pages are processed,
+the pages of every document of a request in parallel on one shared process
+pool, and results are cached by page image hash.
+"""
+import io
+import hashlib
+import time
+from typing import Dict, List, Optional, Tuple
+
+from pypdf import PdfReader
+
+from documents.application.service.process_pool import SharedProcessPool
+from documents.domain.logger import get_logger
+from documents.domain.repository.sqlite_cache import SqliteCache
+from documents.domain.constants.env_constants import (
+    LOGGING_TYPE,
+    CACHE_DB_PATH,
+    OCR_LANGUAGES,
+    OCR_WORKERS,
+    OCR_TIMEOUT,
+    OCR_CACHE_MAX_ENTRIES,
+    OCR_CACHE_MAX_BYTES,
+)
+
+try:
+    import pytesseract
+    from PIL import Image
+    # The Python wrapper is useless without the tesseract binary
+    pytesseract.get_tesseract_version()
+    OCR_AVAILABLE = True
+except Exception:
+    # ImportError, or TesseractNotFoundError when the binary is missing
+    OCR_AVAILABLE = False
+
+# Process pool shared by every service instance in this worker
+_OCR_POOL = SharedProcessPool("OCR", OCR_WORKERS)
+
+# One document to fill in: (name for logging, raw PDF content, extracted text per page starting at start_page,
+# positions in that list of the pages to OCR, zero-based PDF page index of the first text)
+OcrDocument = Tuple[str, bytes, List[str], List[int], int]
+
+
+def ocr_page_images(images: List[bytes], languages: str) -> str:
+    """OCR the images of one page. Runs inside pool workers, so it must stay picklable."""
+    texts = []
+    for data in images:
+        with Image.open(io.BytesIO(data)) as image:
+            texts.append(pytesseract.image_to_string(image, lang=languages).strip())
+    return "\n".join(t for t in texts if t)
+
+
+class OcrService:
+    """Service for filling in the text of scanned PDF pages."""
+
+    def __init__(self, trace_id: Optional[str] = None, languages: str = OCR_LANGUAGES):
+        """
+        Initialize the OCR service.
+
+        Args:
+            trace_id: Optional trace ID for logging
+            languages: Tesseract language codes (e.g. "spa+eng")
+        """
+        self.logger = get_logger(OcrService.__name__, LOGGING_TYPE)
+        if trace_id:
+            self.logger.set_trace(trace_id)
+        self.trace_id = trace_id
+        self.languages = languages
+
+        if not OCR_AVAILABLE:
+            self.logger.log_text(
+                "OCR libraries not available. Install with: pip install pytesseract Pillow "
+                "(and the tesseract-ocr binary)",
+                severity="WARNING"
+            )
+
+        self.cache = SqliteCache(
+            CACHE_DB_PATH,
+            namespace="ocr_page",
+            max_entries=OCR_CACHE_MAX_ENTRIES,
+            max_bytes=OCR_CACHE_MAX_BYTES
+        )
+
+    def _page_images(self, pdf_bytes: bytes, page_indexes: List[int]) -> Dict[int, List[bytes]]:
+        """Encoded images embedded in each selected page."""
+        reader = PdfReader(io.BytesIO(pdf_bytes))
+        images = {}
+        for index in page_indexes:
+            try:
+                images[index] = [image.data for image in reader.pages[index].images]
+            except Exception as e:
+                self.logger.log_text(f"[OCR] Could not read images of page {index}: {e}", severity="WARNING")
+                images[index] = []
+        return images
+
+    def fill_many(self, documents: List[OcrDocument]) -> List[Tuple[List[str], int]]:
+        """
+        Replace the text of the selected pages of several documents with their OCR output.
+
+        The cache misses of every document go to the pool in one batch, so a
+        request with several scanned PDFs OCRs them concurrently. A page not
+        finished within OCR_TIMEOUT seconds counts as failed.
+
+        Args:
+            documents: Documents to fill in (see OcrDocument)
+
+        Returns:
+            Page texts with the OCR output filled in (unchanged when OCR is unavailable) and the
+            number of pages whose OCR failed (their text is left as extracted), per document
+        """
+        texts = [list(page_texts) for _, _, page_texts, _, _ in documents]
+        if not OCR_AVAILABLE:
+            return [(page_texts, 0) for page_texts in texts]
+
+        start = time.perf_counter()
+        pending: List[Tuple[int, int, str, List[bytes]]] = []  # (document, position, cache_key, images)
+        cache_hits = [0] * len(documents)
+        for doc_index, (name, pdf_bytes, _, page_indexes, start_page) in enumerate(documents):
+            if not page_indexes:
+                continue
+            page_texts = texts[doc_index]
+            images = self._page_images(pdf_bytes, [start_page + i for i in page_indexes])
+            for position in page_indexes:
+                page_images = images[start_page + position]
+                if not page_images:
+                    continue
+                page_hash = hashlib.sha256(b"".join(page_images)).hexdigest()
+                cache_key = f"{self.languages}:{page_hash}"
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    page_texts[position] = cached
+                    cache_hits[doc_index] += 1
+                else:
+                    pending.append((doc_index, position, cache_key, page_images))
+
+        errors = [0] * len(documents)
+        ocr_pages = [0] * len(documents)
+        if pending:
+            outcomes = _OCR_POOL.run_many(
+                ocr_page_images,
+                [(page_images, self.languages) for _, _, _, page_images in pending],
+                timeout=OCR_TIMEOUT
+            )
+            for (doc_index, position, cache_key, _), (text, error) in zip(pending, outcomes):
+                name, _, _, _, start_page = documents[doc_index]
+                if error is not None:
+                    errors[doc_index] += 1
+                    self.logger.log_text(f"[OCR] Page {start_page + position} of {name} failed: {error}", severity="ERROR")
+                    continue
+                self.cache.set(cache_key, text)
+                texts[doc_index][position] = text
+                ocr_pages[doc_index] += 1
+
+        elapsed_ms = round((time.perf_counter() - start) * 1000, 2)
+        for doc_index, (name, _, _, page_indexes, _) in enumerate(documents):
+            if not page_indexes:
+                continue
+            self.logger.log_struct({
+                "evento": "pdf_ocr",
+                "document": name,
+                "pages_selected": len(page_indexes),
+                "pages_ocr": ocr_pages[doc_index],
+                "cache_hits": cache_hits[doc_index],
+                "errors": errors[doc_index],
+                "documents_in_batch": len(documents),
+                "elapsed_ms": elapsed_ms
+            })
+        return list(zip(texts, errors))
@@ -0,0 +1,247 @@
+"""
+PDF Text Extraction Service
+
+Extracts text from PDF documents with pypdf, reusing cached text for
+identical files and fanning out cache misses to a process pool. Pages without
+a text layer go through the OCR fallback when it is available, for all the
+documents of a call at once.
+"""
+import io
+import hashlib
+import time
+from typing import Iterator, List, Optional, Tuple, Union
+
+from pypdf import PdfReader
+
+from documents.application.service.ocr_service import OcrService, OCR_AVAILABLE
+from documents.application.service.process_pool import SharedProcessPool
+from documents.domain.entities.document_source import DocumentSource
+from documents.domain.logger import get_logger
+from documents.domain.repository.sqlite_cache import SqliteCache
+from documents.domain.constants.env_constants import (
+    LOGGING_TYPE,
+    CACHE_DB_PATH,
+    PDF_TEXT_CACHE_ENABLED,
+    PDF_TEXT_CACHE_MAX_ENTRIES,
+    PDF_TEXT_CACHE_MAX_BYTES,
+    PDF_EXTRACTION_WORKERS,
+    PDF_EXTRACTION_TIMEOUT,
+    PDF_MAX_PAGES,
+    OCR_ENABLED,
+    OCR_MIN_PAGE_CHARS,
+)
+
+# Process pool shared by every service instance in this worker
+_EXTRACTION_POOL = SharedProcessPool("PDF extraction", PDF_EXTRACTION_WORKERS)
+
+
+def iter_pdf_pages(
+    pdf_bytes: bytes,
+    start_page: int = 0,
+    max_pages: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Yield the text of each page of a PDF in the selected range.
+
+    Pages outside the range are never extracted. Callers that need every page
+    (OCR, cache) still hold the whole text, so this bounds work, not memory.
+
+    Args:
+        pdf_bytes: Raw PDF content
+        start_page: Zero-based index of the first page to extract
+        max_pages: Maximum number of pages to extract (None for all)
+
+    Yields:
+        Text of each page in the selected range
+    """
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    total_pages = len(reader.pages)
+    end_page = total_pages if max_pages is None else min(total_pages, start_page + max_pages)
+    for index in range(start_page, end_page):
+        yield reader.pages[index].extract_text() or ""
+
+
+def parse_pdf_pages(
+    pdf_bytes: bytes,
+    start_page: int = 0,
+    max_pages: Optional[int] = None
+) -> Tuple[List[str], float]:
+    """
+    Parse PDF bytes into per-page texts. Runs inside pool workers, so it must stay picklable.
+
+    Args:
+        pdf_bytes: Raw PDF content
+        start_page: Zero-based index of the first page to extract
+        max_pages: Maximum number of pages to extract (None for all)
+
+    Returns:
+        Tuple of (text per page, elapsed seconds); pages are joined by the caller
+        once the OCR fallback has filled in the scanned ones
+    """
+    start = time.perf_counter()
+    pages = list(iter_pdf_pages(pdf_bytes, start_page, max_pages))
+    return pages, time.perf_counter() - start
+
+
+class PdfTextService:
+    """Service for extracting text from one or many PDF documents."""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        """
+        Initialize the PDF text extractor.
+
+        Args:
+            trace_id: Optional trace ID for logging
+        """
+        self.logger = get_logger(PdfTextService.__name__, LOGGING_TYPE)
+        if trace_id:
+            self.logger.set_trace(trace_id)
+        self.trace_id = trace_id
+
+        self.cache = None
+        if PDF_TEXT_CACHE_ENABLED:
+            self.cache = SqliteCache(
+                CACHE_DB_PATH,
+                namespace="pdf_text",
+                max_entries=PDF_TEXT_CACHE_MAX_ENTRIES,
+                max_bytes=PDF_TEXT_CACHE_MAX_BYTES
+            )
+
+        self.ocr = OcrService(trace_id) if OCR_ENABLED and OCR_AVAILABLE else None
+
+    def extract_text(
+        self,
+        pdf_path: Union[str, DocumentSource],
+        start_page: int = 0,
+        max_pages: Optional[int] = PDF_MAX_PAGES
+    ) -> str:
+        """
+        Extract text from a single PDF.
+
+        Args:
+            pdf_path: Path of the PDF file or in-memory DocumentSource
+            start_page: Zero-based index of the first page to extract
+            max_pages: Maximum number of pages to extract (None for all)
+
+        Returns:
+            Extracted text, or an error message if the PDF could not be read
+        """
+        return self.extract_many([pdf_path], start_page, max_pages)[0]
+
+    def extract_many(
+        self,
+        pdf_paths: List[Union[str, DocumentSource]],
+        start_page: int = 0,
+        max_pages: Optional[int] = PDF_MAX_PAGES
+    ) -> List[str]:
+        """
+        Extract text from several PDFs, in parallel when more than one needs parsing.
+
+        Sources carrying pre-extracted text (default page range only) are not
+        read at all. Cache lookups happen in the calling process; only misses
+        are sent to the process pool. Results keep the order of ``pdf_paths``.
+
+        Args:
+            pdf_paths: Paths of the PDF files or in-memory DocumentSources
+            start_page: Zero-based index of the first page to extract
+            max_pages: Maximum number of pages to extract per document (None for all)
+
+        Returns:
+            List of extracted texts (or error messages), one per path
+        """
+        results: List[Optional[str]] = [None] * len(pdf_paths)
+        pending = []  # (index, cache_key, pdf_bytes)
+
+        sources = [DocumentSource.coerce(p) for p in pdf_paths]
+        default_range = start_page == 0 and max_pages == PDF_MAX_PAGES
+        for index, source in enumerate(sources):
+            if source.text is not None and default_range:
+                results[index] = source.text
+                continue
+            start = time.perf_counter()
+            try:
+                pdf_bytes = source.read_bytes()
+            except Exception as e:
+                self.logger.log_text(f"[PDF-TEXT] Error reading PDF {source.name}: {e}", severity="ERROR")
+                results[index] = f"Error reading PDF: {e}"
+                continue
+
+            cache_key = hashlib.sha256(pdf_bytes).hexdigest()
+            if start_page or max_pages is not None:
+                cache_key = f"{cache_key}:{start_page}:{max_pages}"
+            if self.ocr is not None:
+                # Text cached before OCR was available may be missing scanned pages
+                cache_key = f"{cache_key}:ocr"
+            cached = self.cache.get(cache_key) if self.cache is not None else None
+            if cached is not None:
+                results[index] = cached
+                self._log_timing(source.name, time.perf_counter() - start, len(cached), cache_hit=True)
+            else:
+                pending.append((index, cache_key, pdf_bytes))
+
+        if not pending:
+            return results
+
+        if PDF_EXTRACTION_WORKERS > 1 and len(pending) > 1:
+            results_and_errors = _EXTRACTION_POOL.run_many(
+                parse_pdf_pages,
+                [(pdf_bytes, start_page, max_pages) for _, _, pdf_bytes in pending],
+                timeout=PDF_EXTRACTION_TIMEOUT
+            )
+            outcomes = [(item, parsed, error) for item, (parsed, error) in zip(pending, results_and_errors)]
+        else:
+            outcomes = []
+            for item in pending:
+                try:
+                    outcomes.append((item, parse_pdf_pages(item[2], start_page, max_pages), None))
+                except Exception as e:
+                    outcomes.append((item, None, e))
+
+        parsed_documents = []  # (index, cache_key, pdf_bytes, pages, elapsed)
+        for (index, cache_key, pdf_bytes), parsed, error in outcomes:
+            if error is not None:
+                name = sources[index].name
+                self.logger.log_text(f"[PDF-TEXT] Error reading PDF {name}: {error}", severity="ERROR")
+                results[index] = f"Error reading PDF: {error}"
+                continue
+            pages, elapsed = parsed
+            parsed_documents.append((index, cache_key, pdf_bytes, pages, elapsed))
+
+        # Scanned pages of every document are OCR'd together, so documents do not wait on each other
+        scanned = [
+            [i for i, page in enumerate(pages) if len(page.strip()) < OCR_MIN_PAGE_CHARS] if self.ocr is not None else []
+            for _, _, _, pages, _ in parsed_documents
+        ]
+        ocr_results = [(pages, 0) for _, _, _, pages, _ in parsed_documents]
+        ocr_elapsed = 0.0
+        if any(scanned):
+            ocr_start = time.perf_counter()
+            ocr_results = self.ocr.fill_many([
+                (sources[index].name, pdf_bytes, pages, scanned_pages, start_page)
+                for (index, _, pdf_bytes, pages, _), scanned_pages in zip(parsed_documents, scanned)
+            ])
+            ocr_elapsed = time.perf_counter() - ocr_start
+
+        for (index, cache_key, _, _, elapsed), scanned_pages, (pages, ocr_errors) in zip(
+            parsed_documents, scanned, ocr_results
+        ):
+            if scanned_pages:
+                elapsed += ocr_elapsed
+            text = "".join(f"{page_text}\n" for page_text in pages)
+            # Pages whose OCR failed are still empty: retry them on the next request
+            if self.cache is not None and not ocr_errors:
+                self.cache.set(cache_key, text)
+            results[index] = text
+            self._log_timing(sources[index].name, elapsed, len(text), cache_hit=False)
+
+        return results
+
+    def _log_timing(self, name: str, elapsed: float, chars: int, cache_hit: bool) -> None:
+        """Log per-document extraction timing."""
+        self.logger.log_struct({
+            "evento": "pdf_text_extraction",
+            "document": name,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "chars": chars,
+            "cache_hit": cache_hit
+        })
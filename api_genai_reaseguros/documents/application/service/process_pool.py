@@ -0,0 +1,131 @@
+"""
+Shared Process Pools
+
+Process pools shared by every service instance in a worker process. Workers
+are started with "spawn": forking the multi-threaded ASGI worker could copy
+locks held by other threads into the children. A pool whose worker died is
+replaced and the affected tasks are submitted once more; results are awaited
+with a deadline, so one pathological input cannot hang a request.
+"""
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+# (result, error) of one task; exactly one of them is set
+TaskOutcome = Tuple[Any, Optional[BaseException]]
+
+
+class SharedProcessPool:
+    """Lazily created process pool that is rebuilt after a worker crash."""
+
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: Tuple[Any, ...] = ()
+    ):
+        """
+        Initialize the pool settings; no process starts until the first task.
+
+        Args:
+            name: Pool name, for error messages
+            max_workers: Worker processes
+            initializer: Called once in each worker when it starts
+            initargs: Arguments of the initializer
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.initializer = initializer
+        self.initargs = initargs
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.restarts = 0
+
+    def _get(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self.initializer,
+                    initargs=self.initargs
+                )
+            return self._pool
+
+    def _discard(self, pool: ProcessPoolExecutor) -> None:
+        """Drop a broken pool so the next task starts a new one (other threads may have done it already)."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+                self.restarts += 1
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _submit_all(self, fn: Callable[..., Any], calls: Sequence[Tuple[Any, ...]]) -> Tuple[ProcessPoolExecutor, List[Future]]:
+        pool = self._get()
+        futures = []
+        for args in calls:
+            try:
+                futures.append(pool.submit(fn, *args))
+            except BrokenProcessPool as e:
+                # The pool broke while submitting: report the remaining tasks as broken too
+                failed = Future()
+                failed.set_exception(e)
+                futures.append(failed)
+        return pool, futures
+
+    def run_many(
+        self,
+        fn: Callable[..., Any],
+        calls: Sequence[Tuple[Any, ...]],
+        timeout: Optional[float] = None
+    ) -> List[TaskOutcome]:
+        """
+        Run ``fn(*args)`` for each argument tuple on the pool.
+
+        Tasks lost to a crashed worker are submitted once more on a new pool.
+        A task not finished when the deadline passes is reported as a
+        TimeoutError; its worker keeps running it in the background.
+
+        Args:
+            fn: Picklable module-level function
+            calls: Argument tuples, one per task
+            timeout: Seconds to wait for all the tasks (None waits forever)
+
+        Returns:
+            (result, error) per task, in the order of ``calls``
+        """
+        outcomes: List[TaskOutcome] = [(None, None)] * len(calls)
+        pending = list(range(len(calls)))
+        for attempt in range(2):
+            deadline = None if timeout is None else time.monotonic() + timeout
+            pool, futures = self._submit_all(fn, [calls[i] for i in pending])
+            broken = []
+            for index, future in zip(pending, futures):
+                remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    outcomes[index] = (future.result(remaining), None)
+                except BrokenProcessPool as e:
+                    broken.append(index)
+                    outcomes[index] = (None, e)
+                except FuturesTimeoutError:
+                    future.cancel()
+                    outcomes[index] = (None, TimeoutError(f"{self.name} task did not finish within {timeout}s"))
+                except Exception as e:
+                    outcomes[index] = (None, e)
+            if not broken:
+                break
+            self._discard(pool)
+            pending = broken
+        return outcomes
+
+    def run(self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None) -> Any:
+        """Run one task on the pool (see run_many) and return its result or raise its error."""
+        result, error = self.run_many(fn, [args], timeout)[0]
+        if error is not None:
+            raise error
+        return result
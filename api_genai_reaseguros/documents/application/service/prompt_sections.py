@@ -0,0 +1,145 @@
+"""
+Prompt Sections
+
+Splits the comparison prompt (agent3.md) by its "SECCIONES Y ITEMS" headings so
+each section can be compared in its own LLM request, and merges the partial
+results back into a single item list.
+"""
+from typing import Any, Dict, List, Tuple
+
+from documents.domain.entities.prompt_template import PromptSection
+
+SECTIONS_HEADER = "## **SECCIONES Y ITEMS**"
+
+
+def split_prompt_sections(template: str) -> Tuple[str, List[PromptSection], str]:
+    """
+    Split a comparison prompt into preamble, sections and trailer.
+
+    Args:
+        template: Full prompt text
+
+    Returns:
+        Tuple of (preamble, sections, trailer). Sections is empty when the
+        template has no sections header.
+    """
+    preamble, header, rest = template.partition(SECTIONS_HEADER)
+    if not header:
+        return template, [], ""
+
+    listing, separator, trailer = rest.partition("\n---")
+    sections: List[PromptSection] = []
+    number = 1
+    for line in listing.splitlines():
+        line = line.strip()
+        if line.startswith("## "):
+            sections.append(PromptSection(title=line[3:].strip(), first_number=number))
+        elif line.startswith("- ") and sections:
+            item = line[2:].split("**")[1] if line.count("**") >= 2 else line[2:]
+            sections[-1].items.append(item.strip().rstrip(":").strip())
+            number += 1
+
+    return preamble, [s for s in sections if s.items], separator + trailer
+
+
+def build_section_prompt(preamble: str, section: PromptSection, trailer: str) -> str:
+    """
+    Build the prompt that compares only the items of one section.
+
+    Args:
+        preamble: Prompt text before the sections listing
+        section: Section to compare
+        trailer: Prompt text after the sections listing
+
+    Returns:
+        Prompt text for the section request
+    """
+    items = "\n".join(
+        f"- **{item}** (N={section.first_number + offset})"
+        for offset, item in enumerate(section.items)
+    )
+    return f"""{preamble}
+{SECTIONS_HEADER}
+## {section.title}
+{items}
+
+⚠️ ALCANCE DE ESTA SOLICITUD:
+- Compara ÚNICAMENTE los ítems {section.first_number} a {section.last_number} de la sección {section.title}, conservando esa numeración en "N".
+- Ignora la indicación de generar 31 ítems: devuelve un JSON con la clave "items" que contenga solo estos {len(section.items)} ítems.
+{trailer}"""
+
+
+def build_repair_instructions(sections: List[PromptSection], numbers: List[int], errors: Dict[int, str]) -> str:
+    """
+    Build the instructions appended to a deconstruct input to redo only some items.
+
+    Args:
+        sections: Prompt sections, to name each item
+        numbers: Item numbers to redo
+        errors: Validation error per item number, when the item was returned malformed
+
+    Returns:
+        Instruction text listing the requested items
+    """
+    names = {
+        section.first_number + offset: (section.title, item)
+        for section in sections
+        for offset, item in enumerate(section.items)
+    }
+    lines = []
+    for number in numbers:
+        title, item = names.get(number, ("", ""))
+        line = f"- N={number}: **{item}** ({title})" if item else f"- N={number}"
+        if number in errors:
+            line += f" — la respuesta anterior no era válida: {errors[number]}"
+        lines.append(line)
+    listing = "\n".join(lines)
+    return f"""
+        =============
+        ⚠️ REINTENTO PARCIAL:
+        Devuelve un JSON con la clave "items" que contenga ÚNICAMENTE estos {len(numbers)} ítems, conservando su numeración:
+        {listing}
+        """
+
+
+def extract_items(data: Any) -> List[Dict[str, Any]]:
+    """Find the list of item objects in a parsed comparison response."""
+    if isinstance(data, list):
+        return [item for item in data if isinstance(item, dict)]
+    if isinstance(data, dict):
+        for value in data.values():
+            if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+                return value
+    return []
+
+
+def _item_number(item: Dict[str, Any]) -> int:
+    try:
+        return int(item.get("N", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def merge_section_results(results: List[Tuple[PromptSection, Any]]) -> Dict[str, Any]:
+    """
+    Merge per-section responses into one comparison ordered by item number.
+
+    Args:
+        results: (section, parsed response or error dict) pairs
+
+    Returns:
+        {"items": [...]} plus "section_errors" for sections without usable items
+    """
+    items: List[Dict[str, Any]] = []
+    errors = []
+    for section, data in results:
+        section_items = extract_items(data)
+        if not section_items:
+            detail = data.get("error") if isinstance(data, dict) and "error" in data else "No items returned"
+            errors.append({"section": section.title, "error": detail})
+        items.extend(section_items)
+
+    merged: Dict[str, Any] = {"items": sorted(items, key=_item_number)}
+    if errors:
+        merged["section_errors"] = errors
+    return merged
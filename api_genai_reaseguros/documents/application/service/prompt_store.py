@@ -0,0 +1,196 @@
+"""
+Prompt Store
+
+Keeps every template under the prompts directory in memory, reloading a file
+only when its mtime changes and applying overrides from AgentGarden.prompt.
+"""
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from documents.application.constants.app_constants import DEFAULT_AGENT_QUESTION, PROMPT_AGENT_KEYS
+from documents.application.service.prompt_sections import split_prompt_sections
+from documents.domain.entities.prompt_template import PromptTemplate
+from documents.domain.logger import get_logger
+from documents.domain.constants.env_constants import (
+    LOGGING_TYPE,
+    PROMPTS_DIR,
+    PROMPT_RELOAD_INTERVAL,
+)
+
+
+def _hash_content(content: str) -> str:
+    """Short SHA-256 identity of a template."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+def _check_comparison_prompt(content: str) -> Optional[str]:
+    """The comparison prompt must list its numbered sections (DECONSTRUCT_MODE sections/contracts split on them)."""
+    _, sections, _ = split_prompt_sections(content)
+    if not sections:
+        return "no sections to split on"
+    return None
+
+
+# Structural checks an override must pass to replace the file prompt (None = valid, else the reason)
+_OVERRIDE_CHECKS: Dict[str, Callable[[str], Optional[str]]] = {
+    "agent3.md": _check_comparison_prompt,
+}
+
+
+class PromptStore:
+    """In-memory prompt templates with mtime-based hot reload."""
+
+    def __init__(self, prompts_dir: str = PROMPTS_DIR, reload_interval: float = PROMPT_RELOAD_INTERVAL):
+        """
+        Initialize the store and load every template in ``prompts_dir``.
+
+        Args:
+            prompts_dir: Directory containing the prompt files
+            reload_interval: Minimum seconds between mtime checks / DB override lookups
+        """
+        self.logger = get_logger(PromptStore.__name__, LOGGING_TYPE)
+        self.prompts_dir = Path(prompts_dir)
+        self.reload_interval = reload_interval
+
+        self._lock = threading.Lock()
+        self._files: Dict[str, Tuple[float, PromptTemplate]] = {}
+        self._overrides: Dict[str, PromptTemplate] = {}
+        # Hash of the last rejected override per prompt, so each bad override is reported once
+        self._rejected: Dict[str, str] = {}
+        self._last_check = 0.0
+
+        self._refresh(force=True)
+
+    def get(self, name: str) -> PromptTemplate:
+        """
+        Get a template by filename (e.g. ``agent3.md``).
+
+        Args:
+            name: Prompt filename
+
+        Returns:
+            PromptTemplate with content and content hash
+
+        Raises:
+            FileNotFoundError: If no template or override exists for ``name``
+        """
+        if time.monotonic() - self._last_check >= self.reload_interval:
+            self._refresh()
+
+        with self._lock:
+            if name in self._overrides:
+                return self._overrides[name]
+            if name in self._files:
+                return self._files[name][1]
+
+        raise FileNotFoundError(f"Prompt '{name}' not found in {self.prompts_dir}")
+
+    def _refresh(self, force: bool = False) -> None:
+        """
+        Reload changed files and DB overrides.
+
+        The DB query runs outside the lock, so readers keep getting the current
+        templates meanwhile; only the swap of the new overrides takes the lock.
+        """
+        with self._lock:
+            if not force and time.monotonic() - self._last_check < self.reload_interval:
+                # Another thread refreshed while this one was waiting
+                return
+            self._last_check = time.monotonic()
+            self._reload_files()
+
+        overrides = self._load_overrides()
+        if overrides is not None:
+            with self._lock:
+                self._overrides = overrides
+
+    def _reload_files(self) -> None:
+        """Load new or modified files and forget deleted ones. Caller must hold the lock."""
+        if not self.prompts_dir.is_dir():
+            self.logger.log_text(f"[PROMPTS] Directory not found: {self.prompts_dir}", severity="WARNING")
+            return
+
+        seen = set()
+        for path in self.prompts_dir.iterdir():
+            if not path.is_file():
+                continue
+            seen.add(path.name)
+            mtime = path.stat().st_mtime
+            current = self._files.get(path.name)
+            if current is not None and current[0] == mtime:
+                continue
+
+            content = path.read_text(encoding="utf-8")
+            template = PromptTemplate(name=path.name, content=content, content_hash=_hash_content(content))
+            self._files[path.name] = (mtime, template)
+            self.logger.log_text(f"[PROMPTS] Loaded {path.name} ({template.content_hash})")
+
+        for name in set(self._files) - seen:
+            del self._files[name]
+
+    def _load_overrides(self) -> Optional[Dict[str, PromptTemplate]]:
+        """
+        Load template overrides stored in AgentGarden.prompt for known agent keys.
+
+        Returns:
+            Valid overrides by prompt name, or None when the DB could not be read
+            (the last known overrides are kept)
+        """
+        try:
+            from documents.models import AgentGarden
+
+            rows = AgentGarden.objects.filter(
+                document_type__in=list(PROMPT_AGENT_KEYS.values())
+            ).exclude(prompt=DEFAULT_AGENT_QUESTION).order_by("created_at")
+            prompts_by_key = {row.document_type: row.prompt for row in rows}
+        except Exception as e:
+            # DB not ready (startup, migrations, local runs): keep the last known overrides
+            self.logger.log_text(f"[PROMPTS] Overrides not loaded: {e}", severity="WARNING")
+            return None
+
+        overrides = {}
+        for name, agent_key in PROMPT_AGENT_KEYS.items():
+            content = prompts_by_key.get(agent_key)
+            if not content:
+                continue
+            check = _OVERRIDE_CHECKS.get(name)
+            problem = check(content) if check is not None else None
+            if problem:
+                # Keep serving the file prompt rather than an override the workflow cannot use
+                content_hash = _hash_content(content)
+                if self._rejected.get(name) != content_hash:
+                    self._rejected[name] = content_hash
+                    self.logger.log_text(
+                        f"[PROMPTS] Ignoring AgentGarden override for {name} ({agent_key}): {problem}",
+                        severity="WARNING"
+                    )
+                continue
+            overrides[name] = PromptTemplate(
+                name=name,
+                content=content,
+                content_hash=_hash_content(content),
+                source="AgentGarden"
+            )
+        return overrides
+
+
+_PROMPT_STORE: Optional[PromptStore] = None
+_PROMPT_STORE_LOCK = threading.Lock()
+
+
+def get_prompt_store() -> PromptStore:
+    """
+    Get the process-wide prompt store, loading it on first use.
+
+    Returns:
+        PromptStore: Shared prompt store
+    """
+    global _PROMPT_STORE
+    if _PROMPT_STORE is None:
+        with _PROMPT_STORE_LOCK:
+            if _PROMPT_STORE is None:
+                _PROMPT_STORE = PromptStore()
+    return _PROMPT_STORE
@@ -0,0 +1,184 @@
+"""
+Report Renderer Service
+
+Renders the comparison report HTML directly from the 31-item comparison JSON
+with a Django template, following the layout requested in agent5.md. Only the
+executive summary (Dictamen Legal) may come from the LLM.
+"""
+import re
+from typing import Any, Dict, List, Optional
+
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from documents.application.service.contract_comparison import POLIZA_COLUMNS, CONCLUSION_COLUMN
+from documents.application.service.prompt_sections import extract_items
+from documents.domain.logger import get_logger
+from documents.domain.constants.env_constants import LOGGING_TYPE
+
+REPORT_TEMPLATE = "documents/comparison_report.html"
+
+_COMPARISON_KEY_RE = re.compile(r"^COMPARACI[ÓO]N\s*-?\s*(.+?)\s*\(Slip\)$", re.IGNORECASE)
+_DETAIL_KEY_RE = re.compile(r"^DETALLE\s*-\s*(.+?)\s*\(Slip\)$", re.IGNORECASE)
+
+# Risk levels by comparison icon, worst first
+_LEVELS = {
+    "critical": {"icon": "❌", "css": "alert-critical", "text_css": "risk-critical", "label": "CRÍTICO"},
+    "medium": {"icon": "⚠️", "css": "alert-medium", "text_css": "risk-high", "label": "MEDIO"},
+    "low": {"icon": "✅", "css": "alert-low", "text_css": "", "label": "SIN OBSERVACIONES"},
+}
+
+
+def _risk_level(values: List[Any]) -> str:
+    """Worst level found in the comparison values ("low" when no icon is present)."""
+    text = " ".join(str(v) for v in values if v)
+    for level, spec in _LEVELS.items():
+        # The warning sign may come without the emoji variation selector
+        if spec["icon"] in text or spec["icon"].rstrip("\ufe0f") in text:
+            return level
+    return "low"
+
+
+def _reinsurers(items: List[Dict[str, Any]]) -> List[str]:
+    """Reinsurer names in first-seen order, from the per-slip column keys."""
+    names: List[str] = []
+    for item in items:
+        for key in item:
+            match = _COMPARISON_KEY_RE.match(key) or _DETAIL_KEY_RE.match(key)
+            if match and match.group(1) not in names:
+                names.append(match.group(1))
+    return names
+
+
+def _slip_columns(item: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """Detail and comparison values of one reinsurer for an item."""
+    cell = {"detail": "", "comparison": ""}
+    for key, value in item.items():
+        comparison = _COMPARISON_KEY_RE.match(key)
+        detail = _DETAIL_KEY_RE.match(key)
+        if comparison and comparison.group(1) == name:
+            cell["comparison"] = value
+        elif detail and detail.group(1) == name:
+            cell["detail"] = value
+    return cell
+
+
+def _poliza_detail(items: List[Dict[str, Any]], item_name: str) -> str:
+    """Poliza detail of the item called ``item_name`` (e.g. ASEGURADOS)."""
+    for item in items:
+        if str(item.get("ITEM_PÓLIZA", "")).strip().upper() == item_name:
+            return str(item.get("DETALLE_ÍTEM (Póliza)", ""))
+    return ""
+
+
+class ReportRendererService:
+    """Service for rendering the comparison report HTML without an LLM call."""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        """
+        Initialize the renderer.
+
+        Args:
+            trace_id: Optional trace ID for logging
+        """
+        self.logger = get_logger(ReportRendererService.__name__, LOGGING_TYPE)
+        if trace_id:
+            self.logger.set_trace(trace_id)
+        self.trace_id = trace_id
+
+    def build_context(self, comparison_data: Dict[str, Any], summary_html: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the template context from the comparison JSON.
+
+        Args:
+            comparison_data: Output of the deconstruct node
+            summary_html: Optional executive summary HTML fragment
+
+        Returns:
+            Template context dictionary
+        """
+        items = extract_items(comparison_data)
+        reinsurers = _reinsurers(items)
+        counts = {name: {"name": name, "low": 0, "medium": 0, "critical": 0} for name in reinsurers}
+
+        sections: List[Dict[str, Any]] = []
+        findings = []
+        for item in items:
+            cells = [_slip_columns(item, name) for name in reinsurers]
+            for name, cell in zip(reinsurers, cells):
+                if cell["comparison"]:
+                    counts[name][_risk_level([cell["comparison"]])] += 1
+
+            level = _risk_level([c["comparison"] for c in cells] + [item.get(CONCLUSION_COLUMN)])
+            row = {
+                "number": item.get("N", ""),
+                "section": item.get("SECCIÓN_PÓLIZA", ""),
+                "item": item.get("ITEM_PÓLIZA", ""),
+                "poliza": item.get("DETALLE_ÍTEM (Póliza)", ""),
+                "cells": cells,
+                "conclusion": item.get(CONCLUSION_COLUMN, ""),
+                "level": _LEVELS[level],
+            }
+            if not reinsurers:
+                # Unrecognized column names: show them as-is instead of dropping them
+                row["conclusion"] = "\n".join(
+                    f"{key}: {value}" for key, value in item.items() if key not in POLIZA_COLUMNS
+                )
+            if level != "low":
+                findings.append(row)
+
+            if not sections or sections[-1]["title"] != row["section"]:
+                sections.append({"title": row["section"], "rows": []})
+            sections[-1]["rows"].append(row)
+
+        critical = sum(1 for row in findings if row["level"] is _LEVELS["critical"])
+        if critical:
+            verdict = {"css": "alert-critical", "text": f"⛔ Alerta crítica: {critical} ítem(s) con discrepancias críticas."}
+        elif findings:
+            verdict = {"css": "alert-high", "text": f"⚠️ {len(findings)} ítem(s) con inconsistencias menores."}
+        else:
+            verdict = {"css": "alert-low", "text": "🟢 Sin observaciones materiales"}
+
+        errors = []
+        if isinstance(comparison_data, dict):
+            if "error" in comparison_data:
+                errors.append(str(comparison_data["error"]))
+            for entry in comparison_data.get("section_errors", []) + comparison_data.get("contract_errors", []):
+                errors.append(f"{entry.get('section') or entry.get('contract')}: {entry.get('error')}")
+
+        return {
+            "asegurado": _poliza_detail(items, "ASEGURADOS"),
+            "ramo": _poliza_detail(items, "TIPO"),
+            "fecha": timezone.localdate(),
+            "summary_html": summary_html,
+            "verdict": verdict,
+            "reinsurers": reinsurers,
+            "reinsurer_counts": list(counts.values()),
+            "findings": findings,
+            "sections": sections,
+            "errors": errors,
+        }
+
+    def render(self, comparison_data: Dict[str, Any], summary_html: Optional[str] = None) -> str:
+        """
+        Render the report HTML.
+
+        Args:
+            comparison_data: Output of the deconstruct node
+            summary_html: Optional executive summary HTML fragment; a summary
+                computed from the comparison icons is used when omitted
+
+        Returns:
+            Complete HTML document
+        """
+        context = self.build_context(comparison_data, summary_html)
+        html = render_to_string(REPORT_TEMPLATE, context)
+        self.logger.log_struct({
+            "evento": "report_rendered",
+            "items": sum(len(s["rows"]) for s in context["sections"]),
+            "reinsurers": len(context["reinsurers"]),
+            "findings": len(context["findings"]),
+            "llm_summary": summary_html is not None,
+            "html_size": len(html)
+        })
+        return html
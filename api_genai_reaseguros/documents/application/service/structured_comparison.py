@@ -0,0 +1,132 @@
+"""
+Structured Comparison
+
+Incremental parser for schema-constrained deconstruct responses. The JSON is
+scanned once while it streams in, tracking nesting depth, and each item of the
+"items" array is decoded and validated on its own as soon as it closes, so a
+malformed or truncated item only invalidates itself: the caller keeps the
+valid items and retries just the rest.
+"""
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from documents.domain.entities.comparison_result import ComparisonItem
+
+
+def _raw_number(raw: Any) -> Optional[int]:
+    """Item number of a raw item that failed validation, if it can be read."""
+    try:
+        return int(raw.get("numero")) if isinstance(raw, dict) else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _validation_summary(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in error.errors()[:3]
+    )
+
+
+class ComparisonStreamParser:
+    """Parses a streamed ComparisonResult JSON into validated items."""
+
+    def __init__(self):
+        self.buffer = ""
+        self.items: Dict[int, ComparisonItem] = {}
+        self.errors: Dict[int, str] = {}
+        self._checked = 0
+        # Scanner state: every character of the buffer is looked at once
+        self._scanned = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_key = None
+        self._items_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+
+    def _validate(self, raw: Any) -> None:
+        """Validate one raw item and record it as valid or failed."""
+        self._checked += 1
+        try:
+            item = ComparisonItem.model_validate(raw)
+        except ValidationError as e:
+            number = _raw_number(raw)
+            if number is not None:
+                self.errors[number] = _validation_summary(e)
+            return
+        # A repeated number keeps the first valid occurrence
+        self.items.setdefault(item.numero, item)
+        self.errors.pop(item.numero, None)
+
+    def _complete_item(self, end: int) -> None:
+        """Decode and validate the item object ending at ``end``."""
+        try:
+            raw = json.loads(self.buffer[self._item_start:end + 1])
+        except json.JSONDecodeError:
+            # Not valid JSON: the whole response fails to decode too, so close() cannot recover it
+            self._checked += 1
+            return
+        self._validate(raw)
+
+    def _scan(self) -> None:
+        """Advance over the new text, completing every item whose closing brace arrived."""
+        buffer = self.buffer
+        for position in range(self._scanned, len(buffer)):
+            char = buffer[position]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_key = buffer[self._string_start:position + 1]
+            elif char == '"':
+                self._in_string = True
+                self._string_start = position
+            elif char in "{[":
+                if char == "[" and self._depth == 1 and self._last_key == '"items"':
+                    self._items_depth = 2
+                elif char == "{" and self._depth == self._items_depth:
+                    self._item_start = position
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == self._items_depth:
+                    if char == "}" and self._item_start is not None:
+                        self._complete_item(position)
+                    self._item_start = None
+                elif self._items_depth is not None and self._depth < self._items_depth:
+                    self._items_depth = None
+        self._scanned = len(buffer)
+
+    def feed(self, chunk: str) -> None:
+        """Append a response chunk and validate the items it completed."""
+        self.buffer += chunk
+        self._scan()
+
+    def close(self) -> Tuple[Dict[int, ComparisonItem], Dict[int, str]]:
+        """
+        Validate the rest of the response.
+
+        Items completed while streaming are already validated; a truncated last
+        item is never trusted.
+
+        Returns:
+            Tuple of (valid items by number, validation error by item number)
+        """
+        self._scan()
+        try:
+            data = json.loads(self.buffer)
+        except json.JSONDecodeError:
+            data = None
+        items = data.get("items") if isinstance(data, dict) else None
+        if isinstance(items, list):
+            # Normally every item was completed while streaming; this catches any the scanner missed
+            for raw in items[self._checked:]:
+                self._validate(raw)
+        return self.items, {n: e for n, e in self.errors.items() if n not in self.items}
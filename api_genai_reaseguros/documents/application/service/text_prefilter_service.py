@@ -0,0 +1,303 @@
+"""
+Text Prefilter Service
+
+Trims extracted document text before it is sent to the LLM: strips page
+header/footer lines, keeps in each document the blocks relevant to the
+comparison items using a local BM25 index (never less than a minimum share of
+the document), and replaces blocks already sent for another document with a
+reference to that clause.
+"""
+import hashlib
+import math
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Set
+
+from documents.domain.logger import get_logger
+from documents.domain.constants.env_constants import (
+    LOGGING_TYPE,
+    PREFILTER_TOP_K_PER_ITEM,
+    PREFILTER_REPEATED_LINE_MIN,
+    PREFILTER_MAX_BLOCK_CHARS,
+    PREFILTER_MIN_DOC_SHARE,
+)
+
+_WORD_RE = re.compile(r"\w+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n")
+
+# Frequent Spanish/English words that carry no signal for item matching
+_STOPWORDS = {
+    "del", "las", "los", "por", "para", "con", "una", "uno", "que", "como", "sus", "este", "esta",
+    "sea", "son", "ser", "sin", "sobre", "entre", "cada", "todo", "toda", "todos", "the", "and",
+    "for", "with", "this", "that", "any", "all", "are", "not", "under", "shall", "from"
+}
+
+# English wording of the (Spanish) comparison item terms: slips are usually written in English, and BM25 only
+# matches exact tokens. Keys and values are normalized tokens (lowercase, no accents)
+_QUERY_SYNONYMS = {
+    "asegurados": "insured reinsured assured",
+    "moneda": "currency",
+    "vigencia": "period inception expiry expiration",
+    "actividad": "business occupation activity",
+    "locales": "location locations situation premises",
+    "garantias": "warranty warranties",
+    "recomendacion": "recommendation recommendations survey",
+    "condiciones": "conditions",
+    "especiales": "special clauses",
+    "subjetividades": "subjectivity subjectivities",
+    "exclusiones": "exclusion exclusions excluding",
+    "materia": "interest subject",
+    "esquema": "layer excess primary structure",
+    "avaluo": "valuation basis",
+    "indemnizacion": "indemnity reinstatement",
+    "bienes": "property",
+    "valores": "values tiv",
+    "declarados": "declared",
+    "modalidad": "form wording",
+    "coberturas": "cover coverage perils",
+    "tasa": "rate",
+    "prima": "premium",
+    "coaseguro": "coinsurance share",
+    "sumas": "sum",
+    "aseguradas": "insured",
+    "limites": "limit limits",
+    "deducible": "deductible deductibles",
+    "exceso": "excess",
+    "territoriales": "territorial territory",
+    "ley": "law choice",
+    "jurisdiccion": "jurisdiction",
+    "sellos": "stamp signed",
+    "participacion": "written signed line share",
+    "reclamos": "claims",
+    "cooperacion": "cooperation control",
+    "proporcion": "proportion",
+}
+
+# Rough characters-per-token ratio used to report estimated savings
+_CHARS_PER_TOKEN = 4
+
+# Rough characters per extracted PDF page, to estimate the page count of a text
+_CHARS_PER_PAGE = 2500
+
+# A page header/footer repeats on at least this share of the pages and spans at least this share of the lines
+_HEADER_PAGE_SHARE = 0.5
+_HEADER_SPAN_SHARE = 0.5
+
+# Characters of the clause heading quoted in the reference to an identical clause
+_CLAUSE_TITLE_CHARS = 80
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+def _tokenize(text: str) -> List[str]:
+    return [w for w in _WORD_RE.findall(_normalize(text)) if len(w) > 2 and w not in _STOPWORDS]
+
+
+def _query_tokens(query: str) -> List[str]:
+    """Tokens of an item query plus their English wording."""
+    tokens = _tokenize(query)
+    return tokens + [word for token in tokens for word in _QUERY_SYNONYMS.get(token, "").split()]
+
+
+def _block_digest(block: str) -> str:
+    return hashlib.sha1(" ".join(block.split()).encode("utf-8")).hexdigest()
+
+
+def _clause_title(block: str) -> str:
+    """First line of a block, shortened, to name the clause it holds."""
+    title = block.strip().splitlines()[0].strip()
+    return title if len(title) <= _CLAUSE_TITLE_CHARS else title[:_CLAUSE_TITLE_CHARS].rstrip() + "…"
+
+
+class _Bm25Index:
+    """Minimal BM25 (Okapi) index over a list of tokenized blocks."""
+
+    def __init__(self, documents: List[List[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(doc) for doc in documents]
+        self.lengths = [len(doc) for doc in documents]
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+        doc_freq = Counter(term for tf in self.term_freqs for term in tf)
+        total = len(documents)
+        self.idf = {
+            term: math.log(1 + (total - freq + 0.5) / (freq + 0.5))
+            for term, freq in doc_freq.items()
+        }
+
+    def scores(self, query: List[str]) -> List[float]:
+        results = []
+        for tf, length in zip(self.term_freqs, self.lengths):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self.avg_length) if self.avg_length else self.k1
+            for term in query:
+                freq = tf.get(term)
+                if freq:
+                    score += self.idf[term] * freq * (self.k1 + 1) / (freq + norm)
+            results.append(score)
+        return results
+
+
+class TextPrefilterService:
+    """Service for reducing document text to the passages relevant to the comparison."""
+
+    def __init__(
+        self,
+        trace_id: Optional[str] = None,
+        top_k_per_item: int = PREFILTER_TOP_K_PER_ITEM,
+        repeated_line_min: int = PREFILTER_REPEATED_LINE_MIN,
+        max_block_chars: int = PREFILTER_MAX_BLOCK_CHARS,
+        min_doc_share: float = PREFILTER_MIN_DOC_SHARE
+    ):
+        """
+        Initialize the prefilter.
+
+        Args:
+            trace_id: Optional trace ID for logging
+            top_k_per_item: Blocks kept per comparison item query, in each document
+            repeated_line_min: Minimum occurrences of a short line before it can be
+                treated as a page header/footer
+            max_block_chars: Maximum size of a block; longer paragraphs are split on lines
+            min_doc_share: Minimum share of each document's text that is kept, topped up
+                with its next most relevant blocks
+        """
+        self.logger = get_logger(TextPrefilterService.__name__, LOGGING_TYPE)
+        if trace_id:
+            self.logger.set_trace(trace_id)
+        self.trace_id = trace_id
+        self.top_k_per_item = top_k_per_item
+        self.repeated_line_min = repeated_line_min
+        self.max_block_chars = max_block_chars
+        self.min_doc_share = min_doc_share
+
+    def _strip_repeated_lines(self, text: str) -> str:
+        """
+        Remove page headers and footers (broker headers, envelope ids, page marks).
+
+        Pages are not delimited in the extracted text, so a short line counts as a
+        header/footer only when it repeats on about every other page or more
+        (estimated from the text length) and its occurrences span the document.
+        Short clause lines that repeat a few times (e.g. "Written", "Signed") stay.
+        """
+        lines = text.splitlines()
+        positions: Dict[str, List[int]] = defaultdict(list)
+        for number, line in enumerate(lines):
+            line = line.strip()
+            if 0 < len(line) <= 120:
+                positions[line].append(number)
+
+        pages = max(1, round(len(text) / _CHARS_PER_PAGE))
+        min_count = max(self.repeated_line_min, math.ceil(pages * _HEADER_PAGE_SHARE))
+        repeated = {
+            line for line, found in positions.items()
+            if len(found) >= min_count and found[-1] - found[0] >= len(lines) * _HEADER_SPAN_SHARE
+        }
+        if not repeated:
+            return text
+        return "\n".join(line for line in lines if line.strip() not in repeated)
+
+    def _split_blocks(self, text: str) -> List[str]:
+        """Split text into clause-sized blocks: paragraphs, cut on line breaks to at most max_block_chars."""
+        blocks = []
+        for paragraph in _BLANK_LINES_RE.split(text):
+            current: List[str] = []
+            size = 0
+            for line in paragraph.splitlines():
+                if not line.strip():
+                    continue
+                if current and size + len(line) > self.max_block_chars:
+                    blocks.append("\n".join(current))
+                    current, size = [], 0
+                current.append(line)
+                size += len(line) + 1
+            if current:
+                blocks.append("\n".join(current))
+        return blocks
+
+    def _select_blocks(self, blocks: List[str], queries: List[List[str]]) -> Set[int]:
+        """
+        Indexes of the blocks of one document to keep.
+
+        Blocks are ranked within the document, so a long document cannot crowd
+        out the others: the top ``top_k_per_item`` blocks per query are kept,
+        then the next best blocks until ``min_doc_share`` of the text is kept.
+        """
+        if not blocks or not queries:
+            return set(range(len(blocks)))
+
+        index = _Bm25Index([_tokenize(block) for block in blocks])
+        keep: Set[int] = set()
+        best = [0.0] * len(blocks)
+        for query in queries:
+            scores = index.scores(query)
+            ranked = sorted(range(len(scores)), key=lambda i: scores[i], reverse=True)
+            keep.update(i for i in ranked[:self.top_k_per_item] if scores[i] > 0)
+            best = [max(a, b) for a, b in zip(best, scores)]
+
+        min_chars = self.min_doc_share * sum(len(block) for block in blocks)
+        kept_chars = sum(len(blocks[i]) for i in keep)
+        for i in sorted(range(len(blocks)), key=lambda i: best[i], reverse=True):
+            if kept_chars >= min_chars:
+                break
+            if i not in keep:
+                keep.add(i)
+                kept_chars += len(blocks[i])
+        return keep
+
+    def filter_documents(self, names: List[str], texts: List[str], item_queries: List[str]) -> List[str]:
+        """
+        Reduce each document to the blocks relevant to the comparison items.
+
+        Args:
+            names: Document names, used to reference de-duplicated blocks
+            texts: Extracted text per document (poliza first)
+            item_queries: One query per comparison item (e.g. the 31 item names)
+
+        Returns:
+            Filtered text per document, in the same order
+        """
+        queries = [_query_tokens(query) for query in item_queries]
+        doc_blocks = [self._split_blocks(self._strip_repeated_lines(text)) for text in texts]
+        selected = [self._select_blocks(blocks, queries) for blocks in doc_blocks]
+
+        # First document that sent each kept block: later identical copies only reference it
+        sent: Dict[str, int] = {}
+        filtered = []
+        references = 0
+        for doc_index, (blocks, keep) in enumerate(zip(doc_blocks, selected)):
+            parts = []
+            seen_here = set()
+            for block_index in sorted(keep):
+                block = blocks[block_index]
+                digest = _block_digest(block)
+                if digest in seen_here:
+                    # Repeated within the same document
+                    continue
+                seen_here.add(digest)
+                origin = sent.setdefault(digest, doc_index)
+                if origin == doc_index:
+                    parts.append(block)
+                else:
+                    parts.append(f'[Cláusula idéntica a la de {names[origin]}: "{_clause_title(block)}"]')
+                    references += 1
+            filtered.append("\n\n".join(parts))
+
+        chars_before = sum(len(t) for t in texts)
+        chars_after = sum(len(t) for t in filtered)
+        self.logger.log_struct({
+            "evento": "text_prefilter",
+            "documents": len(texts),
+            "blocks_total": sum(len(blocks) for blocks in doc_blocks),
+            "blocks_kept": sum(len(keep) for keep in selected),
+            "blocks_referenced": references,
+            "chars_before": chars_before,
+            "chars_after": chars_after,
+            "est_tokens_before": chars_before // _CHARS_PER_TOKEN,
+            "est_tokens_after": chars_after // _CHARS_PER_TOKEN,
+            "est_tokens_saved": (chars_before - chars_after) // _CHARS_PER_TOKEN
+        })
+        return filtered
@@ -0,0 +1,201 @@
+"""
+Workflow Job Service
+
+Runs the Reaseguros workflow as background jobs on a local worker pool and
+persists their state in the WorkflowJob model.
+"""
+import shutil
+import tempfile
+import threading
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Optional
+
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+from documents.application.service.workflow_registry import get_workflow
+from documents.domain.logger import get_logger
+from documents.domain.constants.env_constants import LOGGING_TYPE, WORKFLOW_JOB_WORKERS, WORKFLOW_JOB_STALE_SECONDS
+from documents.models import WorkflowJob
+
+# Job states that may still receive an outcome
+_ACTIVE_STATUSES = [WorkflowJob.Status.PENDING, WorkflowJob.Status.RUNNING]
+
+# Worker pool shared by every job submitted to this process
+_JOB_POOL: Optional[ThreadPoolExecutor] = None
+_JOB_POOL_LOCK = threading.Lock()
+
+
+def _get_job_pool() -> ThreadPoolExecutor:
+    """Get or lazily create the background job pool."""
+    global _JOB_POOL
+    with _JOB_POOL_LOCK:
+        if _JOB_POOL is None:
+            _JOB_POOL = ThreadPoolExecutor(max_workers=WORKFLOW_JOB_WORKERS, thread_name_prefix="workflow-job")
+        return _JOB_POOL
+
+
+def _save_upload(uploaded_file, directory: Path, index: int) -> str:
+    """
+    Write an uploaded file under ``directory`` and return its path.
+
+    Each upload gets its own numbered subdirectory, so two files with the same
+    name do not overwrite each other and the workflow still sees the original names.
+    """
+    upload_dir = directory / f"{index:03d}"
+    upload_dir.mkdir()
+    # Django already reduces upload names to their base name
+    path = upload_dir / Path(uploaded_file.name).name
+    with open(path, 'wb+') as f:
+        for chunk in uploaded_file.chunks():
+            f.write(chunk)
+    return str(path)
+
+
+def fail_stale_jobs() -> int:
+    """
+    Mark as FAILED the PENDING/RUNNING jobs not updated for WORKFLOW_JOB_STALE_SECONDS.
+
+    Jobs run on in-process threads, so a worker restart loses them without
+    recording an outcome. Swept when a job is submitted and by the
+    ``fail_stale_jobs`` management command (run it on a schedule).
+
+    Returns:
+        Number of jobs marked FAILED
+    """
+    now = timezone.now()
+    return WorkflowJob.objects.filter(
+        status__in=_ACTIVE_STATUSES,
+        updated_at__lt=now - timedelta(seconds=WORKFLOW_JOB_STALE_SECONDS)
+    ).update(
+        status=WorkflowJob.Status.FAILED,
+        error="Job interrupted: the worker running it stopped before it finished.",
+        finished_at=now,
+        updated_at=now
+    )
+
+
+class WorkflowJobService:
+    """Service for submitting and running asynchronous workflow jobs."""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        """
+        Initialize the job service.
+
+        Args:
+            trace_id: Optional trace ID for logging
+        """
+        self.logger = get_logger(WorkflowJobService.__name__, LOGGING_TYPE)
+        if trace_id:
+            self.logger.set_trace(trace_id)
+        self.trace_id = trace_id
+
+    def submit(
+        self,
+        poliza_file,
+        contratos_files: List,
+        use_llm_cache: bool = True,
+        report_mode: Optional[str] = None
+    ) -> WorkflowJob:
+        """
+        Persist the uploads, create a PENDING job and queue it on the worker pool.
+
+        The job row is only created once every upload is saved; if saving or
+        queueing fails, the row and the temporary directory are removed.
+
+        Args:
+            poliza_file: Uploaded poliza PDF
+            contratos_files: Uploaded contrato PDFs
+            use_llm_cache: Whether the job may reuse cached LLM responses
+            report_mode: Report mode override ("llm", "template" or "fast")
+
+        Returns:
+            The created WorkflowJob
+        """
+        stale = fail_stale_jobs()
+        if stale:
+            self.logger.log_text(f"[JOBS] Marked {stale} interrupted jobs as FAILED", severity="WARNING")
+
+        job_dir = Path(tempfile.mkdtemp(prefix="job_"))
+        job = None
+        try:
+            poliza_path = _save_upload(poliza_file, job_dir, 0)
+            contratos_paths = [_save_upload(cf, job_dir, i) for i, cf in enumerate(contratos_files, start=1)]
+
+            job = WorkflowJob.objects.create()
+            _get_job_pool().submit(
+                self._run, job.job_id, job_dir, poliza_path, contratos_paths, use_llm_cache, report_mode
+            )
+        except Exception:
+            if job is not None:
+                job.delete()
+            shutil.rmtree(job_dir, ignore_errors=True)
+            raise
+        self.logger.log_text(f"[JOBS] Job {job.job_id} queued with {len(contratos_paths)} contratos")
+        return job
+
+    def _run(
+        self,
+        job_id,
+        job_dir: Path,
+        poliza_path: str,
+        contratos_paths: List[str],
+        use_llm_cache: bool,
+        report_mode: Optional[str]
+    ) -> None:
+        """
+        Execute a job on a pool thread and record its outcome.
+
+        Every update only applies while the job is still PENDING/RUNNING, so a
+        job the stale sweep already marked FAILED is neither run nor overwritten.
+        """
+        close_old_connections()
+        try:
+            # update() bypasses auto_now: set updated_at so the stale sweep sees the job start
+            started = WorkflowJob.objects.filter(job_id=job_id, status=WorkflowJob.Status.PENDING).update(
+                status=WorkflowJob.Status.RUNNING,
+                updated_at=timezone.now()
+            )
+            if not started:
+                self.logger.log_text(f"[JOBS] Job {job_id} is no longer pending; skipped", severity="WARNING")
+                return
+
+            result = get_workflow().run(
+                poliza=poliza_path,
+                contratos=contratos_paths,
+                output_pdf_path=None,
+                use_llm_cache=use_llm_cache,
+                report_mode=report_mode
+            )
+
+            if result.get("pdf_bytes"):
+                if self._finish(job_id, status=WorkflowJob.Status.SUCCEEDED, pdf_content=result["pdf_bytes"]):
+                    self.logger.log_text(f"[JOBS] Job {job_id} succeeded")
+            else:
+                error_msg = "PDF was not generated."
+                if "comparison_data" in result and "error" in result["comparison_data"]:
+                    error_msg = str(result["comparison_data"]["error"])
+                self._finish(job_id, status=WorkflowJob.Status.FAILED, error=error_msg)
+                self.logger.log_text(f"[JOBS] Job {job_id} failed: {error_msg}", severity="ERROR")
+        except Exception as e:
+            self.logger.log_text(f"[JOBS] Job {job_id} crashed: {e}", severity="ERROR")
+            self._finish(job_id, status=WorkflowJob.Status.FAILED, error=str(e))
+        finally:
+            shutil.rmtree(job_dir, ignore_errors=True)
+            # Pool threads keep their own DB connection; release it after each job
+            connection.close()
+
+    def _finish(self, job_id, **fields) -> bool:
+        """Record a job outcome unless the job was already finished (e.g. marked FAILED as stale)."""
+        now = timezone.now()
+        updated = WorkflowJob.objects.filter(job_id=job_id, status__in=_ACTIVE_STATUSES).update(
+            finished_at=now, updated_at=now, **fields
+        )
+        if not updated:
+            self.logger.log_text(
+                f"[JOBS] Job {job_id} was already finished; {fields['status']} outcome discarded",
+                severity="WARNING"
+            )
+        return bool(updated)
@@ -1,24 +1,61 @@
 import os
 import json
+import time
+import asyncio
+import hashlib
 import logging
-from typing import TypedDict, List, Dict, Any, Optional
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypedDict, List, Dict, Any, Optional, Tuple, AsyncIterator, Union, Callable
 
 from langgraph.graph import StateGraph, END
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.output_parsers import JsonOutputParser
-from pypdf import PdfReader
+from langchain_core.runnables import RunnableConfig
 
 from documents.application.service.html_to_pdf_service import HtmlToPdfService
+from documents.application.service.pdf_text_service import PdfTextService
+from documents.application.service.prompt_store import get_prompt_store
+from documents.application.service.text_prefilter_service import TextPrefilterService
+from documents.application.service.report_renderer_service import ReportRendererService
+from documents.application.service.prompt_sections import (
+    split_prompt_sections,
+    build_section_prompt,
+    build_repair_instructions,
+    extract_items,
+    merge_section_results,
+)
+from documents.application.service.contract_comparison import contract_items, assemble_comparison
+from documents.application.service.llm_rate_limiter import get_llm_rate_limiter
+from documents.application.service.structured_comparison import ComparisonStreamParser
+from documents.application.service.workflow_metrics import get_workflow_metrics, instrument_node
+from documents.domain.entities.comparison_result import ComparisonResult
+from documents.domain.entities.document_source import DocumentSource
+from documents.domain.entities.prompt_template import PromptSection
+from documents.domain.repository.sqlite_cache import SqliteCache
+from documents.domain.constants.env_constants import (
+    CACHE_DB_PATH,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_MAX_BYTES,
+    DECONSTRUCT_MODE,
+    DECONSTRUCT_OUTPUT,
+    CONTRACT_COMPARISON_MAX_ENTRIES,
+    CONTRACT_COMPARISON_MAX_BYTES,
+    PREFILTER_ENABLED,
+    REPORT_MODE,
+)
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
 # Define State
 class AgentState(TypedDict):
-    poliza_path: str
-    contratos_paths: List[str]
+    poliza: DocumentSource
+    contratos: List[DocumentSource]
+    use_llm_cache: bool
+    report_mode: str
     
     # Intermediate data
     comparison_data: Dict[str, Any]
@@ -32,53 +69,186 @@ class ReasegurosWorkflow:
     def __init__(self):
         # Initialize Gemini
         # Ensure GOOGLE_API_KEY is in env
+        self.model_name = "gemini-2.5-flash"
         self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash", 
+            model=self.model_name, 
             temperature=0
         )
+        # Same model constrained to the comparison schema. Bound directly rather than through
+        # with_structured_output so the JSON can be streamed and validated item by item
+        self.structured_llm = self.llm.bind(
+            response_mime_type="application/json",
+            response_json_schema=ComparisonResult.model_json_schema()
+        )
         self.pdf_service = HtmlToPdfService()
+        self.text_service = PdfTextService()
+        self.report_renderer = ReportRendererService()
+        self.prefilter = TextPrefilterService() if PREFILTER_ENABLED else None
+        self.llm_cache = None
+        if LLM_CACHE_ENABLED:
+            self.llm_cache = SqliteCache(
+                CACHE_DB_PATH,
+                namespace="llm_response",
+                max_entries=LLM_CACHE_MAX_ENTRIES,
+                max_bytes=LLM_CACHE_MAX_BYTES,
+                ttl_seconds=LLM_CACHE_TTL_SECONDS
+            )
+        self.contract_store = None
+        if DECONSTRUCT_MODE == "contracts":
+            self.contract_store = SqliteCache(
+                CACHE_DB_PATH,
+                namespace="contract_comparison",
+                max_entries=CONTRACT_COMPARISON_MAX_ENTRIES,
+                max_bytes=CONTRACT_COMPARISON_MAX_BYTES
+            )
         self._build_graph()
 
     def _extract_text_from_pdf(self, pdf_path: str) -> str:
         """Helper to extract text from PDF."""
-        try:
-            reader = PdfReader(pdf_path)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
-        except Exception as e:
-            logger.error(f"Error reading PDF {pdf_path}: {e}")
-            return f"Error reading PDF: {e}"
+        return self.text_service.extract_text(pdf_path)
 
     def _read_prompt(self, filename: str) -> str:
-        """Read prompt file."""
-        # Assuming prompts are in d:\github\reaseguros_api\prompts
-        # Adjust path if running from root or elsewhere
-        # We'll try to find the absolute path relative to the project root
-        project_root = Path(__file__).resolve().parent.parent.parent.parent.parent
-        prompt_path = project_root / "prompts" / filename
-        
-        if not prompt_path.exists():
-             # Fallback: try hardcoded path from context
-            prompt_path = Path("d:/github/reaseguros_api/prompts") / filename
-            
-        return prompt_path.read_text(encoding="utf-8")
+        """Read prompt template from the in-memory prompt store."""
+        return get_prompt_store().get(filename).content
 
-    def node_destructurer(self, state: AgentState) -> Dict:
-        """Agent 1: Deconstruct and Compare."""
-        logger.info("--- Node: Deconstruct & Compare ---")
-        print("--- Node: Deconstruct & Compare ---")
+    def _llm_cache_key(self, prompt_name: str, input_text: str, structured: bool = False) -> str:
+        """Cache key from (model name, prompt hash, input hash), tagged for schema-constrained responses."""
+        prompt_hash = get_prompt_store().get(prompt_name).content_hash
+        input_hash = hashlib.sha256(input_text.encode("utf-8")).hexdigest()
+        key = f"{self.model_name}:{prompt_hash}:{input_hash}"
+        return f"{key}:structured" if structured else key
+
+    def _stream_structured(self, input_text: str, on_chunk: Optional[Callable[[str], None]]) -> Any:
+        """Stream a schema-constrained response, passing each text chunk on as it arrives."""
+        response = None
+        for chunk in self.structured_llm.stream(input_text):
+            if on_chunk is not None:
+                on_chunk(chunk.content)
+            response = chunk if response is None else response + chunk
+        return response
+
+    async def _astream_structured(
+        self,
+        input_text: str,
+        on_chunk: Optional[Callable[[str], None]],
+        config: Optional[RunnableConfig] = None
+    ) -> Any:
+        """Async variant of _stream_structured."""
+        response = None
+        async for chunk in self.structured_llm.astream(input_text, config=config):
+            if on_chunk is not None:
+                on_chunk(chunk.content)
+            response = chunk if response is None else response + chunk
+        return response
+
+    def _invoke_llm(
+        self,
+        prompt_name: str,
+        input_text: str,
+        use_cache: bool = True,
+        structured: bool = False,
+        on_chunk: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Invoke the LLM, reusing a cached response for identical deterministic inputs.
+
+        With ``structured`` the response is constrained to the comparison schema and
+        streamed, each chunk going to ``on_chunk`` (a cached response is passed whole).
+        Calls that reach the LLM first take a slot from the process-wide rate limiter.
+        """
+        cache = self.llm_cache if use_cache else None
+        cache_key = self._llm_cache_key(prompt_name, input_text, structured) if cache is not None else None
+
+        start = time.perf_counter()
+        if cache is not None:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"LLM cache hit for {prompt_name}")
+                get_workflow_metrics().record_llm_call(
+                    prompt_name, time.perf_counter() - start, len(input_text), len(cached), cache_hit=True
+                )
+                if on_chunk is not None:
+                    on_chunk(cached)
+                return cached
+
+        get_llm_rate_limiter().acquire(prompt_name)
+        start = time.perf_counter()
+        if structured:
+            response = self._stream_structured(input_text, on_chunk)
+        else:
+            response = self.llm.invoke(input_text)
+        content = response.content
+        get_workflow_metrics().record_llm_call(
+            prompt_name, time.perf_counter() - start, len(input_text), len(content),
+            usage=getattr(response, "usage_metadata", None)
+        )
+
+        if cache is not None:
+            cache.set(cache_key, content)
+        return content
+
+    async def _ainvoke_llm(
+        self,
+        prompt_name: str,
+        input_text: str,
+        use_cache: bool = True,
+        structured: bool = False,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        config: Optional[RunnableConfig] = None
+    ) -> str:
+        """
+        Async variant of _invoke_llm: awaits the LLM and keeps cache I/O off the event loop.
+
+        ``config`` is the calling node's run config. Passing it on is what lets
+        ``astream(stream_mode="messages")`` see the LLM tokens: before Python 3.11
+        asyncio tasks do not carry it over implicitly.
+        """
+        cache = self.llm_cache if use_cache else None
+        cache_key = None
+        start = time.perf_counter()
+        if cache is not None:
+            # The prompt store may touch the DB, which is sync-only
+            cache_key = await asyncio.to_thread(self._llm_cache_key, prompt_name, input_text, structured)
+            cached = await asyncio.to_thread(cache.get, cache_key)
+            if cached is not None:
+                logger.info(f"LLM cache hit for {prompt_name}")
+                get_workflow_metrics().record_llm_call(
+                    prompt_name, time.perf_counter() - start, len(input_text), len(cached), cache_hit=True
+                )
+                if on_chunk is not None:
+                    on_chunk(cached)
+                return cached
+
+        await get_llm_rate_limiter().aacquire(prompt_name)
+        start = time.perf_counter()
+        if structured:
+            response = await self._astream_structured(input_text, on_chunk, config)
+        else:
+            response = await self.llm.ainvoke(input_text, config=config)
+        content = response.content
+        get_workflow_metrics().record_llm_call(
+            prompt_name, time.perf_counter() - start, len(input_text), len(content),
+            usage=getattr(response, "usage_metadata", None)
+        )
+
+        if cache is not None:
+            await asyncio.to_thread(cache.set, cache_key, content)
+        return content
+
+    def _prepare_documents_text(self, state: AgentState, texts: List[str]) -> Tuple[str, str, Optional[str]]:
+        """Assemble poliza and contratos text. Returns (poliza_text, contratos_combined, error)."""
+        if self.prefilter is not None and texts[0].strip():
+            names = [state["poliza"].name] + [c.name for c in state["contratos"]]
+            texts = self._prefilter_texts(names, texts)
         
-        poliza_text = self._extract_text_from_pdf(state["poliza_path"])
+        poliza_text = texts[0]
         print(f"DEBUG: Policy Text Length: {len(poliza_text)}")
         if len(poliza_text) < 100:
             print(f"DEBUG: Policy text content (first 100): {poliza_text}")
         
         contratos_text = []
-        for path in state["contratos_paths"]:
-            name = Path(path).name
-            content = self._extract_text_from_pdf(path)
+        for contrato, content in zip(state["contratos"], texts[1:]):
+            name = contrato.name
             print(f"DEBUG: Contract {name} Text Length: {len(content)}")
             contratos_text.append(f"--- Contract: {name} ---\n{content}")
         
@@ -86,14 +256,20 @@ class ReasegurosWorkflow:
         
         if len(poliza_text.strip()) == 0:
             logger.error("Policy PDF text is empty (scanned?).")
-            return {"comparison_data": {"error": "Policy PDF text is empty (scanned image?)."}}
+            return poliza_text, contratos_combined, "Policy PDF text is empty (scanned image?)."
 
-        
-        prompt_template = self._read_prompt("agent3.md")
-        
-        # Prepare input for LLM
+        return poliza_text, contratos_combined, None
+
+    def _prefilter_texts(self, names: List[str], texts: List[str]) -> List[str]:
+        """Keep only the passages relevant to the comparison items."""
+        _, sections, _ = split_prompt_sections(self._read_prompt("agent3.md"))
+        queries = [f"{section.title} {item}" for section in sections for item in section.items]
+        return self.prefilter.filter_documents(names, texts, queries)
+
+    def _compose_destructurer_input(self, prompt_template: str, poliza_text: str, contratos_combined: str) -> str:
+        """Build the deconstruct LLM input from a prompt and the documents text."""
         # Truncate if necessary (Flash handles ~1M tokens, should be fine)
-        input_text = f"""
+        return f"""
         {prompt_template}
         
         =============
@@ -104,66 +280,441 @@ class ReasegurosWorkflow:
         CONTRATOS DE REASEGURO:
         {contratos_combined}
         """
-        
+
+    def _section_inputs(self, poliza_text: str, contratos_combined: str) -> List[Tuple[PromptSection, str]]:
+        """One deconstruct input per section of agent3.md."""
+        preamble, sections, trailer = split_prompt_sections(self._read_prompt("agent3.md"))
+        return [
+            (section, self._compose_destructurer_input(
+                build_section_prompt(preamble, section, trailer), poliza_text, contratos_combined
+            ))
+            for section in sections
+        ]
+
+    def _compare_section(self, input_text: str, use_cache: bool, numbers: List[int]) -> Any:
+        """Run one section comparison; failures stay local to the section."""
         try:
-            response = self.llm.invoke(input_text)
-            content = response.content
+            return self._run_comparison(input_text, use_cache, numbers)
+        except Exception as e:
+            logger.error(f"Error in section comparison: {e}")
+            return {"error": str(e)}
+
+    async def _acompare_section(self, input_text: str, use_cache: bool, numbers: List[int]) -> Any:
+        """Async variant of _compare_section."""
+        try:
+            return await self._arun_comparison(input_text, use_cache, numbers)
+        except Exception as e:
+            logger.error(f"Error in section comparison: {e}")
+            return {"error": str(e)}
+
+    def _compare_by_sections(self, poliza_text: str, contratos_combined: str, use_cache: bool) -> Dict[str, Any]:
+        """Compare every section concurrently and merge the items."""
+        section_inputs = self._section_inputs(poliza_text, contratos_combined)
+        if not section_inputs:
+            raise ValueError("agent3.md has no sections to split on")
+        with ThreadPoolExecutor(max_workers=len(section_inputs)) as pool:
+            outputs = list(pool.map(
+                lambda item: self._compare_section(item[1], use_cache, self._section_numbers(item[0])),
+                section_inputs
+            ))
+        return merge_section_results([(section, out) for (section, _), out in zip(section_inputs, outputs)])
+
+    async def _acompare_by_sections(self, poliza_text: str, contratos_combined: str, use_cache: bool) -> Dict[str, Any]:
+        """Async variant of _compare_by_sections."""
+        section_inputs = await asyncio.to_thread(self._section_inputs, poliza_text, contratos_combined)
+        if not section_inputs:
+            raise ValueError("agent3.md has no sections to split on")
+        outputs = await asyncio.gather(*(
+            self._acompare_section(text, use_cache, self._section_numbers(section)) for section, text in section_inputs
+        ))
+        return merge_section_results([(section, out) for (section, _), out in zip(section_inputs, outputs)])
+
+    def _contract_store_keys(self, texts: List[str]) -> List[str]:
+        """Stored comparison key per contrato: (model, prompt hash, poliza hash, contrato hash)."""
+        prompt_hash = get_prompt_store().get("agent3.md").content_hash
+        poliza_hash = hashlib.sha256(texts[0].encode("utf-8")).hexdigest()
+        prefilter = "prefilter" if self.prefilter is not None else "full"
+        return [
+            f"{self.model_name}:{prompt_hash}:{prefilter}:{poliza_hash}:"
+            f"{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+            for text in texts[1:]
+        ]
+
+    def _contract_input(self, poliza: DocumentSource, contrato: DocumentSource, poliza_text: str, contrato_text: str) -> str:
+        """Deconstruct input comparing the poliza against a single contrato."""
+        if self.prefilter is not None:
+            # Prefilter per pair so the input does not depend on the other contratos
+            poliza_text, contrato_text = self._prefilter_texts([poliza.name, contrato.name], [poliza_text, contrato_text])
+        return self._compose_destructurer_input(
+            self._read_prompt("agent3.md"),
+            poliza_text,
+            f"--- Contract: {contrato.name} ---\n{contrato_text}"
+        )
+
+    def _compare_contract(self, input_text: str, use_cache: bool) -> Any:
+        """Run one (poliza, contrato) comparison; failures stay local to the contrato."""
+        try:
+            return contract_items(self._run_comparison(input_text, use_cache)) or {"error": "No items returned"}
+        except Exception as e:
+            logger.error(f"Error in contract comparison: {e}")
+            return {"error": str(e)}
+
+    async def _acompare_contract(self, input_text: str, use_cache: bool) -> Any:
+        """Async variant of _compare_contract."""
+        try:
+            return contract_items(await self._arun_comparison(input_text, use_cache)) or {"error": "No items returned"}
+        except Exception as e:
+            logger.error(f"Error in contract comparison: {e}")
+            return {"error": str(e)}
+
+    def _load_contract_results(self, keys: List[str], use_cache: bool) -> Dict[int, Any]:
+        """Stored pair comparisons by contrato index (none when the cache is bypassed)."""
+        if not use_cache:
+            return {}
+        stored = {}
+        for index, key in enumerate(keys):
+            cached = self.contract_store.get(key)
+            if cached is not None:
+                stored[index] = json.loads(cached)
+        return stored
+
+    def _store_contract_results(self, keys: List[str], results: Dict[int, Any]) -> None:
+        """Persist the pair comparisons that produced items."""
+        for index, items in results.items():
+            if isinstance(items, list):
+                self.contract_store.set(keys[index], json.dumps(items, ensure_ascii=False))
+
+    def _compare_by_contracts(self, state: AgentState, texts: List[str], use_cache: bool) -> Dict[str, Any]:
+        """Compare only the contratos without a stored result and re-assemble the comparison."""
+        keys = self._contract_store_keys(texts)
+        results = self._load_contract_results(keys, use_cache)
+        missing = [i for i in range(len(keys)) if i not in results]
+        logger.info(f"Contract comparisons: {len(results)} reused, {len(missing)} to run")
+
+        if missing:
+            inputs = [
+                self._contract_input(state["poliza"], state["contratos"][i], texts[0], texts[i + 1])
+                for i in missing
+            ]
+            with ThreadPoolExecutor(max_workers=len(missing)) as pool:
+                outputs = list(pool.map(lambda text: self._compare_contract(text, use_cache), inputs))
+            fresh = dict(zip(missing, outputs))
+            self._store_contract_results(keys, fresh)
+            results.update(fresh)
+
+        return assemble_comparison([(c.name, results[i]) for i, c in enumerate(state["contratos"])])
+
+    async def _acompare_by_contracts(self, state: AgentState, texts: List[str], use_cache: bool) -> Dict[str, Any]:
+        """Async variant of _compare_by_contracts."""
+        keys = await asyncio.to_thread(self._contract_store_keys, texts)
+        results = await asyncio.to_thread(self._load_contract_results, keys, use_cache)
+        missing = [i for i in range(len(keys)) if i not in results]
+        logger.info(f"Contract comparisons: {len(results)} reused, {len(missing)} to run")
+
+        if missing:
+            inputs = await asyncio.to_thread(lambda: [
+                self._contract_input(state["poliza"], state["contratos"][i], texts[0], texts[i + 1])
+                for i in missing
+            ])
+            outputs = await asyncio.gather(*(self._acompare_contract(text, use_cache) for text in inputs))
+            fresh = dict(zip(missing, outputs))
+            await asyncio.to_thread(self._store_contract_results, keys, fresh)
+            results.update(fresh)
+
+        return assemble_comparison([(c.name, results[i]) for i, c in enumerate(state["contratos"])])
+
+    def _parse_comparison(self, content: str, input_text: str, use_cache: bool) -> Dict[str, Any]:
+        """Parse the deconstruct response into the comparison JSON."""
+        # Remove markdown code blocks if present
+        if "```json" in content:
+            content = content.split("```json")[1].split("```")[0]
+        elif "```" in content:
+            content = content.split("```")[1].split("```")[0]
             
-            # Parse JSON
-            # Remove markdown code blocks if present
-            if "```json" in content:
-                content = content.split("```json")[1].split("```")[0]
-            elif "```" in content:
-                content = content.split("```")[1].split("```")[0]
-                
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            logger.warning("Failed to parse JSON, returning raw content wrapped")
+            # Do not replay an unparseable response on retry
+            if use_cache and self.llm_cache is not None:
+                self.llm_cache.delete(self._llm_cache_key("agent3.md", input_text))
+            return {"raw_output": content}
+
+    def _section_numbers(self, section: PromptSection) -> List[int]:
+        return list(range(section.first_number, section.last_number + 1))
+
+    def _pending_numbers(self, items: Dict[int, Any], numbers: Optional[List[int]]) -> List[int]:
+        """Expected item numbers (default: every item of agent3.md) without a valid item."""
+        if numbers is None:
+            _, sections, _ = split_prompt_sections(self._read_prompt("agent3.md"))
+            numbers = [n for section in sections for n in self._section_numbers(section)]
+        return [n for n in numbers if n not in items]
+
+    def _repair_input(self, input_text: str, pending: List[int], errors: Dict[int, str]) -> str:
+        """Original input plus the request to redo only the pending items (the shared prefix stays cacheable)."""
+        _, sections, _ = split_prompt_sections(self._read_prompt("agent3.md"))
+        return input_text + build_repair_instructions(sections, pending, errors)
+
+    def _merge_repair(
+        self,
+        items: Dict[int, Any],
+        pending: List[int],
+        repaired: Dict[int, Any],
+        errors: Dict[int, str],
+        repair_input: str,
+        use_cache: bool
+    ) -> Dict[str, Any]:
+        """Fill the pending items from the repair response and build the comparison."""
+        for number in pending:
+            if number in repaired:
+                items[number] = repaired[number]
+        unresolved = [n for n in pending if n not in items]
+        logger.info(f"Structured comparison: {len(pending)} items retried, {len(unresolved)} still invalid")
+        if unresolved and use_cache and self.llm_cache is not None:
+            # Do not replay a repair that left items invalid
+            self.llm_cache.delete(self._llm_cache_key("agent3.md", repair_input, structured=True))
+        return self._structured_comparison(items, unresolved, errors)
+
+    def _structured_comparison(self, items: Dict[int, Any], unresolved: List[int], errors: Dict[int, str]) -> Dict[str, Any]:
+        """Comparison JSON in the agent3.md row format from the validated items."""
+        if not items:
+            raise ValueError("Structured response returned no valid items")
+        data: Dict[str, Any] = {"items": [items[n].to_row() for n in sorted(items)]}
+        if unresolved:
+            data["item_errors"] = [{"N": n, "error": errors.get(n, "Item not returned")} for n in unresolved]
+        return data
+
+    def _run_comparison(self, input_text: str, use_cache: bool, numbers: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Run one deconstruct request and parse the comparison.
+
+        In structured output mode the schema-constrained response is validated item
+        by item while it streams; malformed or missing items among ``numbers`` are
+        requested again in a single targeted retry instead of rerunning everything.
+        """
+        if DECONSTRUCT_OUTPUT != "structured":
+            content = self._invoke_llm("agent3.md", input_text, use_cache)
+            return self._parse_comparison(content, input_text, use_cache)
+
+        parser = ComparisonStreamParser()
+        self._invoke_llm("agent3.md", input_text, use_cache, structured=True, on_chunk=parser.feed)
+        items, errors = parser.close()
+        pending = self._pending_numbers(items, numbers)
+        if not pending:
+            return self._structured_comparison(items, [], errors)
+
+        repair_input = self._repair_input(input_text, pending, errors)
+        repair = ComparisonStreamParser()
+        self._invoke_llm("agent3.md", repair_input, use_cache, structured=True, on_chunk=repair.feed)
+        repaired, repair_errors = repair.close()
+        return self._merge_repair(items, pending, repaired, {**errors, **repair_errors}, repair_input, use_cache)
+
+    async def _arun_comparison(self, input_text: str, use_cache: bool, numbers: Optional[List[int]] = None) -> Dict[str, Any]:
+        """Async variant of _run_comparison."""
+        if DECONSTRUCT_OUTPUT != "structured":
+            content = await self._ainvoke_llm("agent3.md", input_text, use_cache)
+            return await asyncio.to_thread(self._parse_comparison, content, input_text, use_cache)
+
+        parser = ComparisonStreamParser()
+        await self._ainvoke_llm("agent3.md", input_text, use_cache, structured=True, on_chunk=parser.feed)
+        items, errors = parser.close()
+        pending = await asyncio.to_thread(self._pending_numbers, items, numbers)
+        if not pending:
+            return self._structured_comparison(items, [], errors)
+
+        repair_input = await asyncio.to_thread(self._repair_input, input_text, pending, errors)
+        repair = ComparisonStreamParser()
+        await self._ainvoke_llm("agent3.md", repair_input, use_cache, structured=True, on_chunk=repair.feed)
+        repaired, repair_errors = repair.close()
+        return await asyncio.to_thread(
+            self._merge_repair, items, pending, repaired, {**errors, **repair_errors}, repair_input, use_cache
+        )
+
+    def _handle_destructurer_error(self, e: Exception) -> Dict:
+        logger.error(f"Error in Destructurer Node: {e}")
+        print(f"CRITICAL ERROR in Destructurer Node: {e}")
+        with open("error.log", "w") as f:
+            f.write(f"Error: {e}\n\n")
+            import traceback
+            traceback.print_exc(file=f)
+        return {"comparison_data": {"error": str(e)}}
+
+    def node_destructurer(self, state: AgentState) -> Dict:
+        """Agent 1: Deconstruct and Compare."""
+        logger.info("--- Node: Deconstruct & Compare ---")
+        print("--- Node: Deconstruct & Compare ---")
+        
+        # Extract poliza and contratos together so they can be parsed in parallel
+        texts = self.text_service.extract_many([state["poliza"]] + state["contratos"])
+        use_cache = state.get("use_llm_cache", True)
+        if DECONSTRUCT_MODE == "contracts" and texts[0].strip():
             try:
-                data = json.loads(content)
-            except json.JSONDecodeError:
-                logger.warning("Failed to parse JSON, returning raw content wrapped")
-                data = {"raw_output": content}
-                
-            return {"comparison_data": data}
+                return {"comparison_data": self._compare_by_contracts(state, texts, use_cache)}
+            except Exception as e:
+                return self._handle_destructurer_error(e)
+
+        poliza_text, contratos_combined, error = self._prepare_documents_text(state, texts)
+        if error:
+            return {"comparison_data": {"error": error}}
+        
+        try:
+            if DECONSTRUCT_MODE == "sections":
+                return {"comparison_data": self._compare_by_sections(poliza_text, contratos_combined, use_cache)}
+            
+            input_text = self._compose_destructurer_input(self._read_prompt("agent3.md"), poliza_text, contratos_combined)
+            return {"comparison_data": self._run_comparison(input_text, use_cache)}
         except Exception as e:
-            logger.error(f"Error in Destructurer Node: {e}")
-            print(f"CRITICAL ERROR in Destructurer Node: {e}")
-            with open("error.log", "w") as f:
-                f.write(f"Error: {e}\n\n")
-                import traceback
-                traceback.print_exc(file=f)
-            return {"comparison_data": {"error": str(e)}}
+            return self._handle_destructurer_error(e)
 
-    def node_report_generator(self, state: AgentState) -> Dict:
-        """Agent 2: Generate HTML Report."""
-        logger.info("--- Node: Legal Report ---")
-        print("--- Node: Legal Report ---")
+    async def anode_destructurer(self, state: AgentState) -> Dict:
+        """Agent 1 (async): Deconstruct and Compare."""
+        logger.info("--- Node: Deconstruct & Compare (async) ---")
+        
+        # PDF parsing is CPU-bound: keep it off the event loop
+        texts = await asyncio.to_thread(
+            self.text_service.extract_many,
+            [state["poliza"]] + state["contratos"]
+        )
+        use_cache = state.get("use_llm_cache", True)
+        if DECONSTRUCT_MODE == "contracts" and texts[0].strip():
+            try:
+                return {"comparison_data": await self._acompare_by_contracts(state, texts, use_cache)}
+            except Exception as e:
+                return self._handle_destructurer_error(e)
+
+        poliza_text, contratos_combined, error = await asyncio.to_thread(self._prepare_documents_text, state, texts)
+        if error:
+            return {"comparison_data": {"error": error}}
         
+        try:
+            if DECONSTRUCT_MODE == "sections":
+                data = await self._acompare_by_sections(poliza_text, contratos_combined, use_cache)
+                return {"comparison_data": data}
+            
+            prompt_template = await asyncio.to_thread(self._read_prompt, "agent3.md")
+            input_text = self._compose_destructurer_input(prompt_template, poliza_text, contratos_combined)
+            return {"comparison_data": await self._arun_comparison(input_text, use_cache)}
+        except Exception as e:
+            return self._handle_destructurer_error(e)
+
+    def _prepare_report_input(self, state: AgentState) -> str:
+        """Build the report prompt from the comparison JSON."""
         comparison_data = state["comparison_data"]
         prompt_template = self._read_prompt("agent5.md")
         
-        input_text = f"""
+        return f"""
         {prompt_template}
         
         =============
         DATOS DE COMPARACIÓN (JSON):
         {json.dumps(comparison_data, indent=2, ensure_ascii=False)}
         """
+
+    def _extract_html(self, content: str) -> str:
+        """Extract the HTML document from the report response."""
+        html_content = content
+        if "```html" in content:
+            html_content = content.split("```html")[1].split("```")[0]
+        elif "```" in content and ("<!DOCTYPE html>" in content or "<html>" in content):
+             parts = content.split("```")
+             for p in parts:
+                 if "<html>" in p or "<!DOCTYPE html>" in p:
+                     html_content = p
+                     break
+        return html_content.strip()
+
+    def _template_report_mode(self, state: AgentState) -> Optional[str]:
+        """Report mode when the HTML is rendered from the template, None when the LLM writes it."""
+        mode = state.get("report_mode") or REPORT_MODE
+        if mode == "llm":
+            return None
+        if mode == "template" and not extract_items(state["comparison_data"]):
+            # Nothing structured to render (e.g. unparseable response): let the LLM read it
+            return None
+        return mode
+
+    def _prepare_summary_input(self, state: AgentState) -> str:
+        """Build the executive summary prompt from the comparison JSON."""
+        prompt_template = self._read_prompt("agent5_resumen.md")
+        
+        return f"""
+        {prompt_template}
+        
+        =============
+        DATOS DE COMPARACIÓN (JSON):
+        {json.dumps(state["comparison_data"], ensure_ascii=False)}
+        """
+
+    def _render_template_report(self, state: AgentState, mode: str) -> str:
+        """Render the report from comparison_data, asking the LLM only for the summary in "template" mode."""
+        summary_html = None
+        if mode == "template":
+            try:
+                input_text = self._prepare_summary_input(state)
+                content = self._invoke_llm("agent5_resumen.md", input_text, state.get("use_llm_cache", True))
+                summary_html = self._extract_html(content)
+            except Exception as e:
+                logger.error(f"Error in executive summary: {e}")
+        return self.report_renderer.render(state["comparison_data"], summary_html)
+
+    async def _arender_template_report(
+        self,
+        state: AgentState,
+        mode: str,
+        config: Optional[RunnableConfig] = None
+    ) -> str:
+        """Async variant of _render_template_report."""
+        summary_html = None
+        if mode == "template":
+            try:
+                input_text = await asyncio.to_thread(self._prepare_summary_input, state)
+                content = await self._ainvoke_llm(
+                    "agent5_resumen.md", input_text, state.get("use_llm_cache", True), config=config
+                )
+                summary_html = self._extract_html(content)
+            except Exception as e:
+                logger.error(f"Error in executive summary: {e}")
+        return await asyncio.to_thread(self.report_renderer.render, state["comparison_data"], summary_html)
+
+    def node_report_generator(self, state: AgentState) -> Dict:
+        """Agent 2: Generate HTML Report."""
+        logger.info("--- Node: Legal Report ---")
+        print("--- Node: Legal Report ---")
+        
+        mode = self._template_report_mode(state)
+        if mode is not None:
+            try:
+                return {"html_content": self._render_template_report(state, mode)}
+            except Exception as e:
+                logger.error(f"Error in Report Node: {e}")
+                return {"html_content": ""}
+        
+        input_text = self._prepare_report_input(state)
         
         try:
-            response = self.llm.invoke(input_text)
-            content = response.content
-            
-            # Extract HTML
-            html_content = content
-            if "```html" in content:
-                html_content = content.split("```html")[1].split("```")[0]
-            elif "```" in content and ("<!DOCTYPE html>" in content or "<html>" in content):
-                 parts = content.split("```")
-                 for p in parts:
-                     if "<html>" in p or "<!DOCTYPE html>" in p:
-                         html_content = p
-                         break
-            
-            return {"html_content": html_content.strip()}
+            content = self._invoke_llm("agent5.md", input_text, state.get("use_llm_cache", True))
+            return {"html_content": self._extract_html(content)}
+        except Exception as e:
+            logger.error(f"Error in Report Node: {e}")
+            return {"html_content": ""}
+
+    async def anode_report_generator(self, state: AgentState, config: Optional[RunnableConfig] = None) -> Dict:
+        """Agent 2 (async): Generate HTML Report. The run config is passed to the LLM so its tokens can be streamed."""
+        logger.info("--- Node: Legal Report (async) ---")
+        
+        mode = self._template_report_mode(state)
+        if mode is not None:
+            try:
+                return {"html_content": await self._arender_template_report(state, mode, config)}
+            except Exception as e:
+                logger.error(f"Error in Report Node: {e}")
+                return {"html_content": ""}
+        
+        input_text = await asyncio.to_thread(self._prepare_report_input, state)
+        
+        try:
+            content = await self._ainvoke_llm("agent5.md", input_text, state.get("use_llm_cache", True), config=config)
+            return {"html_content": self._extract_html(content)}
         except Exception as e:
             logger.error(f"Error in Report Node: {e}")
             return {"html_content": ""}
@@ -180,39 +731,66 @@ class ReasegurosWorkflow:
 
         try:
             pdf_bytes = self.pdf_service.compile_html_to_pdf(html, filename="report_genai")
+            if pdf_bytes:
+                get_workflow_metrics().record_pdf(len(pdf_bytes))
             return {"pdf_bytes": pdf_bytes}
         except Exception as e:
             logger.error(f"PDF Conversion failed: {e}")
             return {"pdf_bytes": None}
 
+    async def anode_pdf_converter(self, state: AgentState) -> Dict:
+        """Convert HTML to PDF (async): rendering runs in a worker thread."""
+        return await asyncio.to_thread(self.node_pdf_converter, state)
+
     def _build_graph(self):
+        self.app = self._compile_graph(
+            self.node_destructurer,
+            self.node_report_generator,
+            self.node_pdf_converter
+        )
+        self.async_app = self._compile_graph(
+            self.anode_destructurer,
+            self.anode_report_generator,
+            self.anode_pdf_converter
+        )
+
+    def _compile_graph(self, deconstruct, report, pdf):
         workflow = StateGraph(AgentState)
         
-        workflow.add_node("deconstruct", self.node_destructurer)
-        workflow.add_node("report", self.node_report_generator)
-        workflow.add_node("pdf", self.node_pdf_converter)
+        workflow.add_node("deconstruct", instrument_node("deconstruct", deconstruct))
+        workflow.add_node("report", instrument_node("report", report))
+        workflow.add_node("pdf", instrument_node("pdf", pdf))
         
         workflow.set_entry_point("deconstruct")
         workflow.add_edge("deconstruct", "report")
         workflow.add_edge("report", "pdf")
         workflow.add_edge("pdf", END)
         
-        self.app = workflow.compile()
+        return workflow.compile()
 
-    def run(self, poliza_path: str, contratos_paths: List[str], output_pdf_path: str = "report.pdf"):
-        inputs = {
-            "poliza_path": poliza_path,
-            "contratos_paths": contratos_paths,
+    def _initial_state(
+        self,
+        poliza: Union[str, DocumentSource],
+        contratos: List[Union[str, DocumentSource]],
+        output_pdf_path: Optional[str],
+        use_llm_cache: bool,
+        report_mode: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return {
+            "poliza": DocumentSource.coerce(poliza),
+            "contratos": [DocumentSource.coerce(c) for c in contratos],
+            "use_llm_cache": use_llm_cache,
+            "report_mode": report_mode or REPORT_MODE,
             "comparison_data": {},
             "html_content": "",
             "pdf_bytes": None,
             "output_path": output_pdf_path
         }
-        
-        logger.info("Starting Workflow...")
-        print("Starting Workflow...")
-        result = self.app.invoke(inputs)
-        
+
+    def _save_result(self, result: Dict[str, Any], output_pdf_path: Optional[str]) -> Dict[str, Any]:
+        if result.get("pdf_bytes") and not output_pdf_path:
+            # Caller consumes result["pdf_bytes"] directly: no disk round trip
+            return result
         if result.get("pdf_bytes"):
             # Ensure directory exists for output
             output_dir = os.path.dirname(output_pdf_path)
@@ -228,3 +806,86 @@ class ReasegurosWorkflow:
             logger.error("No PDF bytes generated.")
             print("No PDF bytes generated.")
             return result
+
+    def run(
+        self,
+        poliza: Union[str, DocumentSource],
+        contratos: List[Union[str, DocumentSource]],
+        output_pdf_path: Optional[str] = "report.pdf",
+        use_llm_cache: bool = True,
+        report_mode: Optional[str] = None
+    ):
+        inputs = self._initial_state(poliza, contratos, output_pdf_path, use_llm_cache, report_mode)
+        
+        logger.info("Starting Workflow...")
+        print("Starting Workflow...")
+        result = self.app.invoke(inputs)
+        return self._save_result(result, output_pdf_path)
+
+    async def arun(
+        self,
+        poliza: Union[str, DocumentSource],
+        contratos: List[Union[str, DocumentSource]],
+        output_pdf_path: Optional[str] = "report.pdf",
+        use_llm_cache: bool = True,
+        report_mode: Optional[str] = None
+    ):
+        """Async variant of run: LLM calls are awaited, CPU-bound steps run in executors."""
+        inputs = self._initial_state(poliza, contratos, output_pdf_path, use_llm_cache, report_mode)
+        
+        logger.info("Starting Workflow (async)...")
+        result = await self.async_app.ainvoke(inputs)
+        return await asyncio.to_thread(self._save_result, result, output_pdf_path)
+
+    async def astream_run(
+        self,
+        poliza: Union[str, DocumentSource],
+        contratos: List[Union[str, DocumentSource]],
+        use_llm_cache: bool = True,
+        report_mode: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run the async graph and yield progress events.
+
+        Events:
+            {"event": "node_start", "node", "step"}
+            {"event": "node_end", "node", "step", "elapsed_ms", "error"}
+            {"event": "token", "node", "text"}   (report / executive summary tokens)
+            {"event": "done", "state"}           (final workflow state)
+
+        Closing this generator early (e.g. the client disconnected) closes the
+        graph stream, which cancels the node still running.
+        """
+        inputs = self._initial_state(poliza, contratos, None, use_llm_cache, report_mode)
+        started = {}
+        final_state = inputs
+
+        logger.info("Starting Workflow (stream)...")
+        stream = self.async_app.astream(inputs, stream_mode=["debug", "messages", "values"])
+        try:
+            async for mode, chunk in stream:
+                if mode == "values":
+                    final_state = chunk
+                elif mode == "debug":
+                    payload = chunk.get("payload", {})
+                    node = payload.get("name")
+                    if chunk.get("type") == "task":
+                        started[node] = time.perf_counter()
+                        yield {"event": "node_start", "node": node, "step": chunk.get("step")}
+                    elif chunk.get("type") == "task_result":
+                        elapsed = time.perf_counter() - started.pop(node, time.perf_counter())
+                        yield {
+                            "event": "node_end",
+                            "node": node,
+                            "step": chunk.get("step"),
+                            "elapsed_ms": round(elapsed * 1000, 2),
+                            "error": payload.get("error")
+                        }
+                elif mode == "messages":
+                    message, metadata = chunk
+                    if metadata.get("langgraph_node") == "report" and isinstance(message.content, str) and message.content:
+                        yield {"event": "token", "node": "report", "text": message.content}
+        finally:
+            await stream.aclose()
+
+        yield {"event": "done", "state": final_state}
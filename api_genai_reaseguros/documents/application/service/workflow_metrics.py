@@ -0,0 +1,232 @@
+"""
+Workflow Metrics
+
+Per-node latency, payload size, LLM token and PDF size instrumentation for the
+Reaseguros workflow. Measurements are published through BaseLogger.log_struct
+and aggregated in-process for the Prometheus /metrics endpoint.
+"""
+import asyncio
+import functools
+import inspect
+import json
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from documents.domain.logger import get_logger
+from documents.domain.constants.env_constants import LOGGING_TYPE
+
+
+def _payload_size(value: Any) -> int:
+    """Approximate size in bytes of a node input/output value."""
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if hasattr(value, "model_dump"):
+        return _payload_size(dict(value))
+    if isinstance(value, dict):
+        return sum(_payload_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_payload_size(v) for v in value)
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 0
+
+
+class WorkflowMetrics:
+    """In-process counters and summaries for the workflow (one instance per worker)."""
+
+    def __init__(self):
+        self.logger = get_logger(WorkflowMetrics.__name__, LOGGING_TYPE)
+        self._lock = threading.Lock()
+        # (metric family, sample suffix, labels) -> value
+        self._counters: Dict[Tuple[str, str, Tuple[Tuple[str, str], ...]], float] = defaultdict(float)
+        self._help: Dict[str, Tuple[str, str]] = {}
+
+    def _inc(self, name: str, kind: str, help_text: str, value: float, **labels: str) -> None:
+        key = (name, "", tuple(sorted(labels.items())))
+        with self._lock:
+            self._help.setdefault(name, (kind, help_text))
+            self._counters[key] += value
+
+    def _observe(self, name: str, help_text: str, value: float, **labels: str) -> None:
+        """Add an observation to a summary family, exposed as ``<name>_sum`` and ``<name>_count``."""
+        label_key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._help.setdefault(name, ("summary", help_text))
+            self._counters[(name, "_sum", label_key)] += value
+            self._counters[(name, "_count", label_key)] += 1
+
+    def record_node(self, node: str, elapsed: float, input_bytes: int, output_bytes: int, error: Optional[str] = None) -> None:
+        """
+        Record one node execution.
+
+        Args:
+            node: Graph node name (deconstruct, report, pdf)
+            elapsed: Wall time in seconds
+            input_bytes: Size of the node input state
+            output_bytes: Size of the node output
+            error: Error message if the node raised
+        """
+        self._observe("workflow_node_duration_seconds", "Wall time per node execution", elapsed, node=node)
+        self._inc("workflow_node_input_bytes_total", "counter", "Node input state size", input_bytes, node=node)
+        self._inc("workflow_node_output_bytes_total", "counter", "Node output size", output_bytes, node=node)
+        if error:
+            self._inc("workflow_node_errors_total", "counter", "Node executions that raised", 1, node=node)
+
+        self.logger.log_struct({
+            "evento": "workflow_node",
+            "node": node,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "input_bytes": input_bytes,
+            "output_bytes": output_bytes,
+            "error": error
+        })
+
+    def record_llm_call(
+        self,
+        prompt: str,
+        elapsed: float,
+        input_chars: int,
+        output_chars: int,
+        usage: Optional[Dict[str, Any]] = None,
+        cache_hit: bool = False
+    ) -> None:
+        """
+        Record one LLM call (or cache hit).
+
+        Args:
+            prompt: Prompt template name (e.g. agent3.md)
+            elapsed: Wall time in seconds
+            input_chars: Prompt length in characters
+            output_chars: Response length in characters
+            usage: Token usage from the response metadata (input_tokens, output_tokens, total_tokens)
+            cache_hit: Whether the response was served from the LLM cache
+        """
+        usage = usage or {}
+        self._inc("workflow_llm_calls_total", "counter", "LLM calls per prompt", 1, prompt=prompt, cache_hit=str(cache_hit).lower())
+        self._observe("workflow_llm_duration_seconds", "LLM wall time per call", elapsed, prompt=prompt)
+        self._inc("workflow_llm_input_tokens_total", "counter", "LLM input tokens", usage.get("input_tokens", 0), prompt=prompt)
+        self._inc("workflow_llm_output_tokens_total", "counter", "LLM output tokens", usage.get("output_tokens", 0), prompt=prompt)
+
+        self.logger.log_struct({
+            "evento": "workflow_llm_call",
+            "prompt": prompt,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "input_chars": input_chars,
+            "output_chars": output_chars,
+            "input_tokens": usage.get("input_tokens"),
+            "output_tokens": usage.get("output_tokens"),
+            "total_tokens": usage.get("total_tokens"),
+            "cache_hit": cache_hit
+        })
+
+    def record_pdf(self, pdf_size: int) -> None:
+        """
+        Record the size of a generated PDF report.
+
+        Args:
+            pdf_size: PDF size in bytes
+        """
+        self._inc("workflow_pdf_bytes_total", "counter", "Generated PDF bytes", pdf_size)
+        self._inc("workflow_pdf_total", "counter", "Generated PDF reports", 1)
+
+    def render_prometheus(self, extra: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format.
+
+        Args:
+            extra: Additional gauge samples as {metric_name: {label_value: value}},
+                rendered with a ``name`` label (used for cache stats)
+
+        Returns:
+            Metrics text
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            help_texts = dict(self._help)
+
+        lines = []
+        for name in sorted(help_texts):
+            kind, help_text = help_texts[name]
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (metric, suffix, labels), value in sorted(counters.items()):
+                if metric != name:
+                    continue
+                label_str = ",".join(f'{k}="{v}"' for k, v in labels)
+                sample = f"{name}{suffix}"
+                lines.append(f"{sample}{{{label_str}}} {value}" if label_str else f"{sample} {value}")
+
+        for name, samples in (extra or {}).items():
+            lines.append(f"# TYPE {name} gauge")
+            for label_value, value in samples.items():
+                lines.append(f'{name}{{name="{label_value}"}} {value}')
+
+        return "\n".join(lines) + "\n"
+
+
+_METRICS: Optional[WorkflowMetrics] = None
+_METRICS_LOCK = threading.Lock()
+
+
+def get_workflow_metrics() -> WorkflowMetrics:
+    """
+    Get the process-wide metrics registry.
+
+    Returns:
+        WorkflowMetrics: Shared metrics instance
+    """
+    global _METRICS
+    if _METRICS is None:
+        with _METRICS_LOCK:
+            if _METRICS is None:
+                _METRICS = WorkflowMetrics()
+    return _METRICS
+
+
+def instrument_node(name: str, fn: Callable) -> Callable:
+    """
+    Wrap a graph node (sync or async) to record its wall time and payload sizes.
+
+    The wrapper keeps ``fn``'s signature, so LangGraph passes the run config
+    to nodes that take a ``config`` argument and the wrapper forwards it.
+
+    Args:
+        name: Graph node name
+        fn: Node callable taking the workflow state (and optionally ``config``)
+
+    Returns:
+        Wrapped callable with the same sync/async nature as ``fn``
+    """
+    takes_config = "config" in inspect.signature(fn).parameters
+
+    if asyncio.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(state, config=None):
+            start = time.perf_counter()
+            try:
+                output = await (fn(state, config=config) if takes_config else fn(state))
+            except Exception as e:
+                get_workflow_metrics().record_node(name, time.perf_counter() - start, _payload_size(state), 0, str(e))
+                raise
+            get_workflow_metrics().record_node(name, time.perf_counter() - start, _payload_size(state), _payload_size(output))
+            return output
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(state, config=None):
+        start = time.perf_counter()
+        try:
+            output = fn(state, config=config) if takes_config else fn(state)
+        except Exception as e:
+            get_workflow_metrics().record_node(name, time.perf_counter() - start, _payload_size(state), 0, str(e))
+            raise
+        get_workflow_metrics().record_node(name, time.perf_counter() - start, _payload_size(state), _payload_size(output))
+        return output
+    return wrapper
@@ -0,0 +1,59 @@
+"""
+Workflow Registry
+
+Keeps a single compiled ReasegurosWorkflow per worker process so the LLM client,
+services and LangGraph graph are built once and shared by every request.
+"""
+import threading
+from typing import Optional
+
+from documents.application.service.workflow_langgraph import ReasegurosWorkflow
+from documents.domain.logger import get_logger
+from documents.domain.constants.env_constants import LOGGING_TYPE
+
+_WORKFLOW: Optional[ReasegurosWorkflow] = None
+_WORKFLOW_LOCK = threading.Lock()
+
+
+def get_workflow() -> ReasegurosWorkflow:
+    """
+    Get the process-wide workflow, building and compiling it on first use.
+
+    The workflow keeps no per-request state on the instance, so concurrent
+    requests can safely invoke the same compiled graph.
+
+    Returns:
+        ReasegurosWorkflow: Shared workflow instance
+    """
+    global _WORKFLOW
+    if _WORKFLOW is None:
+        with _WORKFLOW_LOCK:
+            if _WORKFLOW is None:
+                logger = get_logger("WorkflowRegistry", LOGGING_TYPE)
+                logger.log_text("[REGISTRY] Building and compiling ReasegurosWorkflow")
+                _WORKFLOW = ReasegurosWorkflow()
+    return _WORKFLOW
+
+
+def peek_workflow() -> Optional[ReasegurosWorkflow]:
+    """
+    Get the process-wide workflow only if it has already been built.
+
+    Returns:
+        ReasegurosWorkflow or None
+    """
+    return _WORKFLOW
+
+
+def warm_workflow() -> None:
+    """
+    Build the workflow ahead of the first request.
+
+    Failures (e.g. missing credentials during management commands) are logged
+    and the workflow is built lazily on the first request instead.
+    """
+    try:
+        get_workflow()
+    except Exception as e:
+        logger = get_logger("WorkflowRegistry", LOGGING_TYPE)
+        logger.log_text(f"[REGISTRY] Workflow warm-up skipped: {e}", severity="WARNING")
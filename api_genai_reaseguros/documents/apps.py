@@ -1,6 +1,15 @@
 from django.apps import AppConfig
 
+from documents.domain.constants.env_constants import WORKFLOW_WARMUP_ENABLED
+
 
 class DocumentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'documents'
+
+    def ready(self):
+        # Build the LLM client and compile the LangGraph graph once per worker. Only enabled for the
+        # server process (see the Dockerfile CMD): management commands also run ready()
+        if WORKFLOW_WARMUP_ENABLED:
+            from documents.application.service.workflow_registry import warm_workflow
+            warm_workflow()
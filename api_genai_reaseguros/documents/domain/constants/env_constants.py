@@ -2,10 +2,165 @@
 Environment constants loaded from environment variables.
 """
 import os
+import tempfile
+from pathlib import Path
 from documents.domain.constants.domain_constants import TypeLogger
 
 # API Core URL for agent communication
 API_CORE_URL = os.getenv("API_CORE_URL", "http://localhost:8000")
 
+# HTTP transport to API Core: pooled keep-alive connections shared by the process, connect/read timeouts (seconds)
+# and retries with jittered exponential backoff on 429/5xx and connection errors (POST only on 429/503 and connect
+# errors); pool and retry counters are logged every HTTP_STATS_LOG_INTERVAL requests. The read timeout stays
+# below WORKFLOW_REQUEST_TIMEOUT so a slow call fails before the request is cancelled
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+HTTP_POOL_BLOCK = os.getenv("HTTP_POOL_BLOCK", "false").lower() == "true"
+HTTP_KEEPALIVE = os.getenv("HTTP_KEEPALIVE", "true").lower() == "true"
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "110"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+HTTP_BACKOFF_MAX = float(os.getenv("HTTP_BACKOFF_MAX", "20"))
+HTTP_STATS_LOG_INTERVAL = int(os.getenv("HTTP_STATS_LOG_INTERVAL", "100"))
+
+# Async API Core client: requests in flight per host and seconds an idle pooled connection is kept
+HTTP_HOST_CONCURRENCY = int(os.getenv("HTTP_HOST_CONCURRENCY", "8"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+
+# Seconds before expiry at which cached ID tokens for API Core are refreshed in the background
+ID_TOKEN_REFRESH_MARGIN = float(os.getenv("ID_TOKEN_REFRESH_MARGIN", "300"))
+
 # Logging type: LOCAL for development, GCP for production
 LOGGING_TYPE = os.getenv("LOGGING_TYPE", TypeLogger.LOCAL)
+
+# GCP log shipping: "async" queues entries and writes them in batches from a background thread, "sync" writes each
+# entry in the calling thread. When the queue is full, "drop" discards new entries and "block" waits up to the timeout
+LOG_TRANSPORT = os.getenv("LOG_TRANSPORT", "async").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "100"))
+LOG_FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", "2"))
+LOG_OVERFLOW_POLICY = os.getenv("LOG_OVERFLOW_POLICY", "drop").lower()
+LOG_BLOCK_TIMEOUT = float(os.getenv("LOG_BLOCK_TIMEOUT", "1"))
+
+# Logger filters applied before any formatting: minimum level (empty keeps each logger's default, DEBUG locally and
+# INFO on GCP) and per-logger sampling of entries below WARNING, e.g. "GcpApiClient=0.1,PdfTextService=0.5"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "").upper()
+LOG_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, _, rate in (pair.partition("=") for pair in os.getenv("LOG_SAMPLE_RATES", "").split(",") if "=" in pair)
+}
+
+# Size caps for logged text and structured payloads: long strings and lists are cut and a payload still larger
+# than LOG_MAX_PAYLOAD_BYTES once serialized is replaced by a preview
+LOG_MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", "2000"))
+LOG_MAX_LIST_ITEMS = int(os.getenv("LOG_MAX_LIST_ITEMS", "50"))
+LOG_MAX_PAYLOAD_BYTES = int(os.getenv("LOG_MAX_PAYLOAD_BYTES", "16384"))
+
+# Local SQLite cache file shared by the workflow caches
+CACHE_DB_PATH = os.getenv(
+    "CACHE_DB_PATH",
+    os.path.join(tempfile.gettempdir(), "reaseguros_cache.sqlite3")
+)
+
+# Extracted PDF text cache (keyed by SHA-256 of the PDF bytes)
+PDF_TEXT_CACHE_ENABLED = os.getenv("PDF_TEXT_CACHE_ENABLED", "true").lower() == "true"
+PDF_TEXT_CACHE_MAX_ENTRIES = int(os.getenv("PDF_TEXT_CACHE_MAX_ENTRIES", "500"))
+PDF_TEXT_CACHE_MAX_BYTES = int(os.getenv("PDF_TEXT_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+
+# Process pool size for multi-document PDF extraction (1 disables the pool) and seconds to wait for its results
+PDF_EXTRACTION_WORKERS = int(os.getenv("PDF_EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_EXTRACTION_TIMEOUT = float(os.getenv("PDF_EXTRACTION_TIMEOUT", "300"))
+
+# Maximum pages extracted per PDF (0 extracts every page)
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "0")) or None
+
+# Seconds a process-workflow(-async) request may run before it is cancelled with a 504. gunicorn's --timeout only
+# restarts unresponsive uvicorn workers; it does not bound requests
+WORKFLOW_REQUEST_TIMEOUT = float(os.getenv("WORKFLOW_REQUEST_TIMEOUT", "120"))
+
+# Build and compile the workflow at Django startup instead of on the first request. Off by default so management
+# commands (check, migrate, ...) skip it; the server CMD turns it on for its workers only (gunicorn --env)
+WORKFLOW_WARMUP_ENABLED = os.getenv("WORKFLOW_WARMUP_ENABLED", "false").lower() == "true"
+
+# Prompt templates directory and hot-reload check interval (seconds)
+PROMPTS_DIR = os.getenv("PROMPTS_DIR", str(Path(__file__).resolve().parents[4] / "prompts"))
+PROMPT_RELOAD_INTERVAL = float(os.getenv("PROMPT_RELOAD_INTERVAL", "5"))
+
+# LLM response cache keyed on (model, prompt hash, input hash)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Background worker threads for asynchronous workflow jobs
+WORKFLOW_JOB_WORKERS = int(os.getenv("WORKFLOW_JOB_WORKERS", "2"))
+# Seconds without an update after which a PENDING/RUNNING job is considered lost (e.g. worker restart) and marked
+# FAILED, on job submission and by the fail_stale_jobs management command
+WORKFLOW_JOB_STALE_SECONDS = int(os.getenv("WORKFLOW_JOB_STALE_SECONDS", "3600"))
+
+# Seconds without events before a Server-Sent Events keep-alive comment is sent
+SSE_HEARTBEAT_SECONDS = float(os.getenv("SSE_HEARTBEAT_SECONDS", "15"))
+
+# Batch workflow: placements processed at the same time by the worker process, across all batch requests
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+
+# Optional cap on LLM calls per minute by the worker process, shared by every request and batch (0 = unlimited, the
+# default); up to LLM_RATE_LIMIT_BURST calls may start at once before the rest are spaced out. Cache hits are not
+# counted. Set it to the model quota when batches would otherwise exceed it
+LLM_RATE_LIMIT_PER_MINUTE = int(os.getenv("LLM_RATE_LIMIT_PER_MINUTE", os.getenv("BATCH_RATE_LIMIT_PER_MINUTE", "0")))
+LLM_RATE_LIMIT_BURST = int(os.getenv("LLM_RATE_LIMIT_BURST", "10"))
+
+# Deconstruct mode: "full" sends one prompt with all 31 items, "sections" runs one request per prompt section concurrently,
+# "contracts" compares each contrato against the poliza on its own and reuses stored pair results
+DECONSTRUCT_MODE = os.getenv("DECONSTRUCT_MODE", "full").lower()
+
+# Deconstruct response format: "text" parses the JSON block of a free-form response, "structured" constrains the
+# response to the comparison schema, validates it item by item and retries only the malformed or missing items
+DECONSTRUCT_OUTPUT = os.getenv("DECONSTRUCT_OUTPUT", "text").lower()
+
+# Stored per-(poliza, contrato) comparisons used by the "contracts" deconstruct mode
+CONTRACT_COMPARISON_MAX_ENTRIES = int(os.getenv("CONTRACT_COMPARISON_MAX_ENTRIES", "2000"))
+CONTRACT_COMPARISON_MAX_BYTES = int(os.getenv("CONTRACT_COMPARISON_MAX_BYTES", str(128 * 1024 * 1024)))
+
+# Local relevance prefilter applied to document text before the deconstruct prompt: blocks of at most
+# PREFILTER_MAX_BLOCK_CHARS, top-k blocks per item in each document, and at least PREFILTER_MIN_DOC_SHARE of each
+# document's text kept
+PREFILTER_ENABLED = os.getenv("PREFILTER_ENABLED", "false").lower() == "true"
+PREFILTER_TOP_K_PER_ITEM = int(os.getenv("PREFILTER_TOP_K_PER_ITEM", "4"))
+PREFILTER_REPEATED_LINE_MIN = int(os.getenv("PREFILTER_REPEATED_LINE_MIN", "3"))
+PREFILTER_MAX_BLOCK_CHARS = int(os.getenv("PREFILTER_MAX_BLOCK_CHARS", "1200"))
+PREFILTER_MIN_DOC_SHARE = float(os.getenv("PREFILTER_MIN_DOC_SHARE", "0.3"))
+
+# Report mode: "llm" writes the whole HTML report with agent5.md, "template" renders it from comparison_data
+# and asks the LLM only for the executive summary, "fast" renders it without any LLM call
+REPORT_MODE = os.getenv("REPORT_MODE", "llm").lower()
+
+# HTML to PDF backend (xhtml2pdf, weasyprint) and execution mode ("inline" in the calling thread,
+# "process" on a shared process pool); the queue bounds renders in flight or waiting for a pool worker, and a pool
+# render not finished after PDF_RENDER_TIMEOUT seconds fails
+PDF_RENDERER = os.getenv("PDF_RENDERER", "xhtml2pdf").lower()
+PDF_RENDER_MODE = os.getenv("PDF_RENDER_MODE", "inline").lower()
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", str(min(2, os.cpu_count() or 1))))
+PDF_RENDER_QUEUE_SIZE = int(os.getenv("PDF_RENDER_QUEUE_SIZE", "8"))
+PDF_RENDER_QUEUE_TIMEOUT = float(os.getenv("PDF_RENDER_QUEUE_TIMEOUT", "30"))
+PDF_RENDER_TIMEOUT = float(os.getenv("PDF_RENDER_TIMEOUT", "60"))
+
+# Rendered PDF cache keyed by HTML content hash, and local TTF fonts registered once per process (e.g. a font
+# covering the ✅ ⚠️ ❌ icons), usable in the report CSS by family name without @font-face; the warm-up flag
+# registers them when the service starts instead of on the first render
+PDF_RENDER_CACHE_ENABLED = os.getenv("PDF_RENDER_CACHE_ENABLED", "true").lower() == "true"
+PDF_RENDER_CACHE_MAX_ENTRIES = int(os.getenv("PDF_RENDER_CACHE_MAX_ENTRIES", "200"))
+PDF_RENDER_CACHE_MAX_BYTES = int(os.getenv("PDF_RENDER_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+PDF_RENDER_WARMUP_ENABLED = os.getenv("PDF_RENDER_WARMUP_ENABLED", "true").lower() == "true"
+PDF_FONTS_DIR = os.getenv("PDF_FONTS_DIR", "")
+
+# OCR fallback for PDF pages without a text layer (needs pytesseract, Pillow and the tesseract binary); a page
+# not OCR'd within OCR_TIMEOUT seconds is left as extracted
+OCR_ENABLED = os.getenv("OCR_ENABLED", "true").lower() == "true"
+OCR_LANGUAGES = os.getenv("OCR_LANGUAGES", "spa+eng")
+OCR_MIN_PAGE_CHARS = int(os.getenv("OCR_MIN_PAGE_CHARS", "20"))
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 1)))
+OCR_TIMEOUT = float(os.getenv("OCR_TIMEOUT", "120"))
+OCR_CACHE_MAX_ENTRIES = int(os.getenv("OCR_CACHE_MAX_ENTRIES", "5000"))
+OCR_CACHE_MAX_BYTES = int(os.getenv("OCR_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
@@ -0,0 +1,27 @@
+"""
+Batch workflow models.
+"""
+from typing import List, Optional
+from pydantic import BaseModel
+
+from documents.domain.entities.document_source import DocumentSource
+
+
+class BatchGroup(BaseModel):
+    """
+    One placement in a batch: a poliza and its contratos.
+    """
+    id: str
+    poliza: DocumentSource
+    contratos: List[DocumentSource]
+
+
+class BatchItemResult(BaseModel):
+    """
+    Outcome of one placement in a batch.
+    """
+    id: str
+    success: bool
+    error: Optional[str] = None
+    elapsed_ms: float = 0
+    pdf_bytes: Optional[bytes] = None
@@ -0,0 +1,47 @@
+"""
+Comparison result models for the deconstruct structured output.
+"""
+from typing import Any, Dict, List
+from pydantic import BaseModel, Field
+
+
+class SlipComparison(BaseModel):
+    """
+    Content and comparison of one item in one reinsurance slip.
+    """
+    reasegurador: str = Field(description="Nombre exacto del reasegurador tal como figura en el slip")
+    detalle: str = Field(description="Contenido del ítem en el slip, o 'No presente'")
+    comparacion: str = Field(description="Ícono (✅, ⚠️ o ❌) seguido de la comparación entre póliza y slip")
+
+
+class ComparisonItem(BaseModel):
+    """
+    One of the 31 compared items.
+    """
+    numero: int = Field(ge=1, le=31, description="Número del ítem (N)")
+    seccion_poliza: str = Field(description="Sección de la póliza donde aparece el ítem")
+    item_poliza: str = Field(description="Nombre del ítem")
+    detalle_poliza: str = Field(description="Contenido del ítem en la póliza")
+    slips: List[SlipComparison] = Field(description="Un elemento por cada slip de reaseguro")
+    conclusion_general: str = Field(description="Evaluación final del ítem entre póliza y todos los slips")
+
+    def to_row(self) -> Dict[str, Any]:
+        """Flat row with the column names of the agent3.md JSON format."""
+        row: Dict[str, Any] = {
+            "N": self.numero,
+            "SECCIÓN_PÓLIZA": self.seccion_poliza,
+            "ITEM_PÓLIZA": self.item_poliza,
+            "DETALLE_ÍTEM (Póliza)": self.detalle_poliza,
+        }
+        for slip in self.slips:
+            row[f"DETALLE - {slip.reasegurador} (Slip)"] = slip.detalle
+            row[f"COMPARACIÓN {slip.reasegurador} (Slip)"] = slip.comparacion
+        row["CONCLUSIÓN GENERAL"] = self.conclusion_general
+        return row
+
+
+class ComparisonResult(BaseModel):
+    """
+    Structured deconstruct output: the compared items.
+    """
+    items: List[ComparisonItem]
@@ -0,0 +1,45 @@
+"""
+Document source models for workflow inputs.
+"""
+from pathlib import Path
+from typing import Optional, Union
+from pydantic import BaseModel
+
+
+class DocumentSource(BaseModel):
+    """
+    A PDF handed to the workflow either as in-memory bytes or as a file on disk.
+    Small uploads stay in memory; only uploads Django already spilled to disk
+    (above FILE_UPLOAD_MAX_MEMORY_SIZE) are referenced by path.
+    ``text`` carries text already extracted with the default page range (e.g.
+    once per distinct document of a batch), so it is not parsed again.
+    """
+    name: str
+    content: Optional[bytes] = None
+    path: Optional[str] = None
+    text: Optional[str] = None
+
+    def read_bytes(self) -> bytes:
+        """Return the document bytes, reading from disk only when not held in memory."""
+        if self.content is not None:
+            return self.content
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    @classmethod
+    def coerce(cls, source: Union["DocumentSource", str]) -> "DocumentSource":
+        """Accept either a DocumentSource or a file path."""
+        if isinstance(source, DocumentSource):
+            return source
+        return cls(name=Path(source).name, path=str(source))
+
+    @classmethod
+    def from_upload(cls, uploaded_file) -> "DocumentSource":
+        """
+        Build a source from a Django UploadedFile without an extra disk round trip.
+        Temporary (spilled) uploads are referenced by path; in-memory uploads are read as bytes.
+        """
+        if hasattr(uploaded_file, "temporary_file_path"):
+            return cls(name=uploaded_file.name, path=uploaded_file.temporary_file_path())
+        uploaded_file.seek(0)
+        return cls(name=uploaded_file.name, content=uploaded_file.read())
@@ -0,0 +1,28 @@
+"""
+Prompt template models.
+"""
+from typing import List
+from pydantic import BaseModel
+
+
+class PromptTemplate(BaseModel):
+    """
+    Prompt template loaded in memory with its content identity.
+    """
+    name: str
+    content: str
+    content_hash: str
+    source: str = "file"
+
+
+class PromptSection(BaseModel):
+    """
+    A section of the comparison prompt and the items it covers.
+    """
+    title: str
+    items: List[str] = []
+    first_number: int = 1
+
+    @property
+    def last_number(self) -> int:
+        return self.first_number + len(self.items) - 1
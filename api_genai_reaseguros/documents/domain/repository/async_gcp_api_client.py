@@ -0,0 +1,258 @@
+"""
+Async GCP API Client for communicating with API Core service.
+
+Same authentication, retry policy and response handling as GcpApiClient
+(shared through GcpApiClientMixin), with awaitable get/post/put over an httpx
+connection pool shared per event loop and a cap on requests in flight per host.
+"""
+import asyncio
+import time
+import weakref
+from typing import Any, Dict, Optional, Tuple, Type
+from urllib.parse import urlsplit
+
+from documents.domain.constants.env_constants import (
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_MAX_RETRIES,
+    HTTP_HOST_CONCURRENCY,
+    HTTP_KEEPALIVE_EXPIRY,
+)
+from .gcp_api_client import GcpApiClientMixin, DEFAULT_EXPIRATION_TIME, T, UnionModelJsonResponse
+from .http_client import HttpClient
+from .id_token_cache import IdTokenCache
+from .http_transport import (
+    DEFAULT_TIMEOUT,
+    TRANSPORT_STATS,
+    retry_after_seconds,
+    backoff_delay,
+    is_idempotent,
+    retry_statuses,
+)
+
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+# httpx clients and per-host limits are bound to the event loop that created them
+_LOOP_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+_LOOP_HOST_LIMITS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _get_async_client() -> "httpx.AsyncClient":
+    """Get or create the pooled client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _LOOP_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = _LOOP_CLIENTS[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=HTTP_POOL_CONNECTIONS * HTTP_POOL_MAXSIZE,
+                max_keepalive_connections=HTTP_POOL_MAXSIZE,
+                keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+    return client
+
+
+def _host_limit(url: str, limit: int) -> asyncio.Semaphore:
+    """Semaphore bounding the requests in flight to the URL's host on the running event loop."""
+    limits = _LOOP_HOST_LIMITS.setdefault(asyncio.get_running_loop(), {})
+    host = urlsplit(url).netloc
+    if host not in limits:
+        limits[host] = asyncio.Semaphore(max(1, limit))
+    return limits[host]
+
+
+async def aclose_shared_client() -> None:
+    """Close the pooled client of the running event loop (e.g. on ASGI shutdown)."""
+    client = _LOOP_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+class AsyncGcpApiClient(GcpApiClientMixin, HttpClient):
+    """
+    Async HTTP client for GCP services with automatic bearer token authentication.
+
+    get/post/put are coroutines. The token cache and response validation are
+    shared with GcpApiClient; token fetches run in a worker thread.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        trace_id: str,
+        expiration_token_time: int = DEFAULT_EXPIRATION_TIME,
+        use_auth: bool = True,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+        max_retries: int = HTTP_MAX_RETRIES,
+        host_concurrency: int = HTTP_HOST_CONCURRENCY,
+        token_cache: Optional[IdTokenCache] = None
+    ):
+        """
+        Initialize async GCP API client.
+
+        Args:
+            base_url: Base URL of the API Core service
+            trace_id: Trace ID for logging
+            expiration_token_time: Token lifetime in seconds, for tokens without an "exp" claim
+            use_auth: Whether to use GCP authentication (set False for local testing)
+            timeout: (connect, read) timeouts in seconds
+            max_retries: Extra attempts on retryable responses and connection errors
+            host_concurrency: Requests in flight per host, shared by every client on the event loop
+            token_cache: ID token cache (default: the cache shared by the process)
+
+        Raises:
+            ImportError: If httpx is not installed
+        """
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx is not installed. Install it with: pip install httpx")
+        super().__init__()
+        self._init_client(base_url, trace_id, expiration_token_time, use_auth, timeout, max_retries, token_cache)
+        self.host_concurrency = host_concurrency
+
+    async def _aget_headers(self) -> Dict[str, str]:
+        """Headers with a cached token, fetching one in a worker thread only when the cache has none."""
+        if not self.use_auth:
+            return self._get_headers()
+        token = self.token_cache.peek(self.base_url, self.expiration_token_time)
+        if token is None:
+            # A fetch may hit the metadata server: keep it off the event loop
+            token = await asyncio.to_thread(self.get_access_token)
+        return {'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'}
+
+    def _pool_stats(self) -> Dict[str, Any]:
+        return {"event_loop_pools": len(_LOOP_CLIENTS), "host_concurrency": self.host_concurrency}
+
+    async def _arequest(self, method: str, url: str, **kwargs: Any) -> "httpx.Response":
+        """Async variant of GcpApiClient._request (same retry policy), holding a per-host slot during each attempt."""
+        client = _get_async_client()
+        limit = _host_limit(url, self.host_concurrency)
+        connect_timeout, read_timeout = self.timeout
+        timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        idempotent = is_idempotent(method)
+        statuses = retry_statuses(method)
+        attempt = 0
+        reauthenticated = False
+        while True:
+            headers = await self._aget_headers()
+            response = None
+            error = None
+            try:
+                async with limit:
+                    response = await client.request(method, url, headers=headers, timeout=timeout, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError) as e:
+                error = e
+
+            if self._rejects_token(response, reauthenticated):
+                # May wait for a fetch in progress on the audience lock: keep it off the event loop
+                await asyncio.to_thread(self.token_cache.invalidate, self.base_url)
+                self._rewind_files(kwargs.get("files"))
+                reauthenticated = True
+                continue
+
+            if error is not None:
+                # A dropped connection may have delivered the request: only safe to resend when idempotent
+                retryable = idempotent or not isinstance(error, httpx.RemoteProtocolError)
+            else:
+                retryable = response.status_code in statuses
+            if not retryable or attempt >= self.max_retries:
+                counters = TRANSPORT_STATS.add(
+                    requests=1, attempts=attempt + 1, retries=attempt, failures=int(retryable)
+                )
+                self._log_transport_stats(counters, retried=attempt > 0)
+                if error is not None:
+                    raise error
+                return response
+
+            delay = backoff_delay(attempt, retry_after_seconds(response))
+            self.logger.log_text(
+                f"{method} {url} failed ({error or response.status_code}); "
+                f"retry {attempt + 1}/{self.max_retries} in {delay:.2f}s",
+                severity="WARNING"
+            )
+            await asyncio.sleep(delay)
+            self._rewind_files(kwargs.get("files"))
+            attempt += 1
+
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        HTTP GET request.
+
+        Args:
+            endpoint: API endpoint (relative to base_url)
+            params: Query parameters
+
+        Returns:
+            JSON response
+        """
+        url = f"{self.base_url}/{endpoint}"
+        self.logger.log_text(f"GET {url}")
+        response = await self._arequest("GET", url, params=params)
+        return self.valid_http_response(response)
+
+    async def post(
+        self,
+        endpoint: str,
+        data: Optional[Any] = None,
+        json: Optional[Dict[str, Any]] = None,
+        files: Optional[Any] = None,
+        model_response: Optional[Type[T]] = None
+    ) -> UnionModelJsonResponse:
+        """
+        HTTP POST request.
+
+        Args:
+            endpoint: API endpoint (relative to base_url)
+            data: Form data
+            json: JSON payload
+            files: Files to upload
+            model_response: Optional Pydantic model to parse response
+
+        Returns:
+            JSON response or Pydantic model instance
+        """
+        url = f"{self.base_url}/{endpoint}"
+        self.logger.log_text(f"POST {url}")
+        if json:
+            self.logger.log_struct({"request_payload": json})
+
+        start = time.perf_counter()
+        response = await self._arequest("POST", url, data=data, json=json, files=files)
+        valid_json_response = self.valid_http_response(response)
+        self.logger.log_struct({
+            "response": valid_json_response,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+        })
+
+        if model_response is not None:
+            return model_response(**valid_json_response)
+        return valid_json_response
+
+    async def put(
+        self,
+        endpoint: str,
+        data: Optional[Any] = None,
+        json: Optional[Dict[str, Any]] = None,
+        files: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """
+        HTTP PUT request.
+
+        Args:
+            endpoint: API endpoint (relative to base_url)
+            data: Form data
+            json: JSON payload
+            files: Files to upload
+
+        Returns:
+            JSON response
+        """
+        url = f"{self.base_url}/{endpoint}"
+        self.logger.log_text(f"PUT {url}")
+        response = await self._arequest("PUT", url, data=data, json=json, files=files)
+        return self.valid_http_response(response)
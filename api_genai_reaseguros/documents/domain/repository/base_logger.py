@@ -1,47 +1,165 @@
 """
 Base logger interface that all logger implementations must follow.
 """
+import json
 import logging
-from typing import Optional, Dict, Any
+import random
+from typing import Optional, Dict, Any, Tuple, Union
 from abc import ABC, abstractmethod
 
+from documents.domain.constants.env_constants import (
+    LOG_SAMPLE_RATES,
+    LOG_MAX_FIELD_CHARS,
+    LOG_MAX_LIST_ITEMS,
+    LOG_MAX_PAYLOAD_BYTES,
+)
+
+
+def severity_level(severity: Union[str, int, None]) -> int:
+    """Numeric logging level of a severity given as a name ("WARNING") or a number."""
+    if isinstance(severity, int):
+        return severity
+    level = logging.getLevelName(str(severity or "INFO").upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+def truncate_text(text: str, max_chars: int) -> str:
+    """Cut text longer than ``max_chars``, noting how much was removed."""
+    if len(text) <= max_chars:
+        return text
+    return f"{text[:max_chars]}... [truncated {len(text) - max_chars} chars]"
+
+
+def _truncate_sized(value: Any, max_chars: int, max_items: int, depth: int) -> Tuple[Any, int]:
+    """Truncated copy of ``value`` and the approximate length of its JSON serialization."""
+    if isinstance(value, str):
+        text = truncate_text(value, max_chars)
+        return text, len(text) + 2
+    if isinstance(value, bool) or value is None:
+        return value, 5 if value is False else 4
+    if isinstance(value, (int, float)):
+        return value, len(repr(value))
+    if depth <= 0:
+        text = f"<{type(value).__name__}>"
+        return text, len(text) + 2
+    if isinstance(value, dict):
+        copy = {}
+        # Braces, plus ", " between members and quotes and ": " around each key
+        size = 2 + max(0, 2 * (len(value) - 1))
+        for k, v in value.items():
+            key = str(k)
+            copy[key], item_size = _truncate_sized(v, max_chars, max_items, depth - 1)
+            size += len(key) + 4 + item_size
+        return copy, size
+    if isinstance(value, (list, tuple, set)):
+        items = list(value)
+        cut = []
+        size = 2
+        for v in items[:max_items]:
+            item, item_size = _truncate_sized(v, max_chars, max_items, depth - 1)
+            cut.append(item)
+            size += item_size
+        if len(items) > max_items:
+            note = f"... [truncated {len(items) - max_items} items]"
+            cut.append(note)
+            size += len(note) + 2
+        return cut, size + max(0, 2 * (len(cut) - 1))
+    text = truncate_text(str(value), max_chars)
+    return text, len(text) + 2
+
+
+def truncate_payload(
+    value: Any,
+    max_chars: int = LOG_MAX_FIELD_CHARS,
+    max_items: int = LOG_MAX_LIST_ITEMS,
+    depth: int = 8
+) -> Any:
+    """
+    Copy of a structured payload with long strings and lists cut.
+
+    The original payload is not modified. Nesting deeper than ``depth`` is
+    replaced by its type name.
+    """
+    return _truncate_sized(value, max_chars, max_items, depth)[0]
+
 
 class BaseLogger(ABC):
     """
     Abstract base class for logger implementations.
     Provides interface for logging text and structured data with trace support.
+
+    Implementations call ``should_log`` before formatting anything, and
+    ``cap_payload``/``truncate_text`` on what they log, so filtered entries
+    cost nothing and logged ones stay bounded in size.
     """
-    
+
+    name: str = ""
+    level: int = logging.DEBUG
+    sample_rate: float = 1.0
+    max_payload_bytes: int = LOG_MAX_PAYLOAD_BYTES
+
+    def configure_filters(self, name: str, level: Union[str, int, None]) -> None:
+        """Set the minimum level and this logger's sampling rate (LOG_SAMPLE_RATES)."""
+        self.level = severity_level(level)
+        self.sample_rate = LOG_SAMPLE_RATES.get(name, 1.0)
+
+    def is_enabled_for(self, severity: Union[str, int, None]) -> bool:
+        """Whether entries of this severity pass the level filter."""
+        return severity_level(severity) >= self.level
+
+    def should_log(self, severity: Union[str, int, None]) -> bool:
+        """Level check plus sampling; warnings and errors are never sampled out."""
+        level = severity_level(severity)
+        if level < self.level:
+            return False
+        if level >= logging.WARNING or self.sample_rate >= 1.0:
+            return True
+        return random.random() < self.sample_rate
+
+    def cap_payload(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Truncated copy of a payload, reduced to a preview if still above max_payload_bytes."""
+        capped, size = _truncate_sized(payload, LOG_MAX_FIELD_CHARS, LOG_MAX_LIST_ITEMS, 8)
+        # The size tracked during truncation ignores escapes: only oversized payloads are serialized
+        if size <= self.max_payload_bytes:
+            return capped
+        serialized = json.dumps(capped, ensure_ascii=False, default=str)
+        return {
+            "truncated": True,
+            "size_bytes": len(serialized),
+            "keys": list(capped)[:LOG_MAX_LIST_ITEMS] if isinstance(capped, dict) else [],
+            "preview": serialized[:self.max_payload_bytes],
+        }
+
     @abstractmethod
     def generate_trace(self) -> str:
         """Generate a new unique trace ID"""
         pass
-    
+
     @abstractmethod
     def set_trace(self, trace_id: str) -> None:
         """Set the trace ID for this logger instance"""
         pass
-    
+
     @abstractmethod
     def get_trace(self) -> str:
         """Get the current trace ID"""
         pass
-    
+
     @abstractmethod
     def log_text(
-        self, 
+        self,
         text: str,
-        trace_id: Optional[str] = None, 
+        trace_id: Optional[str] = None,
         severity: Optional[str] = logging.INFO
     ) -> None:
         """Log a text message"""
         pass
-    
+
     @abstractmethod
     def log_struct(
-        self, 
-        payload: Dict[str, Any], 
-        trace_id: Optional[str] = None, 
+        self,
+        payload: Dict[str, Any],
+        trace_id: Optional[str] = None,
         severity: Optional[str] = logging.INFO
     ) -> None:
         """Log structured data (dict/JSON)"""
@@ -1,23 +1,29 @@
 """
 GCP API Client for communicating with API Core service.
-Handles authentication and HTTP requests with bearer tokens.
+Handles authentication and HTTP requests with bearer tokens over a shared,
+pooled session with timeouts and retries. ID tokens come from a process-wide
+cache, so a client per trace ID does not re-authenticate.
 """
 import requests
 import time
-from typing import Dict, Any, TypeVar, Type, Optional, Union
+from typing import Dict, Any, TypeVar, Type, Optional, Union, Tuple
 from pydantic import BaseModel
 
 from documents.domain.logger import get_logger
-from documents.domain.constants.env_constants import LOGGING_TYPE
+from documents.domain.constants.env_constants import LOGGING_TYPE, HTTP_MAX_RETRIES, HTTP_STATS_LOG_INTERVAL
 from .http_client import HttpClient
-
-try:
-    import google.oauth2.id_token
-    import google.auth.transport.requests
-    GCP_AUTH_AVAILABLE = True
-except ImportError:
-    GCP_AUTH_AVAILABLE = False
-
+from .id_token_cache import IdTokenCache, GCP_AUTH_AVAILABLE, get_id_token_cache
+from .http_transport import (
+    DEFAULT_TIMEOUT,
+    TRANSPORT_STATS,
+    get_shared_session,
+    retry_after_seconds,
+    backoff_delay,
+    pool_stats,
+    is_idempotent,
+    is_connect_error,
+    retry_statuses,
+)
 
 T = TypeVar("T", bound=BaseModel)
 GenericJsonResponse = Dict[str, Any]
@@ -27,74 +33,53 @@ UnionModelJsonResponse = Union[GenericJsonResponse, T]
 DEFAULT_EXPIRATION_TIME = 3600  # 1 hour
 
 
-class GcpApiClient(HttpClient):
+class GcpApiClientMixin:
     """
-    HTTP client for GCP services with automatic bearer token authentication.
+    Authentication, response validation and transport logging shared by the
+    sync and async GCP clients. Subclasses provide ``_pool_stats``.
     """
-    
-    def __init__(
-        self, 
+
+    def _init_client(
+        self,
         base_url: str,
-        trace_id: str, 
-        expiration_token_time: int = DEFAULT_EXPIRATION_TIME,
-        use_auth: bool = True
-    ):
-        """
-        Initialize GCP API client.
-        
-        Args:
-            base_url: Base URL of the API Core service
-            trace_id: Trace ID for logging
-            expiration_token_time: Token expiration time in seconds
-            use_auth: Whether to use GCP authentication (set False for local testing)
-        """
-        super().__init__()
+        trace_id: str,
+        expiration_token_time: int,
+        use_auth: bool,
+        timeout: Tuple[float, float],
+        max_retries: int,
+        token_cache: Optional[IdTokenCache]
+    ) -> None:
+        """Set the connection settings, token cache and trace-bound logger."""
         self.base_url = base_url
-        self.token = None
-        self.token_expiry = 0
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.token_cache = token_cache or get_id_token_cache()
         self.expiration_token_time = expiration_token_time
         self.use_auth = use_auth and GCP_AUTH_AVAILABLE
-        
+
         # Initialize logger
-        self.logger = get_logger(GcpApiClient.__name__, LOGGING_TYPE)
+        self.logger = get_logger(type(self).__name__, LOGGING_TYPE)
         self.trace_id = trace_id
         self.logger.set_trace(trace_id)
-        
-        if self.use_auth and not GCP_AUTH_AVAILABLE:
+
+        if use_auth and not GCP_AUTH_AVAILABLE:
             self.logger.log_text(
                 "GCP authentication libraries not available. Install with: "
                 "pip install google-auth google-auth-oauthlib",
                 severity="WARNING"
             )
-    
-    def _get_bearer_token(self) -> str:
-        """
-        Get a bearer token for GCP service authentication.
-        
-        Returns:
-            Bearer token string
-        """
-        if not self.use_auth:
-            return "mock-token-for-local-testing"
-        
-        request = google.auth.transport.requests.Request()
-        target_audience = self.base_url
-        id_token = google.oauth2.id_token.fetch_id_token(request, target_audience)
-        return id_token
-    
+
     def get_access_token(self) -> str:
         """
-        Get access token, refreshing if expired.
+        Get access token for the base URL audience from the shared cache.
         
         Returns:
             Valid access token
         """
-        if self.token is None or time.time() > self.token_expiry:
-            self.token = self._get_bearer_token()
-            self.token_expiry = time.time() + self.expiration_token_time
-            self.logger.log_text("Access token refreshed")
+        if not self.use_auth:
+            return "mock-token-for-local-testing"
         
-        return self.token
+        return self.token_cache.get(self.base_url, self.expiration_token_time)
     
     def _get_headers(self) -> Dict[str, str]:
         """
@@ -112,12 +97,46 @@ class GcpApiClient(HttpClient):
         
         return headers
 
-    def valid_http_response(self, response: requests.Response) -> Dict[str, Any]:
+    def _rejects_token(self, response: Any, reauthenticated: bool) -> bool:
+        """
+        Whether the response rejected a cached token that should be dropped before one more attempt.
+
+        A 401 means the token was revoked or rotated before its expiry; the
+        request is repeated once with a freshly fetched token.
+        """
+        if not self.use_auth or reauthenticated or response is None or response.status_code != 401:
+            return False
+        self.logger.log_text(f"{self.base_url} rejected the access token (401); fetching a new one", severity="WARNING")
+        return True
+
+    def _rewind_files(self, files: Optional[Any]) -> None:
+        """Seek file-like uploads back to the start before a retry."""
+        values = files.values() if isinstance(files, dict) else (files or [])
+        for value in values:
+            handle = value[1] if isinstance(value, tuple) and len(value) > 1 else value
+            if hasattr(handle, "seek"):
+                handle.seek(0)
+
+    def _log_transport_stats(self, counters: Dict[str, int], retried: bool) -> None:
+        """Log pool and retry counters after a retried request and every HTTP_STATS_LOG_INTERVAL requests."""
+        periodic = HTTP_STATS_LOG_INTERVAL > 0 and counters["requests"] % HTTP_STATS_LOG_INTERVAL == 0
+        if not (retried or periodic):
+            return
+        self.logger.log_struct({
+            "evento": "http_transport_stats",
+            **counters,
+            "pools": self._pool_stats()
+        })
+
+    def _pool_stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def valid_http_response(self, response: Any) -> Dict[str, Any]:
         """
         Validate HTTP response and return JSON.
         
         Args:
-            response: HTTP response object
+            response: HTTP response object (requests or httpx)
         
         Returns:
             JSON response as dictionary
@@ -135,6 +154,99 @@ class GcpApiClient(HttpClient):
         )
         response.raise_for_status()
 
+
+class GcpApiClient(GcpApiClientMixin, HttpClient):
+    """
+    HTTP client for GCP services with automatic bearer token authentication.
+    """
+    
+    def __init__(
+        self, 
+        base_url: str,
+        trace_id: str, 
+        expiration_token_time: int = DEFAULT_EXPIRATION_TIME,
+        use_auth: bool = True,
+        session: Optional[requests.Session] = None,
+        timeout: Tuple[float, float] = DEFAULT_TIMEOUT,
+        max_retries: int = HTTP_MAX_RETRIES,
+        token_cache: Optional[IdTokenCache] = None
+    ):
+        """
+        Initialize GCP API client.
+        
+        Args:
+            base_url: Base URL of the API Core service
+            trace_id: Trace ID for logging
+            expiration_token_time: Token lifetime in seconds, for tokens without an "exp" claim
+            use_auth: Whether to use GCP authentication (set False for local testing)
+            session: HTTP session (default: the pooled session shared by the process)
+            timeout: (connect, read) timeouts in seconds
+            max_retries: Extra attempts on retryable responses and connection errors
+            token_cache: ID token cache (default: the cache shared by the process)
+        """
+        super().__init__()
+        self._init_client(base_url, trace_id, expiration_token_time, use_auth, timeout, max_retries, token_cache)
+        self.session = session or get_shared_session()
+
+    def _pool_stats(self) -> Dict[str, Any]:
+        return pool_stats(self.session)
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a request through the pooled session, retrying throttled and transient failures.
+
+        Retries with jittered exponential backoff (or the server's Retry-After).
+        GET/PUT are retried on 429/5xx responses and connection errors. POST is
+        not idempotent: it is only retried on 429/503 and on errors raised
+        before the connection was established. Read timeouts are never retried:
+        the server may still be processing the request. A 401 drops the cached
+        token and repeats the request once with a new one.
+
+        Returns:
+            The last response (its status is validated by the caller)
+        """
+        idempotent = is_idempotent(method)
+        statuses = retry_statuses(method)
+        attempt = 0
+        reauthenticated = False
+        while True:
+            response = None
+            error = None
+            try:
+                response = self.session.request(method, url, headers=self._get_headers(), timeout=self.timeout, **kwargs)
+            except requests.ConnectionError as e:
+                # Includes connect timeouts and connections the server closed while idle in the pool
+                error = e
+
+            if self._rejects_token(response, reauthenticated):
+                self.token_cache.invalidate(self.base_url)
+                self._rewind_files(kwargs.get("files"))
+                reauthenticated = True
+                continue
+
+            if error is not None:
+                retryable = idempotent or is_connect_error(error)
+            else:
+                retryable = response.status_code in statuses
+            if not retryable or attempt >= self.max_retries:
+                counters = TRANSPORT_STATS.add(
+                    requests=1, attempts=attempt + 1, retries=attempt, failures=int(retryable)
+                )
+                self._log_transport_stats(counters, retried=attempt > 0)
+                if error is not None:
+                    raise error
+                return response
+
+            delay = backoff_delay(attempt, retry_after_seconds(response))
+            self.logger.log_text(
+                f"{method} {url} failed ({error or response.status_code}); "
+                f"retry {attempt + 1}/{self.max_retries} in {delay:.2f}s",
+                severity="WARNING"
+            )
+            time.sleep(delay)
+            self._rewind_files(kwargs.get("files"))
+            attempt += 1
+
     def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         HTTP GET request.
@@ -150,11 +262,7 @@ class GcpApiClient(HttpClient):
         
         self.logger.log_text(f"GET {url}")
         
-        response = requests.get(
-            url, 
-            headers=self._get_headers(),
-            params=params
-        )
+        response = self._request("GET", url, params=params)
 
         return self.valid_http_response(response)
 
@@ -185,13 +293,7 @@ class GcpApiClient(HttpClient):
         if json:
             self.logger.log_struct({"request_payload": json})
         
-        response = requests.post(
-            url, 
-            headers=self._get_headers(), 
-            data=data, 
-            json=json, 
-            files=files
-        )
+        response = self._request("POST", url, data=data, json=json, files=files)
 
         valid_json_response = self.valid_http_response(response)
         
@@ -226,12 +328,6 @@ class GcpApiClient(HttpClient):
         
         self.logger.log_text(f"PUT {url}")
         
-        response = requests.put(
-            url, 
-            headers=self._get_headers(), 
-            data=data, 
-            json=json, 
-            files=files
-        )
+        response = self._request("PUT", url, data=data, json=json, files=files)
 
         return self.valid_http_response(response)
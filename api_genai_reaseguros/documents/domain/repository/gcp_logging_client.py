@@ -1,11 +1,24 @@
 """
 GCP Cloud Logging client for production environments.
-Sends logs to Google Cloud Logging service.
+Sends logs to Google Cloud Logging service, by default through a shared
+background transport that writes them in batches.
 """
 import logging
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, List
 from uuid import uuid4
-from .base_logger import BaseLogger
+from documents.domain.constants.env_constants import (
+    LOG_TRANSPORT,
+    LOG_QUEUE_SIZE,
+    LOG_BATCH_SIZE,
+    LOG_FLUSH_INTERVAL,
+    LOG_OVERFLOW_POLICY,
+    LOG_BLOCK_TIMEOUT,
+    LOG_LEVEL,
+    LOG_MAX_FIELD_CHARS,
+)
+from .base_logger import BaseLogger, truncate_text
+from .log_transport import BatchingLogTransport, LogEntry, LogSink, register_for_shutdown
 
 try:
     import google.cloud.logging
@@ -14,6 +27,45 @@ try:
 except ImportError:
     GCP_AVAILABLE = False
 
+# Transport shared by every GcpLoggerClient in this process
+_SHARED_TRANSPORT: Optional[BatchingLogTransport] = None
+_SHARED_TRANSPORT_LOCK = threading.Lock()
+
+
+class GcpLogSink(LogSink):
+    """Writes each batch with one Cloud Logging API call per logger name."""
+
+    def __init__(self, client, resource) -> None:
+        self.client = client
+        self.resource = resource
+
+    def write(self, entries: List[LogEntry]) -> None:
+        by_logger: Dict[str, List[LogEntry]] = {}
+        for entry in entries:
+            by_logger.setdefault(entry.logger_name, []).append(entry)
+        for name, group in by_logger.items():
+            batch = self.client.logger(name).batch()
+            for entry in group:
+                log = batch.log_struct if entry.kind == "struct" else batch.log_text
+                log(entry.payload, severity=entry.severity, resource=self.resource, trace=entry.trace)
+            batch.commit()
+
+
+def _get_shared_transport(client, resource) -> BatchingLogTransport:
+    """Get or lazily create the process-wide transport, flushed at exit."""
+    global _SHARED_TRANSPORT
+    with _SHARED_TRANSPORT_LOCK:
+        if _SHARED_TRANSPORT is None:
+            _SHARED_TRANSPORT = register_for_shutdown(BatchingLogTransport(
+                GcpLogSink(client, resource),
+                max_queue=LOG_QUEUE_SIZE,
+                batch_size=LOG_BATCH_SIZE,
+                flush_interval=LOG_FLUSH_INTERVAL,
+                overflow=LOG_OVERFLOW_POLICY,
+                block_timeout=LOG_BLOCK_TIMEOUT
+            ))
+        return _SHARED_TRANSPORT
+
 
 class GcpLoggerClient(BaseLogger):
     """
@@ -24,7 +76,8 @@ class GcpLoggerClient(BaseLogger):
     def __init__(
         self, 
         name: str,
-        level: Optional[str] = logging.INFO
+        level: Optional[str] = LOG_LEVEL or logging.INFO,
+        transport: Optional[BatchingLogTransport] = None
     ) -> None:
         """
         Initialize GCP logger client.
@@ -32,6 +85,8 @@ class GcpLoggerClient(BaseLogger):
         Args:
             name: Name of the logger (usually the class/module name)
             level: Logging level (default: INFO)
+            transport: Batching transport for the entries (default: the shared one
+                when LOG_TRANSPORT is "async", none to write synchronously)
         
         Raises:
             ImportError: If google-cloud-logging is not installed
@@ -42,11 +97,16 @@ class GcpLoggerClient(BaseLogger):
                 "Install it with: pip install google-cloud-logging"
             )
         
+        self.name = name
+        self.configure_filters(name, level)
         self.client = None
         self._setup_client(level)
         self.logger = self.client.logger(name)
         self.resource = self._get_resource()
         self.trace_id = None
+        if transport is None and LOG_TRANSPORT == "async":
+            transport = _get_shared_transport(self.client, self.resource)
+        self.transport = transport
     
     def _setup_client(self, level: str) -> None:
         """Setup GCP logging client"""
@@ -98,7 +158,13 @@ class GcpLoggerClient(BaseLogger):
             trace_id: Optional trace ID (uses instance trace_id if not provided)
             severity: Log level (INFO, WARNING, ERROR, DEBUG)
         """
+        if not self.should_log(severity):
+            return
+        text = truncate_text(text, LOG_MAX_FIELD_CHARS)
         trace = trace_id or self.trace_id
+        if self.transport is not None:
+            self.transport.submit(LogEntry("text", text, self.name, severity, trace))
+            return
         
         self.logger.log_text(
             text,
@@ -121,7 +187,13 @@ class GcpLoggerClient(BaseLogger):
             trace_id: Optional trace ID (uses instance trace_id if not provided)
             severity: Log level (INFO, WARNING, ERROR, DEBUG)
         """
+        if not self.should_log(severity):
+            return
+        payload = self.cap_payload(payload)
         trace = trace_id or self.trace_id
+        if self.transport is not None:
+            self.transport.submit(LogEntry("struct", payload, self.name, severity, trace))
+            return
         
         self.logger.log_struct(
             payload,
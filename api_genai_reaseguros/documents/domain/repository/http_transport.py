@@ -0,0 +1,185 @@
+"""
+Shared HTTP transport for API Core clients.
+
+One pooled requests.Session per process, so calls reuse TCP+TLS connections
+instead of opening one per request, plus the retry policy (exponential
+backoff with full jitter on 429/5xx and connection errors, narrowed for
+non-idempotent methods) and the counters reported through the client logger.
+"""
+import random
+import socket
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from documents.domain.constants.env_constants import (
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_POOL_BLOCK,
+    HTTP_KEEPALIVE,
+    HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT,
+    HTTP_BACKOFF_BASE,
+    HTTP_BACKOFF_MAX,
+)
+
+# Statuses worth another attempt: throttling and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# A POST may have run when the server answered 500/502/504: only retry statuses that say it was not processed
+NON_IDEMPOTENT_RETRY_STATUSES = frozenset({429, 503})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+DEFAULT_TIMEOUT: Tuple[float, float] = (HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT)
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets enable TCP keep-alive, so idle pooled connections are not silently dropped."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        options = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1), (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        if hasattr(socket, "TCP_KEEPIDLE"):
+            options += [
+                (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60),
+                (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 15),
+                (socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 4),
+            ]
+        kwargs["socket_options"] = options
+        super().init_poolmanager(*args, **kwargs)
+
+
+def create_session(
+    pool_connections: int = HTTP_POOL_CONNECTIONS,
+    pool_maxsize: int = HTTP_POOL_MAXSIZE,
+    pool_block: bool = HTTP_POOL_BLOCK,
+    keepalive: bool = HTTP_KEEPALIVE
+) -> requests.Session:
+    """
+    Create a pooled session.
+
+    Args:
+        pool_connections: Hosts with their own connection pool
+        pool_maxsize: Connections kept open per host
+        pool_block: Wait for a free connection instead of opening a throwaway one when the pool is busy
+        keepalive: Enable TCP keep-alive on pooled sockets
+    """
+    adapter_class = _KeepAliveAdapter if keepalive else HTTPAdapter
+    # Retries are done by the client so they can be jittered and counted
+    adapter = adapter_class(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        pool_block=pool_block,
+        max_retries=0
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_shared_session() -> requests.Session:
+    """Get or lazily create the process-wide session."""
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is None:
+            _SESSION = create_session()
+        return _SESSION
+
+
+def is_idempotent(method: str) -> bool:
+    """Whether a request with this method can be sent again after it may have reached the server."""
+    return method.upper() in IDEMPOTENT_METHODS
+
+
+def retry_statuses(method: str) -> frozenset:
+    """Response statuses retried for the method."""
+    return RETRY_STATUSES if is_idempotent(method) else NON_IDEMPOTENT_RETRY_STATUSES
+
+
+def is_connect_error(error: requests.ConnectionError) -> bool:
+    """Whether the request failed while connecting, so the server never received it."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    # urllib3 wraps the socket failure in MaxRetryError.reason
+    return isinstance(getattr(reason, "reason", reason), NewConnectionError)
+
+
+def retry_after_seconds(response: Optional[requests.Response]) -> Optional[float]:
+    """Delay requested by a Retry-After header (seconds or HTTP date), if any."""
+    value = response.headers.get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(
+    attempt: int,
+    retry_after: Optional[float] = None,
+    base: float = HTTP_BACKOFF_BASE,
+    cap: float = HTTP_BACKOFF_MAX
+) -> float:
+    """
+    Seconds to wait before retry number ``attempt`` (0-based).
+
+    Full jitter: a uniform draw up to the exponential bound, so clients that
+    failed together do not retry together. A server Retry-After is honoured
+    up to the cap.
+    """
+    if retry_after is not None:
+        return min(cap, retry_after)
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def pool_stats(session: requests.Session) -> Dict[str, Any]:
+    """Per-host connection counters of the session pools (new connections vs requests served)."""
+    stats: Dict[str, Any] = {}
+    for adapter in set(session.adapters.values()):
+        pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+        if pools is None:
+            continue
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests,
+            }
+    return stats
+
+
+class TransportStats:
+    """Process-wide request and retry counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "attempts": 0, "retries": 0, "failures": 0}
+
+    def add(self, **values: int) -> Dict[str, int]:
+        with self._lock:
+            for name, value in values.items():
+                self._counters[name] += value
+            return dict(self._counters)
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+
+TRANSPORT_STATS = TransportStats()
@@ -0,0 +1,186 @@
+"""
+Process-wide Google ID token cache.
+
+Tokens are cached per audience and shared by every API client in the
+process, so building a client per trace ID does not re-authenticate. A token
+is refreshed in the background ahead of its expiry; only one fetch per
+audience runs at a time, the other callers reuse its result.
+"""
+import base64
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from documents.domain.logger import get_logger
+from documents.domain.constants.env_constants import LOGGING_TYPE, ID_TOKEN_REFRESH_MARGIN
+from .http_transport import get_shared_session
+
+try:
+    import google.oauth2.id_token
+    import google.auth.transport.requests
+    GCP_AUTH_AVAILABLE = True
+except ImportError:
+    GCP_AUTH_AVAILABLE = False
+
+# Lifetime assumed for tokens without a readable "exp" claim (seconds)
+DEFAULT_TOKEN_LIFETIME = 3600
+
+
+def fetch_google_id_token(audience: str) -> str:
+    """Fetch an ID token for the audience from the metadata server or local credentials."""
+    request = google.auth.transport.requests.Request(session=get_shared_session())
+    return google.oauth2.id_token.fetch_id_token(request, audience)
+
+
+def token_expiry(token: str) -> Optional[float]:
+    """Expiry timestamp from the JWT "exp" claim (read without verification), if present."""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+@dataclass
+class _CachedToken:
+    token: str
+    expires_at: float
+    used: bool = False
+
+
+class IdTokenCache:
+    """Thread-safe ID token cache keyed by audience, with single-flight refresh-ahead."""
+
+    def __init__(
+        self,
+        fetcher: Callable[[str], str] = fetch_google_id_token,
+        refresh_margin: float = ID_TOKEN_REFRESH_MARGIN,
+        clock: Callable[[], float] = time.time,
+        schedule_refresh: bool = True
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            fetcher: Returns a new token for an audience (stub it in tests)
+            refresh_margin: Seconds before expiry at which a token is refreshed in the background
+            clock: Time source in epoch seconds
+            schedule_refresh: Also refresh used tokens on a timer, so an idle period right
+                before expiry does not leave the next request to fetch one
+        """
+        self.logger = get_logger(IdTokenCache.__name__, LOGGING_TYPE)
+        self.fetcher = fetcher
+        self.refresh_margin = refresh_margin
+        self.clock = clock
+        self.schedule_refresh = schedule_refresh
+        self._tokens: Dict[str, _CachedToken] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.fetches = 0
+
+    def _audience_lock(self, audience: str) -> threading.Lock:
+        with self._lock:
+            return self._locks.setdefault(audience, threading.Lock())
+
+    def _fetch(self, audience: str, lifetime: float) -> _CachedToken:
+        """Fetch and store a token. Callers hold the audience lock."""
+        start = self.clock()
+        token = self.fetcher(audience)
+        expires_at = token_expiry(token) or start + lifetime
+        entry = self._tokens[audience] = _CachedToken(token, expires_at)
+        self.fetches += 1
+        self.logger.log_text(f"Access token refreshed for {audience} (expires in {round(expires_at - start)}s)")
+        if self.schedule_refresh:
+            self._schedule(audience, lifetime, expires_at)
+        return entry
+
+    def _schedule(self, audience: str, lifetime: float, expires_at: float) -> None:
+        delay = max(0.0, expires_at - self.refresh_margin - self.clock())
+        timer = threading.Timer(delay, self._timed_refresh, args=(audience, lifetime, expires_at))
+        timer.daemon = True
+        timer.start()
+
+    def _timed_refresh(self, audience: str, lifetime: float, expires_at: float) -> None:
+        """Refresh a token still in use when its refresh window opens; unused audiences are let expire."""
+        entry = self._tokens.get(audience)
+        if entry is not None and entry.expires_at == expires_at and entry.used:
+            self._refresh(audience, lifetime)
+
+    def _refresh(self, audience: str, lifetime: float) -> None:
+        """Background refresh; a failure keeps the current token until it expires."""
+        try:
+            with self._audience_lock(audience):
+                entry = self._tokens.get(audience)
+                if entry is None or entry.expires_at - self.refresh_margin <= self.clock():
+                    self._fetch(audience, lifetime)
+        except Exception as e:
+            self.logger.log_text(f"Background token refresh for {audience} failed: {e}", severity="WARNING")
+        finally:
+            with self._lock:
+                self._refreshing.discard(audience)
+
+    def _refresh_in_background(self, audience: str, lifetime: float) -> None:
+        with self._lock:
+            if audience in self._refreshing:
+                return
+            self._refreshing.add(audience)
+        threading.Thread(target=self._refresh, args=(audience, lifetime), daemon=True).start()
+
+    def peek(self, audience: str, lifetime: float = DEFAULT_TOKEN_LIFETIME) -> Optional[str]:
+        """
+        Cached token if still valid, without ever blocking on a fetch.
+
+        A token inside its refresh window is returned and refreshed in the background.
+        """
+        entry = self._tokens.get(audience)
+        now = self.clock()
+        if entry is None or now >= entry.expires_at:
+            return None
+        entry.used = True
+        if now >= entry.expires_at - self.refresh_margin:
+            self._refresh_in_background(audience, lifetime)
+        return entry.token
+
+    def get(self, audience: str, lifetime: float = DEFAULT_TOKEN_LIFETIME) -> str:
+        """
+        Valid token for the audience, fetching one only when none is cached or it expired.
+
+        Args:
+            audience: Target audience (the service base URL)
+            lifetime: Seconds a token is assumed valid when it has no "exp" claim
+
+        Returns:
+            ID token
+        """
+        token = self.peek(audience, lifetime)
+        if token is not None:
+            return token
+        # Single flight: concurrent callers wait for one fetch and reuse its result
+        with self._audience_lock(audience):
+            entry = self._tokens.get(audience)
+            if entry is None or self.clock() >= entry.expires_at:
+                entry = self._fetch(audience, lifetime)
+            entry.used = True
+            return entry.token
+
+    def invalidate(self, audience: str) -> None:
+        """Drop the cached token (e.g. after the service rejected it)."""
+        with self._audience_lock(audience):
+            self._tokens.pop(audience, None)
+
+
+_ID_TOKEN_CACHE: Optional[IdTokenCache] = None
+_ID_TOKEN_CACHE_LOCK = threading.Lock()
+
+
+def get_id_token_cache() -> IdTokenCache:
+    """Get or lazily create the process-wide ID token cache."""
+    global _ID_TOKEN_CACHE
+    with _ID_TOKEN_CACHE_LOCK:
+        if _ID_TOKEN_CACHE is None:
+            _ID_TOKEN_CACHE = IdTokenCache()
+        return _ID_TOKEN_CACHE
@@ -6,7 +6,8 @@ import logging
 import json
 from typing import Optional, Dict, Any
 from uuid import uuid4
-from .base_logger import BaseLogger
+from documents.domain.constants.env_constants import LOG_LEVEL, LOG_MAX_FIELD_CHARS
+from .base_logger import BaseLogger, truncate_text
 
 
 class LocalLogger(BaseLogger):
@@ -24,6 +25,7 @@ class LocalLogger(BaseLogger):
         """
         self.name = name
         self.trace_id = None
+        self.configure_filters(name, LOG_LEVEL or logging.DEBUG)
         
         # Configure logging format
         logging.basicConfig(
@@ -60,10 +62,15 @@ class LocalLogger(BaseLogger):
             trace_id: Optional trace ID (uses instance trace_id if not provided)
             severity: Log level (INFO, WARNING, ERROR, DEBUG)
         """
+        if not self.should_log(severity):
+            return
+        self._emit(truncate_text(f"{text}", LOG_MAX_FIELD_CHARS), trace_id, severity)
+
+    def _emit(self, message: str, trace_id: Optional[str], severity: str) -> None:
+        """Write an already filtered and formatted message."""
         trace = trace_id or self.trace_id
-        log_fn = getattr(logging, severity.lower(), logging.info)
+        log_fn = getattr(logging, str(severity).lower(), logging.info)
         
-        message = f"{text}"
         if trace:
             message += f" [trace_id={trace}]"
         
@@ -83,16 +90,14 @@ class LocalLogger(BaseLogger):
             trace_id: Optional trace ID (uses instance trace_id if not provided)
             severity: Log level (INFO, WARNING, ERROR, DEBUG)
         """
-        trace = trace_id or self.trace_id
+        # Filter before paying for serialization
+        if not self.should_log(severity):
+            return
         
         # Format the payload as pretty JSON
         try:
-            formatted_payload = json.dumps(payload, indent=2, ensure_ascii=False)
+            formatted_payload = json.dumps(self.cap_payload(payload), indent=2, ensure_ascii=False)
         except (TypeError, ValueError):
-            formatted_payload = str(payload)
-        
-        message = f"Structured Log:\n{formatted_payload}"
-        if trace:
-            message += f"\n[trace_id={trace}]"
+            formatted_payload = truncate_text(str(payload), self.max_payload_bytes)
         
-        self.log_text(message, trace_id=trace, severity=severity)
+        self._emit(f"Structured Log:\n{formatted_payload}", trace_id, severity)
@@ -0,0 +1,213 @@
+"""
+Asynchronous batching transport for log entries.
+
+Loggers hand entries to a bounded in-memory queue and return immediately; a
+background thread drains the queue and writes batches to a LogSink when a
+batch fills up or the flush interval elapses. Pending entries are flushed
+when the process exits.
+"""
+import atexit
+import sys
+import threading
+import time
+import queue
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class LogEntry:
+    """A text or structured log entry waiting to be written."""
+    kind: str  # "text" or "struct"
+    payload: Any
+    logger_name: str
+    severity: Any = None
+    trace: Optional[str] = None
+
+
+class LogSink(ABC):
+    """Destination that writes batches of log entries."""
+
+    @abstractmethod
+    def write(self, entries: List[LogEntry]) -> None:
+        """Write a batch of entries. May raise; the transport counts the batch as failed."""
+        pass
+
+
+class MemoryLogSink(LogSink):
+    """Sink that keeps written batches in memory, for tests and local runs."""
+
+    def __init__(self):
+        self.batches: List[List[LogEntry]] = []
+        self._lock = threading.Lock()
+
+    def write(self, entries: List[LogEntry]) -> None:
+        with self._lock:
+            self.batches.append(list(entries))
+
+    @property
+    def entries(self) -> List[LogEntry]:
+        with self._lock:
+            return [entry for batch in self.batches for entry in batch]
+
+
+_STOP = object()
+
+
+class BatchingLogTransport:
+    """Bounded queue drained by a background thread that writes batches to a sink."""
+
+    def __init__(
+        self,
+        sink: LogSink,
+        max_queue: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 2.0,
+        overflow: str = "drop",
+        block_timeout: float = 1.0
+    ):
+        """
+        Initialize the transport and start its flusher thread.
+
+        Args:
+            sink: Destination of the batches
+            max_queue: Entries waiting to be written before the overflow policy applies
+            batch_size: Entries per batch
+            flush_interval: Seconds a partial batch waits for more entries
+            overflow: "drop" discards entries when the queue is full, "block" waits up to block_timeout
+            block_timeout: Seconds to wait for room in "block" mode before dropping
+        """
+        if overflow not in ("drop", "block"):
+            raise ValueError(f"Unknown overflow policy '{overflow}'. Options: drop, block")
+        self.sink = sink
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, max_queue))
+        self._stats_lock = threading.Lock()
+        self._stats = {"submitted": 0, "dropped": 0, "written": 0, "failed": 0, "batches": 0}
+        # Held while checking _closed and enqueueing, so no entry can land behind the stop sentinel
+        self._close_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log-transport", daemon=True)
+        self._thread.start()
+
+    def _count(self, name: str, value: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[name] += value
+
+    def stats(self) -> Dict[str, int]:
+        """Counters of submitted, dropped, written and failed entries, batches written and queue depth."""
+        with self._stats_lock:
+            return {**self._stats, "queued": self._queue.qsize()}
+
+    def submit(self, entry: LogEntry) -> bool:
+        """
+        Queue an entry without waiting for it to be written.
+
+        Returns:
+            False if the entry was dropped because the queue was full
+        """
+        with self._close_lock:
+            closed = self._closed
+            if not closed:
+                try:
+                    if self.overflow == "block":
+                        self._queue.put(entry, timeout=self.block_timeout)
+                    else:
+                        self._queue.put_nowait(entry)
+                except queue.Full:
+                    self._count("dropped")
+                    return False
+        if closed:
+            # After shutdown there is no flusher: write in the caller
+            self._write([entry])
+            return True
+        self._count("submitted")
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every entry queued before this call has been written.
+
+        Returns:
+            False if the timeout expired first
+        """
+        if self._closed:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Write the pending entries and stop the flusher thread."""
+        with self._close_lock:
+            if self._closed:
+                return
+            # Entries logged from now on are written by the caller
+            self._closed = True
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                pass
+        self._thread.join(timeout)
+
+    def _write(self, batch: List[LogEntry]) -> None:
+        if not batch:
+            return
+        try:
+            self.sink.write(batch)
+        except Exception as e:
+            # The logger cannot log its own failures
+            print(f"WARNING: Failed to write {len(batch)} log entries: {e}", file=sys.stderr)
+            self._count("failed", len(batch))
+            return
+        self._count("written", len(batch))
+        self._count("batches")
+
+    def _run(self) -> None:
+        """Collect entries until the batch is full or the flush interval elapses, then write them."""
+        while True:
+            batch: List[LogEntry] = []
+            control = None
+            item = self._queue.get()
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if not isinstance(item, LogEntry):
+                    control = item
+                    break
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            self._write(batch)
+            if control is _STOP:
+                return
+            if control is not None:
+                control.set()
+
+
+# Transports closed at interpreter exit so queued entries are not lost
+_OPEN_TRANSPORTS: List[BatchingLogTransport] = []
+
+
+def _close_open_transports() -> None:
+    for transport in _OPEN_TRANSPORTS:
+        transport.close()
+
+
+def register_for_shutdown(transport: BatchingLogTransport) -> BatchingLogTransport:
+    """Flush and stop the transport when the worker process exits."""
+    if not _OPEN_TRANSPORTS:
+        atexit.register(_close_open_transports)
+    _OPEN_TRANSPORTS.append(transport)
+    return transport
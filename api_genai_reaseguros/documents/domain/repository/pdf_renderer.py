@@ -0,0 +1,26 @@
+"""
+PDF renderer base class.
+"""
+from abc import ABC, abstractmethod
+
+
+class PdfRenderer(ABC):
+    """
+    Abstract base class for HTML to PDF rendering backends.
+    """
+
+    name: str = ""
+
+    def warm_up(self) -> None:
+        """Set up process-wide backend state such as local fonts ahead of the first render (optional)."""
+        pass
+
+    @abstractmethod
+    def render(self, html_content: str) -> bytes:
+        """
+        Render an HTML document to PDF.
+
+        Raises:
+            RuntimeError: If the backend fails to produce a PDF
+        """
+        pass
@@ -0,0 +1,129 @@
+"""
+HTML to PDF rendering backends.
+
+- xhtml2pdf: pure Python (ReportLab), always available, the default.
+- weasyprint: native layout engine (Pango), much faster on wide tables; installed
+  in the Docker image, optional elsewhere.
+"""
+import io
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Type
+
+from reportlab.lib.fonts import addMapping
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from xhtml2pdf import default as pisa_default
+from xhtml2pdf import pisa
+
+from documents.domain.constants.env_constants import PDF_FONTS_DIR
+from .pdf_renderer import PdfRenderer
+
+try:
+    from weasyprint import HTML as WeasyHTML
+    WEASYPRINT_AVAILABLE = True
+except (ImportError, OSError):
+    # OSError: Python package installed but the Pango libraries are missing
+    WEASYPRINT_AVAILABLE = False
+
+_FONTS_LOCK = threading.Lock()
+_REGISTERED_FONTS_DIRS = set()
+
+
+def _register_fonts(fonts_dir: str) -> List[str]:
+    """
+    Register every TTF in ``fonts_dir`` with ReportLab and xhtml2pdf once per process.
+
+    Files are grouped by family from their name (Family.ttf, Family-Bold.ttf,
+    Family-Italic.ttf, Family-BoldItalic.ttf). Families become usable in CSS by
+    name without @font-face, so reports do not load and embed them per render.
+    """
+    variants = {"": (0, 0), "regular": (0, 0), "bold": (1, 0), "italic": (0, 1), "oblique": (0, 1),
+                "bolditalic": (1, 1), "boldoblique": (1, 1)}
+    families: Dict[str, Dict[tuple, Path]] = {}
+    for path in sorted(Path(fonts_dir).glob("*.tt[fc]")):
+        family, _, variant = path.stem.partition("-")
+        if variant.lower() in variants:
+            families.setdefault(family, {})[variants[variant.lower()]] = path
+
+    registered = []
+    for family, files in families.items():
+        regular = files.get((0, 0)) or next(iter(files.values()))
+        for bold in (0, 1):
+            for italic in (0, 1):
+                font_name = f"{family}_{bold}{italic}"
+                pdfmetrics.registerFont(TTFont(font_name, str(files.get((bold, italic), regular))))
+                addMapping(family, bold, italic, font_name)
+                pisa_default.DEFAULT_FONT[f"{family.lower()}_{bold}{italic}"] = font_name
+        pisa_default.DEFAULT_FONT[family.lower()] = f"{family}_00"
+        registered.append(family)
+    return registered
+
+
+class Xhtml2PdfRenderer(PdfRenderer):
+    """Renderer backed by xhtml2pdf's pisa.CreatePDF."""
+
+    name = "xhtml2pdf"
+
+    def __init__(self, fonts_dir: Optional[str] = PDF_FONTS_DIR):
+        self.fonts_dir = fonts_dir
+
+    def warm_up(self) -> None:
+        """Register the local fonts once per process, so the first report can use them by family name."""
+        with _FONTS_LOCK:
+            if self.fonts_dir and self.fonts_dir not in _REGISTERED_FONTS_DIRS:
+                _register_fonts(self.fonts_dir)
+                _REGISTERED_FONTS_DIRS.add(self.fonts_dir)
+
+    def render(self, html_content: str) -> bytes:
+        pdf_buffer = io.BytesIO()
+        pisa_status = pisa.CreatePDF(src=html_content, dest=pdf_buffer, encoding='utf-8')
+        if pisa_status.err:
+            raise RuntimeError(f"PDF generation failed: {pisa_status.err}")
+        return pdf_buffer.getvalue()
+
+
+class WeasyPrintRenderer(PdfRenderer):
+    """Renderer backed by WeasyPrint."""
+
+    name = "weasyprint"
+
+    def __init__(self):
+        if not WEASYPRINT_AVAILABLE:
+            raise RuntimeError("WeasyPrint is not available. Install with: pip install weasyprint")
+
+    def render(self, html_content: str) -> bytes:
+        return WeasyHTML(string=html_content).write_pdf()
+
+
+PDF_RENDERERS: Dict[str, Type[PdfRenderer]] = {
+    Xhtml2PdfRenderer.name: Xhtml2PdfRenderer,
+    WeasyPrintRenderer.name: WeasyPrintRenderer,
+}
+
+
+def available_renderers() -> List[str]:
+    """Names of the backends usable in this environment."""
+    available = [Xhtml2PdfRenderer.name]
+    if WEASYPRINT_AVAILABLE:
+        available.append(WeasyPrintRenderer.name)
+    return available
+
+
+def create_renderer(name: str) -> PdfRenderer:
+    """
+    Create a rendering backend by name.
+
+    Args:
+        name: Backend name (xhtml2pdf, weasyprint)
+
+    Returns:
+        PdfRenderer instance
+
+    Raises:
+        ValueError: If the name is unknown
+        RuntimeError: If the backend is not available in this environment
+    """
+    if name not in PDF_RENDERERS:
+        raise ValueError(f"Unknown PDF renderer '{name}'. Options: {', '.join(PDF_RENDERERS)}")
+    return PDF_RENDERERS[name]()
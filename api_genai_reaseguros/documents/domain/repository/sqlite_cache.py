@@ -0,0 +1,194 @@
+"""
+Persistent key/value cache backed by a local SQLite file.
+Used to keep expensive derived artifacts (e.g. extracted PDF text) across requests.
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, Any, Union
+
+
+class SqliteCache:
+    """
+    Namespaced text/bytes cache stored in SQLite with LRU and size-bound eviction.
+
+    Entries are evicted by least recent access when the namespace exceeds
+    ``max_entries`` or ``max_bytes``, and expire after ``ttl_seconds`` when set.
+    Hit/miss/eviction counters are kept per instance (per worker process).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        max_entries: int = 1000,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: Optional[float] = None
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Path of the SQLite database file
+            namespace: Logical partition inside the database (e.g. "pdf_text")
+            max_entries: Maximum number of entries kept for the namespace
+            max_bytes: Maximum total size (UTF-8 bytes for text) kept for the namespace
+            ttl_seconds: Entry lifetime in seconds (None keeps entries until evicted)
+        """
+        self.path = path
+        self.namespace = namespace
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_cache_entries_access "
+            "ON cache_entries (namespace, last_access)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Union[str, bytes]]:
+        """
+        Get a cached value and mark it as recently used.
+
+        Args:
+            key: Entry key
+
+        Returns:
+            Cached value, or None on miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            now = time.time()
+            if self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key)
+                )
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE cache_entries SET last_access = ? WHERE namespace = ? AND key = ?",
+                (now, self.namespace, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: Union[str, bytes]) -> None:
+        """
+        Store a value and evict old entries if the namespace is over its bounds.
+
+        Args:
+            key: Entry key
+            value: Text or bytes to store (returned by get with the same type)
+        """
+        size = len(value) if isinstance(value, bytes) else len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(namespace, key, value, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.namespace, key, value, size, now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """
+        Remove an entry if present.
+
+        Args:
+            key: Entry key
+        """
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            )
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the namespace fits its bounds."""
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?",
+            (self.namespace,)
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM cache_entries WHERE namespace = ? ORDER BY last_access ASC",
+            (self.namespace,)
+        )
+        victims = []
+        for key, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            victims.append((self.namespace, key))
+            count -= 1
+            total -= size
+
+        self._conn.executemany(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+            victims
+        )
+        self.evictions += len(victims)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters and current occupancy.
+
+        Returns:
+            Dictionary with hits, misses, evictions, entries and bytes
+        """
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?",
+                (self.namespace,)
+            ).fetchone()
+        return {
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": count,
+            "bytes": total,
+        }
@@ -0,0 +1 @@
+# This file makes the management directory a Python package
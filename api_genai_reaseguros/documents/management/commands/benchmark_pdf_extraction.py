@@ -0,0 +1,78 @@
+"""
+Micro-benchmark comparing the legacy PDF text extraction (quadratic string
+concatenation) with the current per-page extraction and single join.
+
+Usage:
+    python manage.py benchmark_pdf_extraction --inputs ../inputs --repeat 5
+"""
+import io
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from pypdf import PdfReader
+
+from documents.application.service.pdf_text_service import parse_pdf_pages
+
+
+def _legacy_parse(pdf_bytes: bytes) -> str:
+    """Original extraction: string concatenation over the full reader."""
+    reader = PdfReader(io.BytesIO(pdf_bytes))
+    text = ""
+    for page in reader.pages:
+        text += page.extract_text() + "\n"
+    return text
+
+
+def _current_parse(pdf_bytes: bytes, max_pages=None) -> str:
+    """Extraction as PdfTextService does it without OCR: page texts joined once."""
+    pages, _ = parse_pdf_pages(pdf_bytes, max_pages=max_pages)
+    return "".join(f"{page_text}\n" for page_text in pages)
+
+
+class Command(BaseCommand):
+    help = "Compare legacy vs current PDF text extraction on the sample PDFs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--inputs",
+            default=str(Path(settings.BASE_DIR).parent / "inputs"),
+            help="Directory containing the PDFs to benchmark"
+        )
+        parser.add_argument("--repeat", type=int, default=3, help="Runs per document and path")
+        parser.add_argument("--max-pages", type=int, default=None, help="Page limit for the current path")
+
+    def handle(self, *args, **options):
+        pdf_paths = sorted(Path(options["inputs"]).glob("*.pdf"))
+        if not pdf_paths:
+            self.stderr.write(f"No PDFs found in {options['inputs']}")
+            return
+
+        paths = {
+            "legacy": lambda data: _legacy_parse(data),
+            "current": lambda data: _current_parse(data, max_pages=options["max_pages"]),
+        }
+
+        for pdf_path in pdf_paths:
+            pdf_bytes = pdf_path.read_bytes()
+            self.stdout.write(f"{pdf_path.name} ({round(len(pdf_bytes) / 1024, 1)} KB)")
+
+            for label, parse in paths.items():
+                timings = []
+                for _ in range(options["repeat"]):
+                    start = time.perf_counter()
+                    text = parse(pdf_bytes)
+                    timings.append(time.perf_counter() - start)
+
+                tracemalloc.start()
+                parse(pdf_bytes)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                self.stdout.write(
+                    f"  {label:<10} best={min(timings) * 1000:8.1f} ms  "
+                    f"mean={sum(timings) / len(timings) * 1000:8.1f} ms  "
+                    f"peak={peak / 1024:8.1f} KB  chars={len(text)}"
+                )
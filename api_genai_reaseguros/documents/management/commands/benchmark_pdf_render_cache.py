@@ -0,0 +1,50 @@
+"""
+Micro-benchmark for the rendered PDF cache.
+
+Renders the same report, byte for byte, on both paths:
+- render: xhtml2pdf render of every request (cache disabled)
+- cached: identical HTML served from the PDF render cache
+
+Usage:
+    python manage.py benchmark_pdf_render_cache --repeat 5 --fonts-dir /usr/share/fonts/truetype/dejavu
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from documents.application.service.html_to_pdf_service import HtmlToPdfService
+from documents.application.service.report_renderer_service import ReportRendererService
+from documents.domain.repository.pdf_renderers import Xhtml2PdfRenderer
+from documents.management.commands.benchmark_pdf_rendering import _synthetic_comparison
+
+
+class Command(BaseCommand):
+    help = "Compare xhtml2pdf rendering with PDF cache hits on identical HTML"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reinsurers", type=int, default=3, help="Reinsurer columns in the synthetic report")
+        parser.add_argument("--repeat", type=int, default=5, help="Renders per path")
+        parser.add_argument("--fonts-dir", default="", help="TTF directory registered before rendering")
+
+    def _time(self, label: str, render, html: str, repeat: int) -> None:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            render(html)
+            timings.append(time.perf_counter() - start)
+        self.stdout.write(
+            f"  {label:<7} best={min(timings) * 1000:8.1f} ms  mean={sum(timings) / len(timings) * 1000:8.1f} ms"
+        )
+
+    def handle(self, *args, **options):
+        html = ReportRendererService().render(_synthetic_comparison(options["reinsurers"]))
+        self.stdout.write(f"Synthetic report: {round(len(html) / 1024, 1)} KB HTML, {options['repeat']} renders")
+
+        renderer = Xhtml2PdfRenderer(fonts_dir=options["fonts_dir"] or None)
+        renderer.warm_up()
+        self._time("render", renderer.render, html, options["repeat"])
+
+        service = HtmlToPdfService(renderer="xhtml2pdf", mode="inline", use_cache=True)
+        service.compile_html_to_pdf(html, filename="benchmark")
+        self._time("cached", lambda document: service.compile_html_to_pdf(document, filename="benchmark"),
+                   html, options["repeat"])
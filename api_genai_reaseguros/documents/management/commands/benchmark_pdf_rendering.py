@@ -0,0 +1,97 @@
+"""
+Micro-benchmark comparing the HTML to PDF rendering backends and execution modes.
+
+Reports are generated from a synthetic 31-item comparison with the report
+template (or read from --html files), then rendered with every available backend.
+
+Usage:
+    python manage.py benchmark_pdf_rendering --reinsurers 4 --repeat 3 --concurrency 4
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from documents.application.service.html_to_pdf_service import HtmlToPdfService
+from documents.application.service.report_renderer_service import ReportRendererService
+from documents.domain.repository.pdf_renderers import available_renderers
+
+_SECTIONS = [
+    ("DATOS GENERALES", 6), ("CONDICIONES", 5), ("ESPECIFICACIONES DEL SEGURO", 6), ("FINANCIERO", 2),
+    ("ESTRUCTURA", 1), ("SUMAS Y LIMITES", 3), ("LEGAL Y JURISDICCION", 8),
+]
+
+
+def _synthetic_comparison(reinsurers: int) -> dict:
+    """31-item comparison with long cell texts, shaped like the deconstruct output."""
+    icons = ["✅ Coincidencia", "⚠️ Inconsistencia menor", "❌ Discrepancia crítica"]
+    detail = "Cobertura sujeta a los términos, condiciones y exclusiones del slip. " * 6
+    items = []
+    number = 1
+    for section, count in _SECTIONS:
+        for _ in range(count):
+            item = {
+                "N": number,
+                "SECCIÓN_PÓLIZA": section,
+                "ITEM_PÓLIZA": f"ITEM {number}",
+                "DETALLE_ÍTEM (Póliza)": detail,
+            }
+            for r in range(reinsurers):
+                item[f"DETALLE - Reasegurador {r + 1} (Slip)"] = detail
+                item[f"COMPARACIÓN Reasegurador {r + 1} (Slip)"] = icons[(number + r) % 3]
+            item["CONCLUSIÓN GENERAL"] = "Revisar la redacción del slip frente a la póliza."
+            items.append(item)
+            number += 1
+    return {"items": items}
+
+
+class Command(BaseCommand):
+    help = "Compare HTML to PDF backends (xhtml2pdf, weasyprint) and inline vs process mode"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--html", nargs="*", default=[], help="HTML files to render instead of the synthetic report")
+        parser.add_argument("--reinsurers", type=int, default=3, help="Reinsurer columns in the synthetic report")
+        parser.add_argument("--repeat", type=int, default=3, help="Renders per document and backend")
+        parser.add_argument("--concurrency", type=int, default=4, help="Simultaneous renders for the mode comparison")
+
+    def handle(self, *args, **options):
+        if options["html"]:
+            documents = {Path(p).name: Path(p).read_text(encoding="utf-8") for p in options["html"]}
+        else:
+            html = ReportRendererService().render(_synthetic_comparison(options["reinsurers"]))
+            documents = {f"synthetic_{options['reinsurers']}_reinsurers": html}
+
+        backends = available_renderers()
+        self.stdout.write(f"Backends available: {', '.join(backends)}")
+
+        for label, html in documents.items():
+            self.stdout.write(f"{label} ({round(len(html) / 1024, 1)} KB HTML)")
+
+            for backend in backends:
+                service = HtmlToPdfService(renderer=backend, mode="inline")
+                timings = []
+                pdf = b""
+                for _ in range(options["repeat"]):
+                    start = time.perf_counter()
+                    pdf = service.renderer.render(html)
+                    timings.append(time.perf_counter() - start)
+                self.stdout.write(
+                    f"  {backend:<12} best={min(timings) * 1000:8.1f} ms  "
+                    f"mean={sum(timings) / len(timings) * 1000:8.1f} ms  pdf={len(pdf) / 1024:8.1f} KB"
+                )
+
+            # Wall time for N simultaneous requests: threads contend on the GIL inline,
+            # process mode spreads them over PDF_RENDER_WORKERS processes
+            concurrency = options["concurrency"]
+            for mode in ("inline", "process"):
+                service = HtmlToPdfService(renderer=backends[0], mode=mode)
+                service._render(html)  # warm the pool
+                start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                    list(pool.map(service._render, [html] * concurrency))
+                elapsed = time.perf_counter() - start
+                self.stdout.write(
+                    f"  {backends[0]} x{concurrency} {mode:<8} wall={elapsed * 1000:8.1f} ms  "
+                    f"per_report={elapsed / concurrency * 1000:8.1f} ms"
+                )
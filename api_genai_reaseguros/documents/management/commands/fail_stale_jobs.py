@@ -0,0 +1,19 @@
+"""
+Mark workflow jobs lost by a worker restart as FAILED.
+
+Meant to run on a schedule (e.g. Cloud Scheduler or cron every few minutes),
+so polling clients see interrupted jobs fail even when no new job is submitted.
+
+Usage:
+    python manage.py fail_stale_jobs
+"""
+from django.core.management.base import BaseCommand
+
+from documents.application.service.workflow_job_service import fail_stale_jobs
+
+
+class Command(BaseCommand):
+    help = "Mark PENDING/RUNNING workflow jobs not updated for WORKFLOW_JOB_STALE_SECONDS as FAILED"
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Marked {fail_stale_jobs()} stale jobs as FAILED")
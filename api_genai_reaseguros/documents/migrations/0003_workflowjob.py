@@ -0,0 +1,30 @@
+# Generated by Django 4.2.18 on 2026-10-17 13:40
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('documents', '0002_populate_initial_agentgarden_data'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WorkflowJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True, verbose_name='job_id')),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('RUNNING', 'Running'), ('SUCCEEDED', 'Succeeded'), ('FAILED', 'Failed')], default='PENDING', max_length=16, verbose_name='status')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='error')),
+                ('pdf_content', models.BinaryField(blank=True, null=True, verbose_name='pdf_content')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'WorkflowJob',
+            },
+        ),
+    ]
@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from documents.application.constants.app_constants import DEFAULT_AGENT_QUESTION
 # Create your models here.
@@ -18,3 +20,26 @@ class AgentGarden(models.Model):
 
     def __str__(self):
         return f"{self.api_core_id} - {self.document_type}"
+
+
+class WorkflowJob(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "PENDING"
+        RUNNING = "RUNNING"
+        SUCCEEDED = "SUCCEEDED"
+        FAILED = "FAILED"
+
+    job_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False, verbose_name="job_id")
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING, verbose_name="status")
+    error = models.TextField(null=True, blank=True, verbose_name="error")
+    pdf_content = models.BinaryField(null=True, blank=True, verbose_name="pdf_content")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "WorkflowJob"
+
+    def __str__(self):
+        return f"{self.job_id} - {self.status}"
@@ -3,6 +3,9 @@ Serializers for API request/response validation.
 """
 from rest_framework import serializers
 
+from documents.application.constants.app_constants import AgentCoreKey, DEFAULT_AGENT_QUESTION
+from documents.models import WorkflowJob
+
 
 class Agent1DesestructurarCompararSerializer(serializers.Serializer):
     """
@@ -72,3 +75,81 @@ class EmailPdfSerializer(serializers.Serializer):
         required=True,
         help_text="Email del destinatario"
     )
+
+
+class WorkflowJobSerializer(serializers.ModelSerializer):
+    """
+    Serializer for asynchronous workflow job status.
+    
+    Response body:
+    {
+        "job_id": "2f1c...",
+        "status": "PENDING | RUNNING | SUCCEEDED | FAILED",
+        "error": null,
+        "created_at": "...",
+        "finished_at": null
+    }
+    """
+    class Meta:
+        model = WorkflowJob
+        fields = ["job_id", "status", "error", "created_at", "finished_at"]
+
+
+class BatchGroupSerializer(serializers.Serializer):
+    """
+    Serializer for one placement of the batch workflow.
+    
+    The multipart "groups" field holds a JSON list of these; "poliza" and
+    "contratos" name the multipart file fields of each placement:
+    [
+        {"id": "placement-1", "poliza": "p1", "contratos": ["c1", "c2"]},
+        {"id": "placement-2", "poliza": "p2", "contratos": ["c1", "c3"]}
+    ]
+    """
+    id = serializers.CharField(required=True, help_text="Identificador de la colocación")
+    poliza = serializers.CharField(required=True, help_text="Campo multipart con el PDF de la póliza")
+    contratos = serializers.ListField(
+        child=serializers.CharField(),
+        required=True,
+        allow_empty=False,
+        help_text="Campos multipart con los PDFs de los contratos"
+    )
+
+
+class AgentQuestionSerializer(serializers.Serializer):
+    """
+    Serializer for a question fanned out to several API Core agents.
+    
+    Request body:
+    {
+        "agents": ["DESESTRUCTURAR_COMPARAR", "RESUMEN_GERENCIAL"],  // optional, default: both
+        "message": "Analiza los contratos y poliza",                 // optional
+        "files": ["gs://bucket/path/to/poliza.pdf", "gs://bucket/path/to/contrato1.pdf"]
+    }
+    """
+    agents = serializers.ListField(
+        child=serializers.ChoiceField(choices=[key.value for key in AgentCoreKey]),
+        required=False,
+        allow_empty=False,
+        help_text="Agentes de API Core a consultar en paralelo"
+    )
+    message = serializers.CharField(
+        required=False,
+        default=DEFAULT_AGENT_QUESTION,
+        help_text="Pregunta enviada a cada agente"
+    )
+    files = serializers.ListField(
+        child=serializers.CharField(),
+        required=True,
+        allow_empty=False,
+        help_text="Lista de URIs de GCS adjuntas a cada pregunta"
+    )
+
+    def validate_files(self, value):
+        """Validate that URIs start with gs://"""
+        for uri in value:
+            if not uri.startswith('gs://'):
+                raise serializers.ValidationError(
+                    f"El URI '{uri}' debe comenzar con 'gs://'"
+                )
+        return value
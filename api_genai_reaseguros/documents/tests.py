@@ -1,3 +1,332 @@
-from django.test import TestCase
+import asyncio
+import json
+import queue
+import threading
+import time
+from unittest import mock
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from documents.application.service.agent_fanout_service import AgentFanOutService
+from documents.application.service.structured_comparison import ComparisonStreamParser
+from documents.domain.entities.api_core_request import ApiCoreRequest
+from documents.domain.repository.id_token_cache import IdTokenCache
+from documents.domain.repository.log_transport import BatchingLogTransport, LogEntry, LogSink, MemoryLogSink
+
+
+def _entry(index: int) -> LogEntry:
+    return LogEntry(kind="text", payload=f"entry {index}", logger_name="test")
+
+
+def _wait_for(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+class GatedLogSink(LogSink):
+    """Sink whose writes block until the gate opens, to fill the transport queue."""
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.writing = threading.Event()
+        self.memory = MemoryLogSink()
+
+    def write(self, entries):
+        self.writing.set()
+        self.gate.wait(5)
+        self.memory.write(entries)
+
+
+class PausingQueue(queue.Queue):
+    """Queue that holds one entry's put until resumed, to race a submit with close."""
+
+    def __init__(self, maxsize: int = 0):
+        super().__init__(maxsize)
+        self.pause_on = None
+        self.paused = threading.Event()
+        self.resume = threading.Event()
+
+    def put_nowait(self, item):
+        if isinstance(item, LogEntry) and item.payload == self.pause_on:
+            self.paused.set()
+            self.resume.wait(5)
+        super().put_nowait(item)
+
+
+class BatchingLogTransportTests(SimpleTestCase):
+
+    def _transport(self, sink, **kwargs) -> BatchingLogTransport:
+        transport = BatchingLogTransport(sink, **kwargs)
+        self.addCleanup(transport.close, 1.0)
+        return transport
+
+    def test_writes_full_batches_by_size(self):
+        sink = MemoryLogSink()
+        transport = self._transport(sink, batch_size=2, flush_interval=30)
+        for i in range(4):
+            transport.submit(_entry(i))
+
+        self.assertTrue(_wait_for(lambda: len(sink.batches) == 2))
+        self.assertEqual([len(batch) for batch in sink.batches], [2, 2])
+        self.assertEqual([entry.payload for entry in sink.entries], [f"entry {i}" for i in range(4)])
+
+    def test_writes_partial_batch_after_interval(self):
+        sink = MemoryLogSink()
+        transport = self._transport(sink, batch_size=100, flush_interval=0.05)
+        for i in range(3):
+            transport.submit(_entry(i))
+
+        self.assertTrue(_wait_for(lambda: len(sink.entries) == 3))
+        self.assertEqual(len(sink.batches), 1)
+        self.assertEqual(transport.stats()["batches"], 1)
+
+    def test_drop_overflow_discards_entries_when_full(self):
+        sink = GatedLogSink()
+        transport = self._transport(sink, max_queue=1, batch_size=1, flush_interval=30, overflow="drop")
+        transport.submit(_entry(0))
+        self.assertTrue(sink.writing.wait(2))
+
+        self.assertTrue(transport.submit(_entry(1)))
+        self.assertFalse(transport.submit(_entry(2)))
+        self.assertEqual(transport.stats()["dropped"], 1)
+
+        sink.gate.set()
+        self.assertTrue(transport.flush(2))
+        self.assertEqual([entry.payload for entry in sink.memory.entries], ["entry 0", "entry 1"])
+
+    def test_block_overflow_waits_for_room(self):
+        sink = GatedLogSink()
+        transport = self._transport(
+            sink, max_queue=1, batch_size=1, flush_interval=30, overflow="block", block_timeout=2.0
+        )
+        transport.submit(_entry(0))
+        self.assertTrue(sink.writing.wait(2))
+        transport.submit(_entry(1))
+
+        threading.Timer(0.1, sink.gate.set).start()
+        self.assertTrue(transport.submit(_entry(2)))
+        self.assertTrue(transport.flush(2))
+        self.assertEqual(transport.stats()["dropped"], 0)
+        self.assertEqual(len(sink.memory.entries), 3)
+
+    def test_block_overflow_drops_after_timeout(self):
+        sink = GatedLogSink()
+        transport = self._transport(
+            sink, max_queue=1, batch_size=1, flush_interval=30, overflow="block", block_timeout=0.05
+        )
+        self.addCleanup(sink.gate.set)
+        transport.submit(_entry(0))
+        self.assertTrue(sink.writing.wait(2))
+        transport.submit(_entry(1))
+
+        self.assertFalse(transport.submit(_entry(2)))
+        self.assertEqual(transport.stats()["dropped"], 1)
+
+    def test_flush_writes_queued_entries(self):
+        sink = MemoryLogSink()
+        transport = self._transport(sink, batch_size=100, flush_interval=30)
+        for i in range(3):
+            transport.submit(_entry(i))
+
+        self.assertTrue(transport.flush(2))
+        self.assertEqual(len(sink.entries), 3)
+        self.assertEqual(transport.stats()["queued"], 0)
+
+    def test_close_writes_pending_entries_then_writes_through(self):
+        sink = MemoryLogSink()
+        transport = self._transport(sink, batch_size=100, flush_interval=30)
+        transport.submit(_entry(0))
+        transport.close(2)
+        self.assertEqual(len(sink.entries), 1)
+
+        self.assertTrue(transport.submit(_entry(1)))
+        self.assertEqual([entry.payload for entry in sink.entries], ["entry 0", "entry 1"])
+        self.assertEqual(sink.batches[-1], [sink.entries[-1]])
+        self.assertTrue(transport.flush())
+
+    def test_entry_submitted_while_closing_is_written(self):
+        sink = MemoryLogSink()
+        with mock.patch("documents.domain.repository.log_transport.queue.Queue", PausingQueue):
+            transport = self._transport(sink, batch_size=100, flush_interval=30)
+        transport._queue.pause_on = "entry 1"
+        transport.submit(_entry(0))
+
+        submitter = threading.Thread(target=transport.submit, args=(_entry(1),))
+        submitter.start()
+        self.assertTrue(transport._queue.paused.wait(2))
+        closer = threading.Thread(target=transport.close, args=(2,))
+        closer.start()
+        time.sleep(0.05)
+        transport._queue.resume.set()
+        submitter.join(2)
+        closer.join(2)
+
+        self.assertEqual([entry.payload for entry in sink.entries], ["entry 0", "entry 1"])
+
+
+class StubTokenFetcher:
+    """Fetcher returning token-1, token-2, ... and counting concurrent calls."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = 0
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, audience: str) -> str:
+        with self._lock:
+            self.calls += 1
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            token = f"token-{self.calls}"
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return token
+
+
+class IdTokenCacheTests(SimpleTestCase):
+    audience = "https://api-core.example"
+
+    def setUp(self):
+        self.now = 1000.0
+
+    def _cache(self, fetcher) -> IdTokenCache:
+        return IdTokenCache(fetcher=fetcher, refresh_margin=10, clock=lambda: self.now, schedule_refresh=False)
+
+    def test_concurrent_gets_share_one_fetch(self):
+        fetcher = StubTokenFetcher(delay=0.1)
+        cache = self._cache(fetcher)
+        tokens = []
+        threads = [threading.Thread(target=lambda: tokens.append(cache.get(self.audience))) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(fetcher.calls, 1)
+        self.assertEqual(fetcher.max_active, 1)
+        self.assertEqual(tokens, ["token-1"] * 20)
+
+    def test_refreshes_ahead_inside_the_margin(self):
+        fetcher = StubTokenFetcher()
+        cache = self._cache(fetcher)
+        self.assertEqual(cache.get(self.audience, lifetime=100), "token-1")
+
+        self.now += 50
+        self.assertEqual(cache.get(self.audience, lifetime=100), "token-1")
+        self.assertEqual(fetcher.calls, 1)
+
+        # Inside the margin: the current token is served while a new one is fetched in the background
+        self.now += 45
+        self.assertEqual(cache.get(self.audience, lifetime=100), "token-1")
+        self.assertTrue(_wait_for(lambda: fetcher.calls == 2))
+        self.assertTrue(_wait_for(lambda: cache.peek(self.audience, 100) == "token-2"))
+
+    def test_fetches_again_after_expiry(self):
+        fetcher = StubTokenFetcher()
+        cache = self._cache(fetcher)
+        cache.get(self.audience, lifetime=100)
+
+        self.now += 101
+        self.assertIsNone(cache.peek(self.audience, 100))
+        self.assertEqual(cache.get(self.audience, lifetime=100), "token-2")
+        self.assertEqual(fetcher.calls, 2)
+
+    def test_invalidate_drops_the_cached_token(self):
+        fetcher = StubTokenFetcher()
+        cache = self._cache(fetcher)
+        cache.get(self.audience)
+
+        cache.invalidate(self.audience)
+        self.assertEqual(cache.get(self.audience), "token-2")
+
+
+def _comparison_item(number: int) -> dict:
+    return {
+        "numero": number,
+        "seccion_poliza": "Condiciones {generales}",
+        "item_poliza": f'Ítem "{number}" \\ total',
+        "detalle_poliza": "Límite ]}",
+        "slips": [{"reasegurador": "Re A", "detalle": "Igual", "comparacion": "✅ Coincide"}],
+        "conclusion_general": "Conforme",
+    }
+
+
+class ComparisonStreamParserTests(SimpleTestCase):
+
+    def _feed(self, parser: ComparisonStreamParser, text: str, size: int = 7) -> None:
+        for start in range(0, len(text), size):
+            parser.feed(text[start:start + size])
+
+    def test_validates_each_item_as_it_closes(self):
+        first = json.dumps({"items": [_comparison_item(1)]}, ensure_ascii=False)[:-2]
+        parser = ComparisonStreamParser()
+        self._feed(parser, first)
+        self.assertEqual(list(parser.items), [1])
+
+        broken = _comparison_item(2)
+        del broken["slips"]
+        self._feed(parser, ", " + json.dumps(broken) + ", " + json.dumps(_comparison_item(3)) + "]}")
+        items, errors = parser.close()
+        self.assertEqual(sorted(items), [1, 3])
+        self.assertEqual(list(errors), [2])
+        self.assertIn("slips", errors[2])
+
+    def test_truncated_response_keeps_the_completed_items(self):
+        text = json.dumps({"items": [_comparison_item(n) for n in range(1, 4)]})
+        parser = ComparisonStreamParser()
+        self._feed(parser, text[:text.rindex('"conclusion_general"')])
+        items, errors = parser.close()
+        self.assertEqual(sorted(items), [1, 2])
+        self.assertEqual(errors, {})
+
+
+class StubAgentClient:
+    """Async client answering after a delay, failing for the agent ids in ``fail``, and counting concurrent calls."""
+
+    def __init__(self, delay: float = 0.0, fail=()):
+        self.delay = delay
+        self.fail = set(fail)
+        self.active = 0
+        self.max_active = 0
+
+    async def post(self, endpoint, json=None, model_response=None, **kwargs):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if json["agent_id"] in self.fail:
+            raise RuntimeError(f"agent {json['agent_id']} unavailable")
+        return model_response(success=True, data={"response": f"answer {json['agent_id']}"})
+
+
+class AgentFanOutServiceTests(SimpleTestCase):
+
+    def _ask(self, client, agent_ids):
+        service = AgentFanOutService("test-trace", client=client)
+        return asyncio.run(service.ask([ApiCoreRequest(agent_id=agent_id) for agent_id in agent_ids]))
+
+    def test_requests_run_concurrently(self):
+        client = StubAgentClient(delay=0.2)
+        start = time.monotonic()
+        results = self._ask(client, [1, 2, 3])
+
+        self.assertEqual(client.max_active, 3)
+        self.assertLess(time.monotonic() - start, 0.5)
+        self.assertEqual([result.data.response for result in results], ["answer 1", "answer 2", "answer 3"])
+
+    def test_failing_request_returns_its_exception(self):
+        results = self._ask(StubAgentClient(delay=0.01, fail={2}), [1, 2, 3])
+
+        self.assertEqual(results[0].data.response, "answer 1")
+        self.assertIsInstance(results[1], RuntimeError)
+        self.assertEqual(str(results[1]), "agent 2 unavailable")
+        self.assertEqual(results[2].data.response, "answer 3")
@@ -3,7 +3,19 @@ URL configuration for documents app.
 """
 from django.urls import path
 from documents.views.workflow_view import WorkflowView
+from documents.views.workflow_async_view import WorkflowAsyncView
+from documents.views.workflow_stream_view import WorkflowStreamView
+from documents.views.workflow_batch_view import WorkflowBatchView
+from documents.views.workflow_job_view import WorkflowJobView, WorkflowJobStatusView, WorkflowJobPdfView
+from documents.views.agent_question_view import AgentQuestionView
 
 urlpatterns = [
     path("process-workflow", WorkflowView.as_view(), name="process-workflow"),
+    path("process-workflow-async", WorkflowAsyncView.as_view(), name="process-workflow-async"),
+    path("process-workflow-stream", WorkflowStreamView.as_view(), name="process-workflow-stream"),
+    path("process-workflow-batch", WorkflowBatchView.as_view(), name="process-workflow-batch"),
+    path("workflow-jobs", WorkflowJobView.as_view(), name="workflow-jobs"),
+    path("workflow-jobs/<uuid:job_id>", WorkflowJobStatusView.as_view(), name="workflow-job-status"),
+    path("workflow-jobs/<uuid:job_id>/pdf", WorkflowJobPdfView.as_view(), name="workflow-job-pdf"),
+    path("agents/question", AgentQuestionView.as_view(), name="agents-question"),
 ]
@@ -0,0 +1,69 @@
+"""
+Agent Question View to ask several API Core agents at once.
+"""
+import json
+import uuid
+
+from django.http import JsonResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+
+from documents.application.constants.app_constants import AgentCoreKey
+from documents.application.service.agent_fanout_service import AgentFanOutService
+from documents.domain.logger import get_logger
+from documents.domain.constants.env_constants import LOGGING_TYPE
+from documents.serializers import AgentQuestionSerializer
+
+
+class AgentQuestionView(View):
+    """
+    Async API View that sends one question to several API Core agents concurrently.
+    Accepts a JSON body (see AgentQuestionSerializer):
+    - agents: AgentCoreKey values (default: DESESTRUCTURAR_COMPARAR and RESUMEN_GERENCIAL)
+    - message: Question for every agent
+    - files: GCS URIs attached to every question
+    
+    Returns:
+    - JSON with one result per agent: its API Core response, or the error of that agent
+      alone (200 if any agent answered, 502 if none did)
+    """
+    http_method_names = ["post"]
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # Same behaviour as DRF's APIView: API endpoints are CSRF exempt
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+
+    async def post(self, request, *args, **kwargs):
+        trace_id = str(uuid.uuid4())
+        logger = get_logger(type(self).__name__, LOGGING_TYPE)
+        logger.set_trace(trace_id)
+
+        logger.log_text(f"[API] New Agent Question Request. TraceID: {trace_id}")
+
+        try:
+            body = json.loads(request.body or b"{}")
+        except json.JSONDecodeError:
+            return JsonResponse({"error": "Body must be a JSON object"}, status=400)
+
+        serializer = AgentQuestionSerializer(data=body)
+        if not serializer.is_valid():
+            return JsonResponse({"error": serializer.errors}, status=400)
+        data = serializer.validated_data
+        agent_keys = [AgentCoreKey(key) for key in data.get("agents", [key.value for key in AgentCoreKey])]
+
+        try:
+            results = await AgentFanOutService(trace_id).ask_agents(agent_keys, data["message"], data["files"])
+        except Exception as e:
+            # ValueError when an agent has no AgentGarden row
+            logger.log_text(f"[API] Critical Error: {str(e)}", severity="ERROR")
+            return JsonResponse({"error": str(e)}, status=500)
+
+        payload = {
+            key: {"error": str(result)} if isinstance(result, Exception) else result.model_dump()
+            for key, result in results.items()
+        }
+        answered = any(not isinstance(result, Exception) for result in results.values())
+        return JsonResponse({"trace_id": trace_id, "results": payload}, status=200 if answered else 502)
@@ -0,0 +1,51 @@
+"""
+Metrics View exposing workflow instrumentation in Prometheus format.
+"""
+import asyncio
+from typing import Dict
+
+from django.http import HttpResponse
+from django.views import View
+
+from documents.application.service.workflow_registry import peek_workflow
+from documents.application.service.workflow_metrics import get_workflow_metrics
+
+
+def _render_metrics() -> str:
+    """Prometheus text of the workflow metrics plus the cache counters."""
+    extra: Dict[str, Dict[str, int]] = {}
+    workflow = peek_workflow()
+    if workflow is not None:
+        caches = [
+            c for c in (
+                workflow.text_service.cache,
+                workflow.llm_cache,
+                workflow.contract_store,
+                workflow.pdf_service.cache,
+            )
+            if c is not None
+        ]
+        stats = [c.stats() for c in caches]
+        for stat in ("hits", "misses", "evictions", "entries", "bytes"):
+            extra[f"workflow_cache_{stat}"] = {s["namespace"]: s[stat] for s in stats}
+    return get_workflow_metrics().render_prometheus(extra)
+
+
+class MetricsView(View):
+    """
+    API View for Prometheus scraping.
+    Counters are per worker process; scrape each worker or aggregate upstream.
+    
+    Async so a scrape is not queued behind sync views on Django's shared
+    thread; the cache counters (SQLite reads) are collected in a worker thread.
+    
+    Returns:
+    - text/plain Prometheus exposition format
+    """
+    http_method_names = ["get"]
+
+    async def get(self, request, *args, **kwargs):
+        return HttpResponse(
+            await asyncio.to_thread(_render_metrics),
+            content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
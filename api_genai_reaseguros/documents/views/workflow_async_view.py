@@ -0,0 +1,109 @@
+"""
+Async Workflow View to run the LangGraph workflow natively under ASGI.
+"""
+import asyncio
+import io
+import uuid
+from typing import List, Optional, Tuple
+
+from django.http import FileResponse, JsonResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+
+from documents.application.constants.app_constants import LLM_CACHE_BYPASS_HEADER, REPORT_MODE_HEADER, REPORT_MODES
+from documents.application.service.workflow_registry import get_workflow
+from documents.domain.entities.document_source import DocumentSource
+from documents.domain.logger import get_logger
+from documents.domain.constants.env_constants import LOGGING_TYPE, WORKFLOW_REQUEST_TIMEOUT
+
+
+def _read_uploads(request) -> Tuple[Optional[DocumentSource], List[DocumentSource]]:
+    """Parse the multipart body into in-memory document sources (None / [] for a missing field)."""
+    poliza_file = request.FILES.get('poliza')
+    contratos_files = request.FILES.getlist('contratos')
+    return (
+        DocumentSource.from_upload(poliza_file) if poliza_file else None,
+        [DocumentSource.from_upload(cf) for cf in contratos_files]
+    )
+
+
+class WorkflowAsyncView(View):
+    """
+    Async API View to process the Reaseguros Workflow.
+    Served without blocking a thread per request when running under ASGI.
+    Accepts:
+    - poliza: File (PDF)
+    - contratos: List of Files (PDFs)
+    - X-Bypass-Cache header: "true" to skip cached LLM responses
+    - X-Report-Mode header: "llm", "template" or "fast" to override REPORT_MODE
+    
+    The run is cancelled after WORKFLOW_REQUEST_TIMEOUT seconds (504): gunicorn's
+    --timeout does not bound requests served by uvicorn workers.
+    
+    Returns:
+    - PDF File (application/pdf)
+    """
+    http_method_names = ["post"]
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # Same behaviour as DRF's APIView: API endpoints are CSRF exempt
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+
+    async def post(self, request, *args, **kwargs):
+        trace_id = str(uuid.uuid4())
+        logger = get_logger(type(self).__name__, LOGGING_TYPE)
+        logger.set_trace(trace_id)
+
+        logger.log_text(f"[API] New Async Workflow Request. TraceID: {trace_id}")
+
+        try:
+            poliza, contratos = await asyncio.to_thread(_read_uploads, request)
+
+            if poliza is None:
+                return JsonResponse({"error": "No 'poliza' file provided"}, status=400)
+
+            if not contratos:
+                return JsonResponse({"error": "No 'contratos' files provided"}, status=400)
+
+            bypass_cache = request.headers.get(LLM_CACHE_BYPASS_HEADER, "").lower() in ("1", "true")
+            report_mode = request.headers.get(REPORT_MODE_HEADER, "").lower()
+            workflow = await asyncio.to_thread(get_workflow)
+            try:
+                result = await asyncio.wait_for(
+                    workflow.arun(
+                        poliza=poliza,
+                        contratos=contratos,
+                        output_pdf_path=None,
+                        use_llm_cache=not bypass_cache,
+                        report_mode=report_mode if report_mode in REPORT_MODES else None
+                    ),
+                    timeout=WORKFLOW_REQUEST_TIMEOUT
+                )
+            except asyncio.TimeoutError:
+                logger.log_text(f"[API] Workflow cancelled after {WORKFLOW_REQUEST_TIMEOUT}s", severity="ERROR")
+                return JsonResponse(
+                    {"error": f"Workflow did not finish within {WORKFLOW_REQUEST_TIMEOUT:g}s"}, status=504
+                )
+
+            if result.get("pdf_bytes"):
+                logger.log_text("[API] Async Workflow Success. Returning PDF.")
+                response = FileResponse(io.BytesIO(result["pdf_bytes"]), content_type='application/pdf')
+                response['Content-Disposition'] = 'attachment; filename="report_reaseguros.pdf"'
+                return response
+
+            error_msg = "PDF was not generated."
+            if "comparison_data" in result and "error" in result["comparison_data"]:
+                error_msg = str(result["comparison_data"]["error"])
+
+            logger.log_text(f"[API] Async Workflow Failed: {error_msg}", severity="ERROR")
+            return JsonResponse({
+                "error": "Workflow failed to generate PDF",
+                "details": error_msg
+            }, status=500)
+
+        except Exception as e:
+            logger.log_text(f"[API] Critical Error: {str(e)}", severity="ERROR")
+            return JsonResponse({"error": str(e)}, status=500)
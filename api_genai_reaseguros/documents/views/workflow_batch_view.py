@@ -0,0 +1,127 @@
+"""
+Batch Workflow View to process many placements in one call.
+"""
+import asyncio
+import io
+import json
+import uuid
+import zipfile
+from typing import List, Tuple
+
+from django.http import HttpResponse, JsonResponse
+from django.utils.decorators import classonlymethod
+from django.utils.text import get_valid_filename
+from django.views import View
+
+from documents.application.constants.app_constants import LLM_CACHE_BYPASS_HEADER, REPORT_MODE_HEADER, REPORT_MODES
+from documents.application.service.batch_workflow_service import BatchWorkflowService
+from documents.domain.entities.batch_workflow import BatchGroup, BatchItemResult
+from documents.domain.entities.document_source import DocumentSource
+from documents.domain.logger import get_logger
+from documents.domain.constants.env_constants import LOGGING_TYPE
+from documents.serializers import BatchGroupSerializer
+
+
+def _read_groups(request) -> Tuple[List[BatchGroup], dict]:
+    """Parse the multipart body into batch groups. Returns (groups, errors)."""
+    try:
+        raw_groups = json.loads(request.POST.get("groups", ""))
+    except json.JSONDecodeError:
+        return [], {"groups": "Must be a JSON list of placements"}
+
+    serializer = BatchGroupSerializer(data=raw_groups, many=True)
+    if not serializer.is_valid():
+        return [], {"groups": serializer.errors}
+
+    # A file referenced by several groups becomes a single DocumentSource
+    sources = {}
+
+    def source(field: str) -> DocumentSource:
+        if field not in sources:
+            uploaded = request.FILES.get(field)
+            if uploaded is None:
+                raise KeyError(field)
+            sources[field] = DocumentSource.from_upload(uploaded)
+        return sources[field]
+
+    try:
+        groups = [
+            BatchGroup(
+                id=item["id"],
+                poliza=source(item["poliza"]),
+                contratos=[source(c) for c in item["contratos"]]
+            )
+            for item in serializer.validated_data
+        ]
+    except KeyError as e:
+        return [], {"files": f"Missing multipart file field {e}"}
+    return groups, {}
+
+
+def _build_zip(results: List[BatchItemResult]) -> bytes:
+    """
+    Zip every generated report plus a manifest with the per-item results.
+
+    Entry names are built from the client-supplied ids, so they are sanitized
+    and prefixed with the item position to stay unique when ids repeat.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        manifest = []
+        for index, result in enumerate(results, start=1):
+            entry = result.model_dump(exclude={"pdf_bytes"})
+            if result.pdf_bytes:
+                entry["file"] = get_valid_filename(f"report_{index:03d}_{result.id}.pdf")
+                archive.writestr(entry["file"], result.pdf_bytes)
+            manifest.append(entry)
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2, ensure_ascii=False))
+    return buffer.getvalue()
+
+
+class WorkflowBatchView(View):
+    """
+    Async API View to process many placements of a renewal portfolio.
+    Accepts (multipart):
+    - groups: JSON list of {"id", "poliza", "contratos"} naming the file fields
+    - one file field per distinct PDF; slips shared by several groups are sent once
+    - X-Bypass-Cache header: "true" to skip cached LLM responses
+    - X-Report-Mode header: "llm", "template" or "fast" to override REPORT_MODE
+    
+    Returns:
+    - application/zip with report_<n>_<id>.pdf files (n = position of the placement) and manifest.json
+    """
+    http_method_names = ["post"]
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # Same behaviour as DRF's APIView: API endpoints are CSRF exempt
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+
+    async def post(self, request, *args, **kwargs):
+        trace_id = str(uuid.uuid4())
+        logger = get_logger("WorkflowBatchView", LOGGING_TYPE)
+        logger.set_trace(trace_id)
+
+        try:
+            groups, errors = await asyncio.to_thread(_read_groups, request)
+            if errors:
+                return JsonResponse({"error": errors}, status=400)
+
+            logger.log_text(f"[API] New Batch Workflow Request with {len(groups)} groups. TraceID: {trace_id}")
+
+            bypass_cache = request.headers.get(LLM_CACHE_BYPASS_HEADER, "").lower() in ("1", "true")
+            report_mode = request.headers.get(REPORT_MODE_HEADER, "").lower()
+            results = await BatchWorkflowService(trace_id).arun(
+                groups,
+                use_llm_cache=not bypass_cache,
+                report_mode=report_mode if report_mode in REPORT_MODES else None
+            )
+
+            response = HttpResponse(await asyncio.to_thread(_build_zip, results), content_type="application/zip")
+            response["Content-Disposition"] = 'attachment; filename="reports_reaseguros.zip"'
+            return response
+        except Exception as e:
+            logger.log_text(f"[API] Critical Error: {str(e)}", severity="ERROR")
+            return JsonResponse({"error": str(e)}, status=500)
@@ -0,0 +1,100 @@
+"""
+Workflow Job Views to run the LangGraph workflow asynchronously.
+"""
+import io
+import uuid
+
+from django.http import FileResponse, JsonResponse
+from django.views import View
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework import status
+
+from documents.application.constants.app_constants import LLM_CACHE_BYPASS_HEADER, REPORT_MODE_HEADER, REPORT_MODES
+from documents.application.service.workflow_job_service import WorkflowJobService
+from documents.domain.logger import get_logger
+from documents.domain.constants.env_constants import LOGGING_TYPE
+from documents.models import WorkflowJob
+from documents.serializers import WorkflowJobSerializer
+
+
+class WorkflowJobView(APIView):
+    """
+    API View to submit a Reaseguros Workflow job.
+    Accepts:
+    - poliza: File (PDF)
+    - contratos: List of Files (PDFs)
+    - X-Bypass-Cache header: "true" to skip cached LLM responses
+    - X-Report-Mode header: "llm", "template" or "fast" to override REPORT_MODE
+    
+    Returns:
+    - 202 with the job id and status
+    """
+    parser_classes = (MultiPartParser, FormParser)
+
+    def post(self, request, *args, **kwargs):
+        trace_id = str(uuid.uuid4())
+        logger = get_logger("WorkflowJobView", LOGGING_TYPE)
+        logger.set_trace(trace_id)
+
+        poliza_file = request.FILES.get('poliza')
+        contratos_files = request.FILES.getlist('contratos')
+
+        if not poliza_file:
+            return Response({"error": "No 'poliza' file provided"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not contratos_files:
+            return Response({"error": "No 'contratos' files provided"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            bypass_cache = request.headers.get(LLM_CACHE_BYPASS_HEADER, "").lower() in ("1", "true")
+            report_mode = request.headers.get(REPORT_MODE_HEADER, "").lower()
+            job = WorkflowJobService(trace_id).submit(
+                poliza_file,
+                contratos_files,
+                use_llm_cache=not bypass_cache,
+                report_mode=report_mode if report_mode in REPORT_MODES else None
+            )
+            logger.log_text(f"[API] Workflow job submitted: {job.job_id}")
+            return Response(WorkflowJobSerializer(job).data, status=status.HTTP_202_ACCEPTED)
+        except Exception as e:
+            logger.log_text(f"[API] Job submission failed: {str(e)}", severity="ERROR")
+            return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+class WorkflowJobStatusView(View):
+    """
+    API View to poll the status of a workflow job.
+    Async so polls are not queued behind sync views on Django's shared thread.
+    """
+    http_method_names = ["get"]
+
+    async def get(self, request, job_id, *args, **kwargs):
+        job = await WorkflowJob.objects.filter(job_id=job_id).defer("pdf_content").afirst()
+        if job is None:
+            return JsonResponse({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+        return JsonResponse(WorkflowJobSerializer(job).data)
+
+
+class WorkflowJobPdfView(View):
+    """
+    API View to download the PDF report of a finished workflow job.
+    Async so downloads are not queued behind sync views on Django's shared thread.
+    """
+    http_method_names = ["get"]
+
+    async def get(self, request, job_id, *args, **kwargs):
+        job = await WorkflowJob.objects.filter(job_id=job_id).afirst()
+        if job is None:
+            return JsonResponse({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        if job.status != WorkflowJob.Status.SUCCEEDED or not job.pdf_content:
+            return JsonResponse(
+                {"error": "Report not available", "status": job.status, "details": job.error},
+                status=status.HTTP_409_CONFLICT
+            )
+
+        response = FileResponse(io.BytesIO(bytes(job.pdf_content)), content_type='application/pdf')
+        response['Content-Disposition'] = 'attachment; filename="report_reaseguros.pdf"'
+        return response
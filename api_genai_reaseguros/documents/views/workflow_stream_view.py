@@ -0,0 +1,151 @@
+"""
+Workflow Stream View to report workflow progress as Server-Sent Events.
+"""
+import asyncio
+import base64
+import json
+import uuid
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, List, Optional
+
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+
+from documents.application.constants.app_constants import LLM_CACHE_BYPASS_HEADER, REPORT_MODE_HEADER, REPORT_MODES
+from documents.application.service.workflow_registry import get_workflow
+from documents.domain.logger import get_logger
+from documents.domain.constants.env_constants import LOGGING_TYPE, SSE_HEARTBEAT_SECONDS
+from documents.domain.entities.document_source import DocumentSource
+from documents.views.workflow_async_view import _read_uploads
+
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    """Format an event dict as an SSE message."""
+    name = event.get("event", "message")
+    return f"event: {name}\ndata: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
+
+
+async def _with_heartbeat(events: AsyncGenerator[str, None], interval: float) -> AsyncIterator[str]:
+    """
+    Interleave SSE keep-alive comments while no event has been produced for ``interval`` seconds.
+
+    When the response is closed or cancelled early (client disconnected), the
+    pending read is cancelled and ``events`` is closed, which stops the workflow.
+    """
+    next_event = None
+    try:
+        while True:
+            if next_event is None:
+                next_event = asyncio.ensure_future(events.__anext__())
+            done, _ = await asyncio.wait({next_event}, timeout=interval)
+            if not done:
+                yield ": keep-alive\n\n"
+                continue
+            finished, next_event = next_event, None
+            try:
+                message = finished.result()
+            except StopAsyncIteration:
+                break
+            yield message
+    finally:
+        if next_event is not None:
+            next_event.cancel()
+            # Wait for the cancellation to unwind before closing: a running generator cannot be closed
+            await asyncio.wait({next_event})
+        await events.aclose()
+
+
+class WorkflowStreamView(View):
+    """
+    Async API View to process the Reaseguros Workflow with streamed progress.
+    Accepts:
+    - poliza: File (PDF)
+    - contratos: List of Files (PDFs)
+    - X-Bypass-Cache header: "true" to skip cached LLM responses
+    - X-Report-Mode header: "llm", "template" or "fast" to override REPORT_MODE
+    
+    Returns:
+    - text/event-stream with node_start, node_end, token and result events.
+      The result event carries the PDF as base64 (or an error).
+
+    Events are only delivered as they happen when served through ASGI (the
+    Dockerfile CMD): under WSGI Django consumes the async stream completely
+    before sending it, so the client gets one buffered response.
+    """
+    http_method_names = ["post"]
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # Same behaviour as DRF's APIView: API endpoints are CSRF exempt
+        view = super().as_view(**initkwargs)
+        view.csrf_exempt = True
+        return view
+
+    async def post(self, request, *args, **kwargs):
+        trace_id = str(uuid.uuid4())
+        logger = get_logger("WorkflowStreamView", LOGGING_TYPE)
+        logger.set_trace(trace_id)
+
+        logger.log_text(f"[API] New Streaming Workflow Request. TraceID: {trace_id}")
+
+        # Uploaded files stay open until the streamed response is closed
+        poliza, contratos = await asyncio.to_thread(_read_uploads, request)
+        if poliza is None:
+            return JsonResponse({"error": "'poliza' and 'contratos' files are required"}, status=400)
+
+        bypass_cache = request.headers.get(LLM_CACHE_BYPASS_HEADER, "").lower() in ("1", "true")
+        report_mode = request.headers.get(REPORT_MODE_HEADER, "").lower()
+        events = self._events(
+            logger, trace_id, poliza, contratos, not bypass_cache,
+            report_mode if report_mode in REPORT_MODES else None
+        )
+
+        response = StreamingHttpResponse(
+            _with_heartbeat(events, SSE_HEARTBEAT_SECONDS),
+            content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def _events(
+        self,
+        logger,
+        trace_id: str,
+        poliza: DocumentSource,
+        contratos: List[DocumentSource],
+        use_llm_cache: bool,
+        report_mode: Optional[str]
+    ) -> AsyncIterator[str]:
+        """Run the workflow and format its progress events as SSE messages."""
+        stream = None
+        try:
+            yield _format_sse({"event": "start", "trace_id": trace_id})
+            workflow = await asyncio.to_thread(get_workflow)
+
+            stream = workflow.astream_run(poliza, contratos, use_llm_cache, report_mode)
+            async for event in stream:
+                if event["event"] != "done":
+                    yield _format_sse(event)
+                    continue
+
+                state = event["state"]
+                if state.get("pdf_bytes"):
+                    logger.log_text("[API] Streaming Workflow Success.")
+                    yield _format_sse({
+                        "event": "result",
+                        "filename": "report_reaseguros.pdf",
+                        "pdf_base64": base64.b64encode(state["pdf_bytes"]).decode("ascii")
+                    })
+                else:
+                    error_msg = "PDF was not generated."
+                    if "error" in state.get("comparison_data", {}):
+                        error_msg = str(state["comparison_data"]["error"])
+                    logger.log_text(f"[API] Streaming Workflow Failed: {error_msg}", severity="ERROR")
+                    yield _format_sse({"event": "error", "details": error_msg})
+        except Exception as e:
+            logger.log_text(f"[API] Critical Error: {str(e)}", severity="ERROR")
+            yield _format_sse({"event": "error", "details": str(e)})
+        finally:
+            if stream is not None:
+                await stream.aclose()